@@ -1,12 +1,18 @@
+from core.cache import cache_anonymous
+from django.utils.decorators import method_decorator
 from django.views.generic.base import TemplateView
 
+ABOUT_CACHE_TIMEOUT = 60 * 60
 
+
+@method_decorator(cache_anonymous(ABOUT_CACHE_TIMEOUT), name="dispatch")
 class AboutAuthorView(TemplateView):
     """Отображение страницы об авторе."""
 
     template_name = "about/author.html"
 
 
+@method_decorator(cache_anonymous(ABOUT_CACHE_TIMEOUT), name="dispatch")
 class AboutTechView(TemplateView):
     """Отображение страницы о примененных технологиях."""
 
@@ -0,0 +1,217 @@
+"""Замеры производительности для команды benchmark."""
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from statistics import median
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.staticfiles import finders
+from django.core.paginator import Paginator
+from django.template import Template
+from django.template.context import Context
+from django.template.loader import render_to_string
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
+
+from .staticfiles import compressed_variants
+
+User = get_user_model()
+
+# Фрагменты страниц кешируются через cache_fill. Замер с настоящим кешем
+# измерял бы чтение из кеша, а фальшивые посты из fake_page попадали бы в
+# общие ключи и показывались посетителям, поэтому кеш на время рендера
+# отключается.
+NO_CACHE = override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+    }
+)
+
+
+def fake_page(size=10):
+    """Страница ленты из несохраненных постов: замер без запросов к БД."""
+    from posts.models import Group, Post
+
+    author = User(pk=1, username="author", first_name="Лев")
+    group = Group(pk=1, title="Группа", slug="group")
+    posts = [
+        Post(
+            pk=number,
+            text="Текст поста " * 20,
+            author=author,
+            group=group,
+            pub_date=timezone.now(),
+        )
+        for number in range(1, size + 1)
+    ]
+    return Paginator(posts * 5, size).page(1)
+
+
+def timed(func, iterations):
+    """Возвращает среднее время вызова func в миллисекундах."""
+    func()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) * 1000 / iterations
+
+
+@NO_CACHE
+def bench_templates(iterations):
+    """Рендер posts/index.html с десятью карточками без кеша фрагментов."""
+    request = RequestFactory().get("/")
+    request.user = AnonymousUser()
+    context = {"page_obj": fake_page()}
+
+    def render():
+        return render_to_string("posts/index.html", context, request)
+
+    return {
+        "index.html, мс": timed(render, iterations),
+        "размер, байт": len(render().encode()),
+    }
+
+
+FULL_PAGE_RANGE = Template(
+    "{% for i in page_obj.paginator.page_range %}"
+    '<li class="page-item"><a class="page-link" href="?page={{ i }}">'
+    "{{ i }}</a></li>{% endfor %}"
+)
+
+
+def bench_pagination(iterations):
+    """Пагинация ленты из 100 000 постов: окно против всех страниц."""
+    page_obj = Paginator(range(100_000), 10).page(5_000)
+    context = {"page_obj": page_obj}
+
+    def render():
+        return render_to_string("posts/includes/paginator.html", context)
+
+    return {
+        "окно, мс": timed(render, iterations),
+        "окно, байт": len(render().encode()),
+        "все страницы, байт": len(
+            FULL_PAGE_RANGE.render(Context(context)).encode()
+        ),
+    }
+
+
+def transferred(name, data):
+    """Байты без сжатия и в лучшей из сжатых копий."""
+    variants = compressed_variants(name, data)
+    return len(data), min(map(len, variants.values()), default=len(data))
+
+
+@NO_CACHE
+def bench_static(iterations):
+    """Байты, передаваемые за просмотр главной страницы.
+
+    При первом визите загружаются страница и вся статика, при повторном
+    без хешей в именах браузер перепроверяет каждый файл, а с хешами и
+    кешированием на год берет статику из кеша.
+    """
+    request = RequestFactory().get("/")
+    request.user = AnonymousUser()
+    html = render_to_string(
+        "posts/index.html", {"page_obj": fake_page()}, request
+    ).encode()
+    pattern = re.escape(settings.STATIC_URL) + r"""([^"'?#\s]+)"""
+    assets = sorted(set(re.findall(pattern, html.decode())))
+    html_raw, html_compressed = transferred("index.html", html)
+    static_raw = static_compressed = 0
+    for name in assets:
+        path = finders.find(name)
+        if path:
+            with open(path, "rb") as file:
+                raw, compressed = transferred(name, file.read())
+            static_raw += raw
+            static_compressed += compressed
+    return {
+        "html, байт": html_raw,
+        "html сжатый, байт": html_compressed,
+        "файлов статики": len(assets),
+        "статика, байт": static_raw,
+        "статика сжатая, байт": static_compressed,
+        "первый визит, байт": html_raw + static_raw,
+        "первый визит сжатый, байт": html_compressed + static_compressed,
+        "повторный визит, запросов без хешей": 1 + len(assets),
+        "повторный визит, запросов с хешами": 1,
+    }
+
+
+STARTUP_SCRIPT = """
+import json, sys, time
+from wsgiref.util import setup_testing_defaults
+
+started = time.perf_counter()
+from yatube.wsgi import application
+loaded = time.perf_counter()
+environ = {"PATH_INFO": sys.argv[1]}
+setup_testing_defaults(environ)
+statuses = []
+b"".join(application(environ, lambda status, headers: statuses.append(status)))
+finished = time.perf_counter()
+print(json.dumps({
+    "load_ms": (loaded - started) * 1000,
+    "first_response_ms": (finished - loaded) * 1000,
+    "status": statuses[0],
+    "modules": sorted(sys.modules),
+}))
+"""
+IMPORTTIME_RE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| (\S)")
+HEAVY_MODULES = ("debug_toolbar", "PIL")
+
+
+def startup_run(settings_module, path="/"):
+    """Холодный старт в новом интерпретаторе.
+
+    Замеряет импорт yatube.wsgi и первый запрос к path; время всех
+    импортов берется из python -X importtime.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT, path],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": settings_module},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    report = json.loads(result.stdout.splitlines()[-1])
+    report["import_ms"] = sum(
+        int(match.group(1)) for match in IMPORTTIME_RE.finditer(result.stderr)
+    ) / 1000
+    return report
+
+
+def bench_startup(iterations):
+    """Холодный старт воркера с текущими настройками.
+
+    Для продакшен-профиля запускайте с
+    DJANGO_SETTINGS_MODULE=yatube.settings.prod.
+    """
+    runs = [
+        startup_run(os.environ["DJANGO_SETTINGS_MODULE"])
+        for _ in range(max(1, min(iterations, 5)))
+    ]
+    results = {
+        "загрузка wsgi, мс": median(run["load_ms"] for run in runs),
+        "первый ответ, мс": median(run["first_response_ms"] for run in runs),
+        "импорты, мс": median(run["import_ms"] for run in runs),
+        "модулей": len(runs[0]["modules"]),
+    }
+    for name in HEAVY_MODULES:
+        results[f"{name} загружен"] = name in runs[0]["modules"]
+    return results
+
+
+BENCHMARKS = {
+    "templates": bench_templates,
+    "pagination": bench_pagination,
+    "static": bench_static,
+    "startup": bench_startup,
+}
@@ -0,0 +1,232 @@
+"""Заполнение кеша без лавины запросов и кеш ответов для анонимов.
+
+Значение хранится дольше своего срока свежести: после истечения срока один
+запрос пересчитывает его под блокировкой, а остальные в это время
+получают устаревшую копию. Блокировка хранит метку владельца, и снимает
+ее только тот, кто ее взял. Ключ ответа включает версии пространств имен,
+поэтому сигналы моделей сбрасывают нужные страницы увеличением версии, и
+только разрешенные параметры запроса: произвольные параметры не плодят
+записи в кеше.
+"""
+import math
+import random
+import threading
+import time
+import uuid
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import close_old_connections
+from django.utils.translation import get_language
+
+from . import metrics
+
+STALE_TIMEOUT = 60 * 5
+LOCK_TIMEOUT = 30
+LOCK_WAIT = 2.0
+LOCK_POLL = 0.05
+
+
+def is_process_local(alias="default"):
+    """True, если кеш alias живет в памяти одного процесса и другие
+    процессы его не видят."""
+    return isinstance(caches[alias], (DummyCache, LocMemCache))
+
+
+def _version_key(namespace):
+    return f"ns:{namespace}"
+
+
+def namespace_versions(namespaces):
+    """Текущие версии пространств имен одним обращением к кешу."""
+    keys = [_version_key(namespace) for namespace in namespaces]
+    versions = cache.get_many(keys)
+    return [versions.get(key, 0) for key in keys]
+
+
+def bump_namespace(*namespaces):
+    """Делает недействительными все записи пространств имен."""
+    for namespace in namespaces:
+        key = _version_key(namespace)
+        if not cache.add(key, 1, None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, None)
+
+
+def _acquire(lock_key):
+    """Берет блокировку; возвращает метку владельца или None."""
+    token = uuid.uuid4().hex
+    return token if cache.add(lock_key, token, LOCK_TIMEOUT) else None
+
+
+def _release(lock_key, token):
+    """Снимает блокировку, если она все еще принадлежит token.
+
+    Если блокировка истекла и ее взял другой процесс, она остается.
+    """
+    if cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+def _store(key, compute, timeout, stale_timeout):
+    """Вычисляет значение и кладет его в кеш вместе со временем
+    вычисления, нужным для досрочного обновления."""
+    started = time.monotonic()
+    value = compute()
+    if value is not None:
+        delta = time.monotonic() - started
+        cache.set(
+            key,
+            (time.time() + timeout, delta, value),
+            timeout + stale_timeout,
+        )
+        metrics.incr("cache_fill.refill")
+    return value
+
+
+def _refresh_in_background(key, compute, timeout, stale_timeout, token):
+    lock_key = f"{key}:lock"
+
+    def run():
+        try:
+            _store(key, compute, timeout, stale_timeout)
+        finally:
+            _release(lock_key, token)
+            close_old_connections()
+
+    threading.Thread(target=run, daemon=True).start()
+    metrics.incr("cache_fill.background")
+
+
+def _expired(fresh_until, delta, beta):
+    """Вероятностное досрочное истечение (XFetch): чем дольше считается
+    значение и чем ближе срок, тем вероятнее обновить его заранее."""
+    now = time.time()
+    if now >= fresh_until:
+        return True
+    if beta and delta:
+        jitter = -math.log(1.0 - random.random())
+        if now + delta * beta * jitter >= fresh_until:
+            metrics.incr("cache_fill.early")
+            return True
+    return False
+
+
+def cache_fill(
+    key,
+    compute,
+    timeout,
+    stale_timeout=STALE_TIMEOUT,
+    beta=1.0,
+    background=False,
+):
+    """Возвращает значение из кеша или вычисляет его ровно одним
+    процессом.
+
+    Устаревшее значение отдается, пока другой запрос его пересчитывает;
+    с background=True пересчет идет в отдельном потоке и даже
+    запустивший его запрос получает устаревшую копию. При пустом кеше
+    конкуренты недолго ждут результата первого запроса, а не дождавшись,
+    вычисляют значение сами, не трогая чужую блокировку.
+    """
+    lock_key = f"{key}:lock"
+    entry = cache.get(key)
+    if entry is not None:
+        fresh_until, delta, value = entry
+        if not _expired(fresh_until, delta, beta):
+            metrics.incr("cache_fill.hit")
+            return value
+        token = _acquire(lock_key)
+        if token is None:
+            metrics.incr("cache_fill.stale")
+            return value
+        if background:
+            _refresh_in_background(
+                key, compute, timeout, stale_timeout, token
+            )
+            return value
+    else:
+        token = _acquire(lock_key)
+        if token is None:
+            metrics.incr("cache_fill.wait")
+            deadline = time.monotonic() + LOCK_WAIT
+            while time.monotonic() < deadline:
+                time.sleep(LOCK_POLL)
+                entry = cache.get(key)
+                if entry is not None:
+                    return entry[2]
+            return _store(key, compute, timeout, stale_timeout)
+    try:
+        return _store(key, compute, timeout, stale_timeout)
+    finally:
+        _release(lock_key, token)
+
+
+def _cacheable(response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+    )
+
+
+def _cache_path(request, params):
+    """Путь запроса только с разрешенными параметрами в постоянном
+    порядке."""
+    query = urlencode(
+        sorted(
+            (name, value)
+            for name in params
+            for value in request.GET.getlist(name)
+        )
+    )
+    return f"{request.path}?{query}" if query else request.path
+
+
+def cache_anonymous(timeout, namespaces=None, params=()):
+    """Декоратор представления: кеширует весь ответ для анонимов.
+
+    namespaces — функция от аргументов представления, возвращающая
+    пространства имен, по которым страницу можно сбросить. params —
+    параметры запроса, от которых зависит ответ; остальные в ключ не
+    попадают.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (
+                request.method not in ("GET", "HEAD")
+                or request.user.is_authenticated
+            ):
+                return view(request, *args, **kwargs)
+            names = namespaces(*args, **kwargs) if namespaces else []
+            key = "response:{}:{}:{}".format(
+                ".".join(map(str, namespace_versions(names))),
+                get_language(),
+                _cache_path(request, params),
+            )
+
+            rendered = []
+
+            def render():
+                response = view(request, *args, **kwargs)
+                if hasattr(response, "render"):
+                    response.render()
+                rendered.append(response)
+                if not _cacheable(response):
+                    return None
+                metrics.incr("response_cache.fill")
+                return response
+
+            response = cache_fill(key, render, timeout)
+            return response if response is not None else rendered[0]
+
+        return wrapper
+
+    return decorator
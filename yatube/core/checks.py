@@ -0,0 +1,112 @@
+"""Проверки настроек, мешающих производительности.
+
+Запускаются вместе с проверками развертывания:
+manage.py check --deploy --tag performance.
+"""
+from django.conf import settings
+from django.core.checks import Warning, register
+
+PERFORMANCE = "performance"
+
+PER_PROCESS_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(PERFORMANCE, deploy=True)
+def check_debug(app_configs, **kwargs):
+    errors = []
+    if settings.DEBUG:
+        errors.append(
+            Warning(
+                "DEBUG включен: каждый SQL-запрос сохраняется в "
+                "connection.queries, и память воркера растет.",
+                hint="Используйте профиль yatube.settings.prod.",
+                id="core.W001",
+            )
+        )
+    if "debug_toolbar" in settings.INSTALLED_APPS:
+        errors.append(
+            Warning(
+                "debug_toolbar установлен и замедляет каждый запрос.",
+                id="core.W002",
+            )
+        )
+    return errors
+
+
+@register(PERFORMANCE, deploy=True)
+def check_template_loaders(app_configs, **kwargs):
+    errors = []
+    for backend in settings.TEMPLATES:
+        loaders = backend.get("OPTIONS", {}).get("loaders")
+        if not loaders or not backend["BACKEND"].endswith("DjangoTemplates"):
+            continue
+        if not any(
+            (loader[0] if isinstance(loader, (list, tuple)) else loader)
+            == "django.template.loaders.cached.Loader"
+            for loader in loaders
+        ):
+            errors.append(
+                Warning(
+                    "Шаблоны загружаются без кеширующего загрузчика и "
+                    "разбираются заново при каждом рендере.",
+                    hint="Оберните загрузчики в "
+                    "django.template.loaders.cached.Loader.",
+                    id="core.W003",
+                )
+            )
+    return errors
+
+
+@register(PERFORMANCE, deploy=True)
+def check_databases(app_configs, **kwargs):
+    return [
+        Warning(
+            f"БД {alias}: CONN_MAX_AGE = 0, соединение открывается заново "
+            "на каждый запрос.",
+            hint="Задайте CONN_MAX_AGE и CONN_HEALTH_CHECKS = True.",
+            id="core.W004",
+        )
+        for alias, database in settings.DATABASES.items()
+        if not database.get("CONN_MAX_AGE")
+        and not database["ENGINE"].endswith("sqlite3")
+    ]
+
+
+@register(PERFORMANCE, deploy=True)
+def check_caches(app_configs, **kwargs):
+    errors = []
+    if settings.CACHES["default"]["BACKEND"] in PER_PROCESS_CACHES:
+        errors.append(
+            Warning(
+                "Кеш по умолчанию не общий для процессов: каждый воркер "
+                "заполняет свой кеш, а сброс версий страниц и лимиты "
+                "попыток входа работают только внутри процесса.",
+                hint="Используйте Redis или Memcached.",
+                id="core.W005",
+            )
+        )
+    if settings.SESSION_ENGINE == "django.contrib.sessions.backends.db":
+        errors.append(
+            Warning(
+                "Сессии читаются из БД на каждый запрос.",
+                hint="Используйте cached_db или signed_cookies.",
+                id="core.W006",
+            )
+        )
+    return errors
+
+
+@register(PERFORMANCE, deploy=True)
+def check_upload_limits(app_configs, **kwargs):
+    if settings.DATA_UPLOAD_MAX_MEMORY_SIZE is None:
+        return [
+            Warning(
+                "DATA_UPLOAD_MAX_MEMORY_SIZE = None: тело запроса любого "
+                "размера читается в память.",
+                id="core.W007",
+            )
+        ]
+    return []
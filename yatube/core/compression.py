@@ -0,0 +1,281 @@
+"""Сжатие ответов и удаление лишних пробелов из HTML.
+
+CompressionMiddleware сжимает текстовые ответы больше
+COMPRESSION_MIN_SIZE алгоритмом brotli (если установлен) или gzip,
+потоковые ответы сжимает по частям. Сжатое тело кешируемых страниц
+сохраняется в кеше по хешу исходного, поэтому повторная отдача той же
+страницы не тратит процессор. Объем до и после сжатия и затраченное
+время пишутся в core.metrics.
+
+Как и GZipMiddleware, gzip-ответ получает в заголовке имя файла
+случайной длины, а HTML-страница с CSRF-токеном при сжатии brotli —
+комментарий случайной длины. Так длина ответа не выдает токен атакой
+BREACH. Страницы с токеном уникальны, поэтому их сжатое тело не кешируется.
+"""
+import re
+import secrets
+import time
+import zlib
+from hashlib import md5
+from importlib.util import find_spec
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import FileResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+from . import metrics
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Столько байт случайного заполнения самое большее, как у GZipMiddleware.
+MAX_RANDOM_BYTES = 100
+PROTECTED_RE = re.compile(
+    r"(<(pre|textarea|script|style)\b.*?</\2\s*>)", re.S | re.I
+)
+NEWLINE_RE = re.compile(r"[ \t\r\f\v]*\n\s*")
+SPACES_RE = re.compile(r"[ \t\r\f\v]{2,}")
+HAS_BROTLI = find_spec("brotli") is not None
+
+
+def minify_html(html):
+    """Схлопывает пробелы в HTML, не трогая pre, textarea, script и style.
+
+    Пробельная последовательность заменяется одним пробелом или
+    переводом строки, поэтому отображение страницы не меняется.
+    """
+    parts = PROTECTED_RE.split(html)
+    result = []
+    # split возвращает текст, блок целиком и имя тега по очереди.
+    for index in range(0, len(parts), 3):
+        text = NEWLINE_RE.sub("\n", parts[index])
+        result.append(SPACES_RE.sub(" ", text))
+        if index + 1 < len(parts):
+            result.append(parts[index + 1])
+    return "".join(result)
+
+
+def accepted_encodings(header):
+    """Веса кодировок из Accept-Encoding: {"gzip": 1.0, "br": 0.0}."""
+    weights = {}
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+    return weights
+
+
+def choose_encoding(request, brotli=HAS_BROTLI):
+    """Кодировка с наибольшим весом; при равных весах brotli.
+
+    Кодировка с q=0 запрещена клиентом и не выбирается.
+    """
+    weights = accepted_encodings(request.headers.get("Accept-Encoding", ""))
+    codings = ("br", "gzip") if brotli else ("gzip",)
+
+    def weight(coding):
+        return weights.get(coding, weights.get("*", 0.0))
+
+    allowed = [coding for coding in codings if weight(coding) > 0]
+    return max(allowed, key=weight, default=None)
+
+
+def random_padding():
+    return secrets.token_hex(
+        secrets.randbelow(MAX_RANDOM_BYTES // 2) + 1
+    ).encode()
+
+
+def compress(data, encoding, pad_html=False):
+    """Сжимает тело ответа.
+
+    gzip всегда получает случайное имя файла в заголовке. У brotli такого
+    поля нет, поэтому при pad_html в конец HTML добавляется комментарий
+    случайной длины.
+    """
+    if encoding == "br":
+        import brotli
+
+        if pad_html:
+            data += b"<!-- " + random_padding() + b" -->"
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return compress_string(data, max_random_bytes=MAX_RANDOM_BYTES)
+
+
+def gzip_header():
+    """Заголовок gzip с именем файла случайной длины."""
+    return (
+        b"\x1f\x8b\x08\x08\x00\x00\x00\x00\x00\xff"
+        + random_padding()
+        + b"\x00"
+    )
+
+
+def compress_stream(chunks, encoding):
+    """Сжимает поток по частям, не собирая его в памяти.
+
+    Каждая часть сбрасывается сразу, чтобы клиент получал данные без
+    задержки; поэтому gzip-поток собирается здесь, а не через
+    compress_sequence, который копит данные в буфере.
+    """
+    if encoding == "br":
+        import brotli
+
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+        def process(chunk):
+            return compressor.process(chunk) + compressor.flush()
+
+        finish = compressor.finish
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, -15)
+        crc, size = 0, 0
+
+        def process(chunk):
+            nonlocal crc, size
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            return compressor.compress(chunk) + compressor.flush(
+                zlib.Z_SYNC_FLUSH
+            )
+
+        def finish():
+            return (
+                compressor.flush()
+                + crc.to_bytes(4, "little")
+                + (size & 0xFFFFFFFF).to_bytes(4, "little")
+            )
+
+        yield gzip_header()
+    for chunk in chunks:
+        started = time.thread_time()
+        data = process(chunk)
+        metrics.incr(
+            "compression.cpu_us",
+            int((time.thread_time() - started) * 1_000_000),
+        )
+        metrics.incr("compression.bytes_in", len(chunk))
+        metrics.incr("compression.bytes_out", len(data))
+        if data:
+            yield data
+    data = finish()
+    metrics.incr("compression.bytes_out", len(data))
+    yield data
+
+
+def is_cacheable(request, response):
+    """Страница, которую можно отдать другим анонимным посетителям."""
+    cache_control = response.get("Cache-Control", "")
+    user = getattr(request, "user", None)
+    return (
+        request.method == "GET"
+        and response.status_code == 200
+        and not response.cookies
+        and "private" not in cache_control
+        and "no-store" not in cache_control
+        and not (user and user.is_authenticated)
+        and not uses_csrf_token(request)
+    )
+
+
+def uses_csrf_token(request):
+    """Ответ содержит CSRF-токен: его запрашивали при рендере."""
+    return bool(
+        request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+        or getattr(request, "csrf_cookie_set", False)
+    )
+
+
+class CompressionMiddleware:
+    """Сжимает ответы и убирает лишние пробелы из HTML."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        content_type = response.get("Content-Type", "")
+        if (
+            isinstance(response, FileResponse)
+            or response.has_header("Content-Encoding")
+            or not content_type.startswith(COMPRESSIBLE_TYPES)
+        ):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        html = content_type.startswith("text/html")
+        secret = uses_csrf_token(request)
+        # Заполнение brotli есть только для HTML целиком; остальные ответы
+        # с токеном сжимаются gzip.
+        padded = html and not response.streaming
+        encoding = choose_encoding(
+            request, HAS_BROTLI and (padded or not secret)
+        )
+        if response.streaming:
+            if encoding:
+                response.streaming_content = compress_stream(
+                    response.streaming_content, encoding
+                )
+                del response["Content-Length"]
+                self.finish(response, encoding)
+            return response
+        body = response.content
+        if len(body) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        cache_key = None
+        if is_cacheable(request, response):
+            cache_key = "compressed:{}:{}".format(
+                encoding, md5(body).hexdigest()
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                metrics.incr("compression.cache_hits")
+                return self.replace(response, cached, encoding)
+        started = time.thread_time()
+        content = body
+        if settings.HTML_MINIFY and html:
+            content = minify_html(
+                body.decode(response.charset)
+            ).encode(response.charset)
+        if encoding:
+            content = compress(content, encoding, pad_html=html and secret)
+        metrics.incr(
+            "compression.cpu_us",
+            int((time.thread_time() - started) * 1_000_000),
+        )
+        metrics.incr("compression.responses")
+        metrics.incr("compression.bytes_in", len(body))
+        metrics.incr("compression.bytes_out", len(content))
+        if cache_key:
+            cache.set(cache_key, content, settings.COMPRESSION_CACHE_TIMEOUT)
+        return self.replace(response, content, encoding)
+
+    def replace(self, response, content, encoding):
+        response.content = content
+        response["Content-Length"] = len(content)
+        if encoding:
+            self.finish(response, encoding)
+        return response
+
+    def finish(self, response, encoding):
+        response["Content-Encoding"] = encoding
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
@@ -0,0 +1,162 @@
+"""Очередь исходящих писем.
+
+OutboxEmailBackend подключается как EMAIL_BACKEND и только сохраняет
+письма в таблицу, поэтому запрос, отправляющий почту, не ждет SMTP.
+Получатели, скрытая копия, заголовки, альтернативные версии и вложения
+хранятся отдельными полями, и при отправке письмо собирается заново.
+Доставку выполняет команда send_outbox: пачками, с повторами и
+экспоненциальной задержкой между попытками. Пачка забирается короткой
+транзакцией, а SMTP работает уже вне ее.
+"""
+import base64
+from datetime import timedelta
+from email.mime.base import MIMEBase
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+MAX_ATTEMPTS = 8
+RETRY_DELAY = 30
+# Столько письмо считается занятым воркером, забравшим его в пачку. Если
+# воркер упадет, письмо вернется в очередь по истечении этого срока.
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+def _encode_attachment(attachment):
+    if isinstance(attachment, MIMEBase):
+        filename = attachment.get_filename()
+        content = attachment.get_payload(decode=True) or b""
+        mimetype = attachment.get_content_type()
+    else:
+        filename, content, mimetype = attachment
+    if isinstance(content, str):
+        content = content.encode()
+    return [filename, base64.b64encode(content).decode(), mimetype]
+
+
+class OutboxEmailBackend(BaseEmailBackend):
+    """Почтовый бэкенд, складывающий письма в очередь."""
+
+    def send_messages(self, email_messages):
+        queued = [
+            OutboxMessage(
+                subject=message.subject,
+                body=message.body,
+                alternatives=[
+                    list(alternative)
+                    for alternative in getattr(message, "alternatives", ())
+                ],
+                attachments=[
+                    _encode_attachment(attachment)
+                    for attachment in message.attachments
+                ],
+                from_email=message.from_email,
+                recipients=list(message.to),
+                cc=list(message.cc),
+                bcc=list(message.bcc),
+                reply_to=list(message.reply_to),
+                headers=dict(message.extra_headers),
+            )
+            for message in email_messages
+            if message.recipients()
+        ]
+        OutboxMessage.objects.bulk_create(queued)
+        return len(queued)
+
+
+def retry_delay(attempts):
+    """Задержка перед следующей попыткой: удваивается с каждой ошибкой."""
+    return timedelta(seconds=RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def _build(message, connection):
+    email = EmailMultiAlternatives(
+        message.subject,
+        message.body,
+        message.from_email,
+        message.recipients,
+        bcc=message.bcc,
+        connection=connection,
+        headers=message.headers,
+        cc=message.cc,
+        reply_to=message.reply_to,
+    )
+    for content, mimetype in message.alternatives:
+        email.attach_alternative(content, mimetype)
+    for filename, content, mimetype in message.attachments:
+        email.attach(filename, base64.b64decode(content), mimetype)
+    return email
+
+
+def _claim_batch(batch_size, now):
+    """Забирает пачку готовых писем, откладывая их на CLAIM_TIMEOUT,
+    чтобы другие воркеры их не взяли."""
+    with transaction.atomic():
+        batch = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(
+                sent__isnull=True,
+                next_attempt__lte=now,
+                attempts__lt=MAX_ATTEMPTS,
+            )[:batch_size]
+        )
+        OutboxMessage.objects.filter(
+            pk__in=[message.pk for message in batch]
+        ).update(next_attempt=now + CLAIM_TIMEOUT)
+    return batch
+
+
+def _fail(message, error, now):
+    message.attempts += 1
+    message.next_attempt = now + retry_delay(message.attempts)
+    message.last_error = repr(error)
+
+
+def deliver_outbox(batch_size=50):
+    """Отправляет одну пачку готовых к отправке писем.
+
+    Ошибка соединения с почтовым сервером откладывает всю пачку, как и
+    ошибка отправки отдельного письма. Возвращает пару (отправлено,
+    отложено до следующей попытки).
+    """
+    now = timezone.now()
+    batch = _claim_batch(batch_size, now)
+    if not batch:
+        return 0, 0
+    sent, failed = [], []
+    connection = get_connection(
+        settings.OUTBOX_DELIVERY_BACKEND, fail_silently=False
+    )
+    try:
+        connection.open()
+    except Exception as error:
+        for message in batch:
+            _fail(message, error, now)
+        failed = batch
+    else:
+        try:
+            for message in batch:
+                try:
+                    _build(message, connection).send()
+                except Exception as error:
+                    _fail(message, error, now)
+                    failed.append(message)
+                else:
+                    message.attempts += 1
+                    message.sent = now
+                    sent.append(message)
+        finally:
+            try:
+                connection.close()
+            except Exception:
+                pass
+    OutboxMessage.objects.bulk_update(sent, ["attempts", "sent"])
+    OutboxMessage.objects.bulk_update(
+        failed, ["attempts", "next_attempt", "last_error"]
+    )
+    return len(sent), len(failed)
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import BENCHMARKS
+
+
+class Command(BaseCommand):
+    help = "Запускает замеры производительности."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "targets",
+            nargs="*",
+            help=f"Что замерить: {', '.join(BENCHMARKS)}. По умолчанию все.",
+        )
+        parser.add_argument("--iterations", type=int, default=200)
+
+    def handle(self, *args, **options):
+        unknown = set(options["targets"]) - set(BENCHMARKS)
+        if unknown:
+            raise CommandError(f"Неизвестные замеры: {', '.join(unknown)}")
+        for target in options["targets"] or BENCHMARKS:
+            results = BENCHMARKS[target](options["iterations"])
+            for name, value in results.items():
+                self.stdout.write(f"{target}: {name}: {value:.2f}")
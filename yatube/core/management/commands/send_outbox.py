@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.mail import deliver_outbox
+
+
+class Command(BaseCommand):
+    help = "Отправляет письма из очереди."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Работать постоянно, опрашивая очередь.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Пауза между опросами пустой очереди, секунд.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = deliver_outbox(options["batch_size"])
+            if sent or failed:
+                self.stdout.write(
+                    f"Отправлено: {sent}, отложено: {failed}"
+                )
+            if not options["loop"]:
+                return
+            if not sent and not failed:
+                time.sleep(options["interval"])
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import get_internal_wsgi_application
+
+from core.server import PreforkServer, default_workers
+from core.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = (
+        "Запускает предфоркающий WSGI-сервер: приложение загружается и "
+        "прогревается в мастере, воркеры перезапускаются после "
+        "--max-requests запросов."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "addrport",
+            nargs="?",
+            default="127.0.0.1:8000",
+            help="Адрес и порт, по умолчанию 127.0.0.1:8000.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=default_workers(),
+            help="Число воркеров, по умолчанию 2 × ядра + 1.",
+        )
+        parser.add_argument("--max-requests", type=int, default=1000)
+        parser.add_argument("--max-requests-jitter", type=int, default=50)
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=30,
+            help="Сколько секунд ждать данных от клиента, по умолчанию 30.",
+        )
+        parser.add_argument(
+            "--no-warmup",
+            action="store_false",
+            dest="warmup",
+            help="Не прогревать приложение перед запуском воркеров.",
+        )
+
+    def handle(self, *args, **options):
+        host, _, port = options["addrport"].rpartition(":")
+        if not port.isdigit():
+            raise CommandError(f"Неверный адрес: {options['addrport']}")
+        application = get_internal_wsgi_application()
+        if options["warmup"]:
+            warm_up(log=self.stdout.write)
+        server = PreforkServer(
+            (host or "127.0.0.1", int(port)),
+            application,
+            workers=options["workers"],
+            max_requests=options["max_requests"],
+            max_requests_jitter=options["max_requests_jitter"],
+            request_timeout=options["timeout"],
+            log=self.stdout.write,
+        )
+        server.run()
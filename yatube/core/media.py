@@ -0,0 +1,153 @@
+"""Отдача медиафайлов без копирования байтов через Python.
+
+serve_file отвечает на условные запросы и запросы диапазонов, а сами
+данные передает фронт-серверу. Способ задает MEDIA_SERVE_MODE:
+accel — заголовок X-Accel-Redirect для nginx, sendfile — X-Sendfile для
+Apache и lighttpd, direct — FileResponse. В режиме direct WSGI-сервер
+получает файл через wsgi.file_wrapper; встроенный core.server отправляет
+его os.sendfile.
+"""
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.http import (FileResponse, Http404, HttpResponse,
+                         HttpResponseNotModified)
+from django.utils.encoding import filepath_to_uri
+from django.utils.http import parse_etags
+
+HASH_RE = re.compile(r"[0-9a-f]{32,64}")
+RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)")
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+MAX_AGE = 60 * 60
+
+
+def clean_name(name):
+    """Нормализует путь из URL и не выпускает его за пределы хранилища."""
+    name = posixpath.normpath(name.replace("\\", "/")).lstrip("/")
+    if name in ("", ".") or name.startswith(".."):
+        raise Http404("Файл не найден")
+    return name
+
+
+def content_etag(name, content_hash=""):
+    """Сильный ETag из хеша содержимого.
+
+    У файлов, разложенных по хешу, он уже есть в имени.
+    """
+    stem = posixpath.splitext(posixpath.basename(name))[0]
+    if HASH_RE.fullmatch(stem):
+        return f'"{stem}"'
+    if content_hash:
+        return f'"{content_hash}"'
+    return None
+
+
+def parse_range(header, size):
+    """Границы (start, end) одного диапазона из заголовка Range.
+
+    Возвращает None, если заголовка нет или он не разобран, и
+    бросает ValueError, если диапазон лежит за концом файла.
+    """
+    match = RANGE_RE.fullmatch(header.strip()) if header else None
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+class RangeFile:
+    """Отдает не больше length байт файла с текущей позиции.
+
+    fileno намеренно нет: иначе WSGI-сервер отправит через sendfile весь
+    файл, а не диапазон.
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.name = file.name
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def storage_path(storage, name):
+    try:
+        return storage.path(name)
+    except NotImplementedError:
+        return None
+
+
+def serve_file(request, storage, name, accel_prefix, content_hash=""):
+    """Ответ с содержимым файла name из storage."""
+    etag = content_etag(name, content_hash)
+    if etag and etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+    mode = settings.MEDIA_SERVE_MODE
+    path = storage_path(storage, name)
+    if mode == "accel":
+        response = HttpResponse(content_type="")
+        response["X-Accel-Redirect"] = accel_prefix + filepath_to_uri(name)
+    elif mode == "sendfile" and path:
+        response = HttpResponse(content_type="")
+        response["X-Sendfile"] = path
+    else:
+        response = file_response(request, storage, name, path, etag)
+    if etag:
+        response["ETag"] = etag
+        response["Cache-Control"] = (
+            f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+        )
+    else:
+        response["Cache-Control"] = f"public, max-age={MAX_AGE}"
+    return response
+
+
+def file_response(request, storage, name, path, etag):
+    """FileResponse с поддержкой одного диапазона байтов."""
+    if path is not None and not os.path.isfile(path):
+        raise Http404("Файл не найден")
+    try:
+        file = storage.open(name, "rb")
+    except FileNotFoundError:
+        raise Http404("Файл не найден")
+    size = storage.size(name)
+    header = request.headers.get("Range", "")
+    if_range = request.headers.get("If-Range")
+    if if_range and if_range != etag:
+        header = ""
+    try:
+        byte_range = parse_range(header, size)
+    except ValueError:
+        file.close()
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+    if byte_range is None:
+        response = FileResponse(file)
+    else:
+        start, end = byte_range
+        file.seek(start)
+        response = FileResponse(RangeFile(file, end - start + 1), status=206)
+        response["Content-Length"] = end - start + 1
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Accept-Ranges"] = "bytes"
+    return response
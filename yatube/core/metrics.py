@@ -0,0 +1,23 @@
+"""Простые счетчики внутри процесса для наблюдения за кешами."""
+import threading
+from collections import Counter
+
+_counters = Counter()
+_lock = threading.Lock()
+
+
+def incr(name, value=1):
+    """Увеличивает счетчик name на value."""
+    with _lock:
+        _counters[name] += value
+
+
+def snapshot():
+    """Возвращает копию всех счетчиков."""
+    with _lock:
+        return dict(_counters)
+
+
+def reset():
+    with _lock:
+        _counters.clear()
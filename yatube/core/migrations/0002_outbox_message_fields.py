@@ -0,0 +1,75 @@
+# Generated by Django 4.2 on 2026-10-19 19:26
+
+from django.db import migrations, models
+
+
+def move_html_body(apps, schema_editor):
+    OutboxMessage = apps.get_model("core", "OutboxMessage")
+    messages = OutboxMessage.objects.exclude(html_body="")
+    for message in messages.iterator():
+        message.alternatives = [[message.html_body, "text/html"]]
+        message.save(update_fields=("alternatives",))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="outboxmessage",
+            name="alternatives",
+            field=models.JSONField(
+                blank=True, default=list, verbose_name="Альтернативные версии"
+            ),
+        ),
+        migrations.AddField(
+            model_name="outboxmessage",
+            name="attachments",
+            field=models.JSONField(
+                blank=True, default=list, verbose_name="Вложения"
+            ),
+        ),
+        migrations.AddField(
+            model_name="outboxmessage",
+            name="bcc",
+            field=models.JSONField(
+                blank=True, default=list, verbose_name="Скрытая копия"
+            ),
+        ),
+        migrations.AddField(
+            model_name="outboxmessage",
+            name="cc",
+            field=models.JSONField(
+                blank=True, default=list, verbose_name="Копия"
+            ),
+        ),
+        migrations.AddField(
+            model_name="outboxmessage",
+            name="headers",
+            field=models.JSONField(
+                blank=True, default=dict, verbose_name="Заголовки"
+            ),
+        ),
+        migrations.AddField(
+            model_name="outboxmessage",
+            name="reply_to",
+            field=models.JSONField(
+                blank=True, default=list, verbose_name="Ответить"
+            ),
+        ),
+        migrations.RunPython(
+            move_html_body, migrations.RunPython.noop, elidable=True
+        ),
+        migrations.RemoveField(
+            model_name="outboxmessage",
+            name="html_body",
+        ),
+        migrations.AlterField(
+            model_name="outboxmessage",
+            name="recipients",
+            field=models.JSONField(default=list, verbose_name="Кому"),
+        ),
+    ]
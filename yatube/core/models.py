@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class CreatedModel(models.Model):
@@ -12,3 +13,40 @@ class CreatedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class OutboxMessage(models.Model):
+    """Письмо в очереди на отправку."""
+
+    subject = models.CharField("Тема", max_length=255)
+    body = models.TextField("Текст")
+    alternatives = models.JSONField(
+        "Альтернативные версии", default=list, blank=True
+    )
+    attachments = models.JSONField("Вложения", default=list, blank=True)
+    from_email = models.CharField("Отправитель", max_length=254)
+    recipients = models.JSONField("Кому", default=list)
+    cc = models.JSONField("Копия", default=list, blank=True)
+    bcc = models.JSONField("Скрытая копия", default=list, blank=True)
+    reply_to = models.JSONField("Ответить", default=list, blank=True)
+    headers = models.JSONField("Заголовки", default=dict, blank=True)
+    created = models.DateTimeField("Дата постановки", auto_now_add=True)
+    attempts = models.PositiveSmallIntegerField("Попыток", default=0)
+    next_attempt = models.DateTimeField(
+        "Следующая попытка", default=timezone.now
+    )
+    sent = models.DateTimeField("Дата отправки", null=True, blank=True)
+    last_error = models.TextField("Последняя ошибка", blank=True)
+
+    class Meta:
+        ordering = ("next_attempt",)
+        verbose_name = "Исходящее письмо"
+        verbose_name_plural = "Исходящие письма"
+        indexes = [
+            models.Index(
+                fields=("sent", "next_attempt"), name="outbox_due_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return self.subject
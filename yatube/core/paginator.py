@@ -0,0 +1,95 @@
+"""Пагинаторы, не считающие COUNT(*) на каждый запрос."""
+from hashlib import md5
+
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from .cache import cache_fill
+
+COUNT_CACHE_TIMEOUT = 60
+
+
+def estimated_table_rows(model, using):
+    """Оценка числа строк по статистике планировщика PostgreSQL.
+
+    Для других СУБД возвращает None.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return row[0] if row and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор с приблизительным числом объектов.
+
+    Для выборки без фильтров берется оценка из статистики СУБД, иначе
+    точное значение COUNT(*) кешируется на COUNT_CACHE_TIMEOUT секунд.
+    """
+
+    count_timeout = COUNT_CACHE_TIMEOUT
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, "query"):
+            return super().count
+        if not queryset.query.where:
+            estimate = estimated_table_rows(queryset.model, queryset.db)
+            if estimate is not None:
+                return estimate
+        sql = str(queryset.query).encode()
+        key = f"count:{queryset.model._meta.label}:{md5(sql).hexdigest()}"
+        return cache_fill(key, queryset.count, self.count_timeout)
+
+
+class FeedPaginator(EstimatedCountPaginator):
+    """Пагинатор лент, устойчивый к неточному числу объектов.
+
+    Страница выбирается с одним лишним объектом, поэтому наличие
+    следующей страницы известно точно, даже если count устарел. Номер
+    страницы больше оценки num_pages допустим, пока на ней есть посты.
+    """
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("Номер страницы должен быть числом.")
+        if number < 1:
+            raise EmptyPage("Номер страницы меньше 1.")
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage("На этой странице нет результатов.")
+        page = self._get_page(rows[:self.per_page], number, self)
+        # Обычный Page, но следующая страница и последний номер на
+        # странице берутся из выборки, а не из count.
+        has_more = len(rows) > self.per_page
+        end = bottom + len(page.object_list)
+        page.has_next = lambda: has_more
+        page.end_index = lambda: end
+        return page
+
+    def get_page(self, number):
+        try:
+            return self.page(number)
+        except PageNotAnInteger:
+            return self.page(1)
+        except EmptyPage:
+            pass
+        try:
+            return self.page(max(self.num_pages, 1))
+        except EmptyPage:
+            return self.page(1)
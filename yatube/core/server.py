@@ -0,0 +1,221 @@
+"""Предфоркающий WSGI-сервер.
+
+Мастер загружает приложение и прогревает его (SERVER_WARMUP) до fork,
+поэтому воркеры получают готовые модули, URL-резолвер и шаблоны через
+copy-on-write, а не собирают их заново. Воркеры принимают соединения с
+общего сокета, обрабатывают max_requests запросов (с разбросом, чтобы не
+перезапускаться одновременно) и завершаются; мастер запускает вместо них
+новые. Соединения с БД закрываются до fork и при выходе воркера.
+
+Воркер однопоточный, поэтому чтение запроса ограничено request_timeout:
+медленный или молчащий клиент не занимает воркер навсегда. Воркеры,
+которые падают сразу после запуска, перезапускаются с нарастающей
+паузой, а не в плотном цикле. Файлы из wsgi.file_wrapper (FileResponse)
+уходят в сокет через os.sendfile, минуя копирование в Python.
+"""
+import gc
+import os
+import random
+import signal
+import socket
+import sys
+import time
+
+from django.core.servers.basehttp import (
+    ServerHandler,
+    WSGIRequestHandler,
+    WSGIServer,
+)
+from django.db import connections
+
+ACCEPT_TIMEOUT = 1
+MIN_WORKER_LIFETIME = 1.0
+FIRST_RESPAWN_DELAY = 0.1
+MAX_RESPAWN_DELAY = 30.0
+
+
+class SendfileHandler(ServerHandler):
+    """ServerHandler, отдающий файлы с дескриптором через os.sendfile.
+
+    Файл без дескриптора или ответ без Content-Length отправляется
+    обычным чтением по блокам.
+    """
+
+    def sendfile(self):
+        file = self.result.filelike
+        if "Content-Length" not in self.headers:
+            return False
+        try:
+            file.fileno()
+        except (AttributeError, OSError):
+            return False
+        if not self.headers_sent:
+            self.send_headers()
+        self._flush()
+        self.bytes_sent += self.request_handler.connection.sendfile(
+            file, offset=file.tell(), count=int(self.headers["Content-Length"])
+        )
+        return True
+
+
+class WorkerRequestHandler(WSGIRequestHandler):
+    """WSGIRequestHandler с SendfileHandler вместо ServerHandler."""
+
+    def handle_one_request(self):
+        # Повторяет WSGIRequestHandler.handle_one_request, где класс
+        # обработчика задан жестко.
+        self.raw_requestline = self.rfile.readline(65537)
+        if len(self.raw_requestline) > 65536:
+            self.requestline = ""
+            self.request_version = ""
+            self.command = ""
+            self.send_error(414)
+            return
+        if not self.parse_request():
+            return
+        handler = SendfileHandler(
+            self.rfile, self.wfile, self.get_stderr(), self.get_environ()
+        )
+        handler.request_handler = self
+        handler.run(self.server.get_app())
+
+
+class WorkerServer(WSGIServer):
+    """WSGIServer воркера, считающий обработанные запросы."""
+
+    handled = 0
+    request_timeout = 30
+
+    def get_request(self):
+        # Общий сокет неблокирующий: если соединение принял другой
+        # воркер, accept не повиснет, а вернется к ожиданию.
+        connection, address = self.socket.accept()
+        connection.settimeout(self.request_timeout)
+        return connection, address
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], TimeoutError):
+            return
+        super().handle_error(request, client_address)
+
+    def finish_request(self, request, client_address):
+        super().finish_request(request, client_address)
+        self.handled += 1
+
+
+def default_workers():
+    """Число воркеров по доступным ядрам: 2 × ядра + 1."""
+    if hasattr(os, "sched_getaffinity"):
+        cores = len(os.sched_getaffinity(0))
+    else:
+        cores = os.cpu_count() or 1
+    return cores * 2 + 1
+
+
+class PreforkServer:
+    """Мастер, который держит сокет и нужное число воркеров."""
+
+    def __init__(self, address, application, workers=None,
+                 max_requests=1000, max_requests_jitter=50, backlog=128,
+                 request_timeout=30, log=print):
+        self.application = application
+        self.workers = workers or default_workers()
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.request_timeout = request_timeout
+        self.log = log
+        self.socket = socket.create_server(address, backlog=backlog)
+        self.socket.setblocking(False)
+        self.address = self.socket.getsockname()
+        self.children = {}
+        self.failures = 0
+        self.stopping = False
+
+    def run(self):
+        """Запускает воркеры и перезапускает завершившиеся до остановки."""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        connections.close_all()
+        # Объекты, созданные при загрузке, больше не трогает сборщик
+        # мусора, и страницы памяти остаются общими с воркерами.
+        gc.freeze()
+        host, port = self.address[:2]
+        self.log(f"Слушаю http://{host}:{port}/, воркеров: {self.workers}")
+        for _ in range(self.workers):
+            self.spawn()
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            started = self.children.pop(pid, time.monotonic())
+            if self.stopping:
+                continue
+            delay = self.respawn_delay(
+                os.waitstatus_to_exitcode(status),
+                time.monotonic() - started,
+            )
+            if delay:
+                self.log(f"Воркер {pid} упал, перезапуск через {delay:.1f} с")
+                time.sleep(delay)
+            if not self.stopping:
+                self.spawn()
+        self.socket.close()
+
+    def respawn_delay(self, exit_code, lifetime):
+        """Пауза перед заменой воркера: удваивается, пока воркеры падают
+        сразу после запуска, и сбрасывается после нормальной работы."""
+        if exit_code == 0 or lifetime >= MIN_WORKER_LIFETIME:
+            self.failures = 0
+            return 0
+        self.failures += 1
+        return min(
+            MAX_RESPAWN_DELAY, FIRST_RESPAWN_DELAY * 2 ** (self.failures - 1)
+        )
+
+    def stop(self, signum=None, frame=None):
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.children.pop(pid, None)
+
+    def spawn(self):
+        pid = os.fork()
+        if pid:
+            self.children[pid] = time.monotonic()
+            return
+        code = 0
+        try:
+            self.serve_worker()
+        except Exception as error:
+            self.log(f"Воркер {os.getpid()} упал: {error!r}")
+            code = 1
+        finally:
+            connections.close_all()
+            os._exit(code)
+
+    def serve_worker(self):
+        """Цикл воркера: обрабатывает запросы до лимита или сигнала."""
+        stopping = []
+        signal.signal(signal.SIGTERM, lambda *args: stopping.append(True))
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        server = WorkerServer(
+            self.address, WorkerRequestHandler, bind_and_activate=False
+        )
+        server.socket.close()
+        server.socket = self.socket
+        server.server_name = self.address[0]
+        server.server_port = self.address[1]
+        server.setup_environ()
+        server.set_app(self.application)
+        server.timeout = ACCEPT_TIMEOUT
+        server.request_timeout = self.request_timeout
+        limit = self.max_requests + random.randint(
+            0, self.max_requests_jitter
+        )
+        while not stopping and server.handled < limit:
+            server.handle_request()
@@ -0,0 +1,121 @@
+"""Статика для продакшена.
+
+PrecompressedManifestStaticFilesStorage добавляет к именам файлов хеш
+содержимого и при collectstatic складывает рядом сжатые копии .gz и .br
+(brotli — если установлен). StaticFilesMiddleware отдает собранную
+статику без nginx: выбирает сжатую копию по Accept-Encoding, а файлам с
+хешем в имени ставит кеширование на год.
+"""
+import gzip
+import mimetypes
+import os
+import re
+from importlib.util import find_spec
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.base import ContentFile
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import parse_etags
+
+from .media import IMMUTABLE_MAX_AGE, clean_name
+
+COMPRESSIBLE = (
+    ".css", ".js", ".map", ".svg", ".txt", ".html", ".json", ".xml", ".ico"
+)
+MIN_COMPRESS_SIZE = 256
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{12}\.\w+$")
+MAX_AGE = 60
+
+
+def compressors():
+    """Пары (расширение, функция сжатия) в порядке предпочтения."""
+    if find_spec("brotli"):
+        import brotli
+
+        yield ".br", "br", brotli.compress
+    yield ".gz", "gzip", lambda data: gzip.compress(data, 9, mtime=0)
+
+
+def compressed_variants(name, data):
+    """Сжатые копии файла, которые имеет смысл хранить."""
+    if not name.endswith(COMPRESSIBLE) or len(data) < MIN_COMPRESS_SIZE:
+        return {}
+    variants = {}
+    for extension, _, compress in compressors():
+        compressed = compress(data)
+        if len(compressed) < len(data):
+            variants[extension] = compressed
+    return variants
+
+
+class PrecompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Статика с хешами в именах и заранее сжатыми копиями."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in sorted(set(self.hashed_files.values())):
+            with self.open(name) as original:
+                data = original.read()
+            for extension, compressed in compressed_variants(
+                name, data
+            ).items():
+                if self.exists(name + extension):
+                    self.delete(name + extension)
+                self._save(name + extension, ContentFile(compressed))
+                yield name, name + extension, True
+
+
+class StaticFilesMiddleware:
+    """Отдает файлы из STATIC_ROOT, если STATIC_SERVE включен."""
+
+    def __init__(self, get_response):
+        if not settings.STATIC_SERVE or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+
+    def __call__(self, request):
+        if request.method in ("GET", "HEAD") and request.path.startswith(
+            self.prefix
+        ):
+            response = self.serve(request, request.path[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, name):
+        path = safe_join(settings.STATIC_ROOT, clean_name(name))
+        if not os.path.isfile(path):
+            return None
+        accepted = request.headers.get("Accept-Encoding", "")
+        encoding = None
+        for extension, coding, _ in compressors():
+            if coding in accepted and os.path.isfile(path + extension):
+                path, encoding = path + extension, coding
+                break
+        stat = os.stat(path)
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = HttpResponseNotModified()
+        else:
+            response = FileResponse(
+                open(path, "rb"),
+                content_type=mimetypes.guess_type(name)[0]
+                or "application/octet-stream",
+            )
+            if encoding:
+                response["Content-Encoding"] = encoding
+        response["ETag"] = etag
+        response["Vary"] = "Accept-Encoding"
+        if HASHED_NAME_RE.search(name):
+            response["Cache-Control"] = (
+                f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+            )
+        else:
+            response["Cache-Control"] = f"public, max-age={MAX_AGE}"
+        return response
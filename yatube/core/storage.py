@@ -0,0 +1,221 @@
+"""Хранилища медиафайлов.
+
+Загруженные файлы раскладываются по хешу содержимого:
+posts/ab/cd/abcd….gif. Каталоги остаются небольшими при любом числе
+файлов, а одинаковые картинки хранятся один раз. Бэкенд выбирается
+настройкой MEDIA_STORAGE: локальный диск или S3-совместимое хранилище.
+Для разработки и тестов вместо S3 подходит LocalS3Client — каталог на
+диске с тем же интерфейсом, что и клиент boto3.
+"""
+import hashlib
+import os
+import posixpath
+import shutil
+from datetime import datetime, timezone
+from tempfile import SpooledTemporaryFile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, Storage
+from django.utils.deconstruct import deconstructible
+from django.utils.encoding import filepath_to_uri
+from django.utils.functional import cached_property
+
+CHUNK_SIZE = 64 * 1024
+SPOOL_SIZE = 1024 * 1024
+
+
+def content_hash(content):
+    """SHA-256 содержимого, прочитанного по частям."""
+    digest = hashlib.sha256()
+    for chunk in content.chunks(CHUNK_SIZE):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hashed_name(name, digest):
+    """Путь файла внутри каталога upload_to по хешу его содержимого."""
+    directory = posixpath.dirname(name)
+    extension = posixpath.splitext(name)[1].lower()
+    return posixpath.join(
+        directory, digest[:2], digest[2:4], digest + extension
+    )
+
+
+def is_hashed_name(name, digest):
+    """True, если name уже разложен по хешу digest, например при
+    загрузке выгрузки."""
+    extension = posixpath.splitext(name)[1].lower()
+    return name.endswith(f"{digest[:2]}/{digest[2:4]}/{digest}{extension}")
+
+
+class ContentAddressedMixin:
+    """Сохраняет файл под именем из хеша содержимого.
+
+    Если файл с таким содержимым уже есть, повторно он не пишется. Имя,
+    которое уже совпадает с хешем содержимого, сохраняется как есть.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        name = self.generate_filename(name)
+        digest = content_hash(content)
+        if not is_hashed_name(name, digest):
+            name = hashed_name(name, digest)
+        if self.exists(name):
+            return name
+        return self._save(name, content)
+
+
+class LocalS3Client:
+    """Заменитель клиента boto3 для S3, хранящий объекты в каталоге.
+
+    Реализует только вызовы, которые использует S3Storage.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, bucket, key):
+        return os.path.join(self.root, bucket, *key.split("/"))
+
+    def upload_fileobj(self, fileobj, Bucket, Key, ExtraArgs=None):
+        path = self._path(Bucket, Key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as destination:
+            shutil.copyfileobj(fileobj, destination, CHUNK_SIZE)
+
+    def download_fileobj(self, Bucket, Key, Fileobj):
+        with open(self._path(Bucket, Key), "rb") as source:
+            shutil.copyfileobj(source, Fileobj, CHUNK_SIZE)
+
+    def list_objects_v2(self, Bucket, Prefix, MaxKeys=1000):
+        path = self._path(Bucket, Prefix)
+        if not os.path.isfile(path):
+            return {"KeyCount": 0}
+        return {"KeyCount": 1, "Contents": [{"Key": Prefix}]}
+
+    def head_object(self, Bucket, Key):
+        stat = os.stat(self._path(Bucket, Key))
+        return {
+            "ContentLength": stat.st_size,
+            "LastModified": datetime.fromtimestamp(
+                stat.st_mtime, timezone.utc
+            ),
+        }
+
+    def delete_object(self, Bucket, Key):
+        try:
+            os.remove(self._path(Bucket, Key))
+        except FileNotFoundError:
+            pass
+
+
+@deconstructible
+class S3Storage(Storage):
+    """Хранилище в S3-совместимом сервисе.
+
+    Загрузка идет через upload_fileobj, который читает файл частями и
+    отправляет его multipart-запросами. Адрес сервиса задается
+    MEDIA_S3_ENDPOINT_URL; адрес вида file:///path включает LocalS3Client.
+    """
+
+    def __init__(self, bucket=None, endpoint_url=None, base_url=None,
+                 prefix=""):
+        self.bucket = bucket or settings.MEDIA_S3_BUCKET
+        self.endpoint_url = endpoint_url or settings.MEDIA_S3_ENDPOINT_URL
+        self.base_url = base_url or settings.MEDIA_URL
+        self.prefix = prefix
+
+    @cached_property
+    def client(self):
+        if self.endpoint_url.startswith("file://"):
+            return LocalS3Client(self.endpoint_url[len("file://"):])
+        import boto3
+
+        return boto3.client("s3", endpoint_url=self.endpoint_url or None)
+
+    def _key(self, name):
+        return self.prefix + name.replace("\\", "/")
+
+    def _open(self, name, mode="rb"):
+        spooled = SpooledTemporaryFile(SPOOL_SIZE)
+        self.client.download_fileobj(self.bucket, self._key(name), spooled)
+        spooled.seek(0)
+        return File(spooled, name)
+
+    def _save(self, name, content):
+        content.seek(0)
+        extra = {}
+        content_type = getattr(content, "content_type", None)
+        if content_type:
+            extra["ContentType"] = content_type
+        self.client.upload_fileobj(
+            content, self.bucket, self._key(name), ExtraArgs=extra
+        )
+        return name
+
+    def exists(self, name):
+        key = self._key(name)
+        response = self.client.list_objects_v2(
+            Bucket=self.bucket, Prefix=key, MaxKeys=1
+        )
+        return any(
+            item["Key"] == key for item in response.get("Contents", ())
+        )
+
+    def delete(self, name):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(name))
+
+    def size(self, name):
+        return self.client.head_object(
+            Bucket=self.bucket, Key=self._key(name)
+        )["ContentLength"]
+
+    def get_modified_time(self, name):
+        return self.client.head_object(
+            Bucket=self.bucket, Key=self._key(name)
+        )["LastModified"]
+
+    def url(self, name):
+        return self.base_url + filepath_to_uri(name)
+
+
+class HashedFileSystemStorage(ContentAddressedMixin, FileSystemStorage):
+    """Медиафайлы на локальном диске, разложенные по хешу."""
+
+
+class HashedS3Storage(ContentAddressedMixin, S3Storage):
+    """Медиафайлы в S3, разложенные по хешу."""
+
+
+class ThumbnailFileSystemStorage(FileSystemStorage):
+    """Миниатюры sorl-thumbnail в отдельном от загрузок каталоге."""
+
+    def _clear_cached_properties(self, setting, **kwargs):
+        super()._clear_cached_properties(setting, **kwargs)
+        if setting == "THUMBNAIL_ROOT":
+            self.__dict__.pop("base_location", None)
+            self.__dict__.pop("location", None)
+        elif setting == "THUMBNAIL_URL":
+            self.__dict__.pop("base_url", None)
+
+    @cached_property
+    def base_location(self):
+        return self._value_or_setting(self._location, settings.THUMBNAIL_ROOT)
+
+    @cached_property
+    def base_url(self):
+        return self._value_or_setting(self._base_url, settings.THUMBNAIL_URL)
+
+
+class ThumbnailS3Storage(S3Storage):
+    """Миниатюры sorl-thumbnail в S3 под отдельным префиксом."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("prefix", "thumbnails/")
+        kwargs.setdefault("base_url", settings.THUMBNAIL_URL)
+        super().__init__(**kwargs)
@@ -0,0 +1,41 @@
+from core.cache import cache_fill
+from django import template
+from django.core.cache.utils import make_template_fragment_key
+
+register = template.Library()
+
+
+class CacheFillNode(template.Node):
+    def __init__(self, nodelist, timeout, fragment_name, vary_on):
+        self.nodelist = nodelist
+        self.timeout = timeout
+        self.fragment_name = fragment_name
+        self.vary_on = vary_on
+
+    def render(self, context):
+        timeout = int(self.timeout.resolve(context))
+        vary_on = [value.resolve(context) for value in self.vary_on]
+        key = make_template_fragment_key(self.fragment_name, vary_on)
+        return cache_fill(key, lambda: self.nodelist.render(context), timeout)
+
+
+@register.tag("cache_fill")
+def do_cache_fill(parser, token):
+    """Замена тега cache: {% cache_fill 20 name [vary_on ...] %}.
+
+    При истечении фрагмент пересчитывает один запрос, остальные получают
+    устаревшую копию.
+    """
+    nodelist = parser.parse(("endcache_fill",))
+    parser.delete_first_token()
+    tokens = token.split_contents()
+    if len(tokens) < 3:
+        raise template.TemplateSyntaxError(
+            f"'{tokens[0]}' принимает как минимум два аргумента."
+        )
+    return CacheFillNode(
+        nodelist,
+        parser.compile_filter(tokens[1]),
+        tokens[2],
+        [parser.compile_filter(token) for token in tokens[3:]],
+    )
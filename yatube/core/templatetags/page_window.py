@@ -0,0 +1,20 @@
+from django import template
+
+register = template.Library()
+
+ON_EACH_SIDE = 2
+ON_ENDS = 1
+
+
+@register.simple_tag
+def page_window(paginator, number, on_each_side=ON_EACH_SIDE, on_ends=ON_ENDS):
+    """Номера страниц вокруг текущей и по краям, пропуски — многоточием.
+
+    Размер разметки пагинации не зависит от числа страниц. Используется
+    лентами постов и списками админки.
+    """
+    return list(
+        paginator.get_elided_page_range(
+            number, on_each_side=on_each_side, on_ends=on_ends
+        )
+    )
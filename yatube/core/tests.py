@@ -1,6 +1,47 @@
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import signal
+import socket
+import tempfile
 from http import HTTPStatus
+from http.client import HTTPConnection
+from io import StringIO
+from unittest import mock
 
-from django.test import Client, TestCase
+from django.contrib.auth import get_user_model
+from django.core import checks, mail
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.core.files.base import ContentFile
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.core.wsgi import get_wsgi_application
+from django.http import HttpResponse, StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import metrics
+from .benchmarks import HEAVY_MODULES, startup_run
+from .checks import PERFORMANCE
+from .cache import bump_namespace, cache_fill, namespace_versions
+from .compression import (
+    CompressionMiddleware,
+    choose_encoding,
+    compress,
+    minify_html,
+)
+from .mail import deliver_outbox
+from .models import OutboxMessage
+from .server import PreforkServer, default_workers
+from .storage import HashedFileSystemStorage, HashedS3Storage
+from .warmup import populate_url_resolver, precompile_templates, warm_up
+
+User = get_user_model()
 
 
 class ViewTestClass(TestCase):
@@ -14,3 +55,602 @@ class ViewTestClass(TestCase):
         response = self.auth.get("/nonexist-page/")
         self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
         self.assertTemplateUsed(response, "core/404.html")
+
+
+class TemplateWarmupTests(TestCase):
+    def test_precompile_templates(self):
+        """Все шаблоны проекта компилируются при прогреве."""
+        self.assertGreater(precompile_templates(), 0)
+
+    def test_benchmark_command(self):
+        """Команда benchmark замеряет рендер ленты, а не чтение кеша, и
+        не пишет фальшивые посты в общий кеш."""
+        cache.clear()
+        metrics.reset()
+        out = StringIO()
+        call_command("benchmark", "templates", iterations=3, stdout=out)
+        self.assertIn("index.html", out.getvalue())
+        self.assertNotIn("cache_fill.hit", metrics.snapshot())
+        card_key = make_template_fragment_key(
+            "post_card", [1, 1, "author", "Лев"]
+        )
+        self.assertIsNone(cache.get(card_key))
+
+    def test_static_benchmark(self):
+        """Замер статики считает байты за просмотр страницы."""
+        out = StringIO()
+        call_command("benchmark", "static", iterations=1, stdout=out)
+        self.assertIn("первый визит, байт", out.getvalue())
+
+
+class CacheFillTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_value_computed_once_while_fresh(self):
+        """Свежее значение не пересчитывается."""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        self.assertEqual(cache_fill("key", compute, 60), 1)
+        self.assertEqual(cache_fill("key", compute, 60), 1)
+        self.assertEqual(len(calls), 1)
+
+    def test_stale_value_served_while_locked(self):
+        """Пока значение пересчитывается, отдается устаревшая копия."""
+        cache_fill("key", lambda: "old", -1)
+        cache.add("key:lock", True)
+        self.assertEqual(cache_fill("key", lambda: "new", 60), "old")
+        cache.delete("key:lock")
+        self.assertEqual(cache_fill("key", lambda: "new", 60), "new")
+
+    def test_background_refresh_serves_stale(self):
+        """Фоновое обновление сразу отдает устаревшую копию."""
+        cache_fill("key", lambda: "old", -1)
+        value = cache_fill("key", lambda: "new", 60, background=True)
+        self.assertEqual(value, "old")
+
+    def test_waiter_keeps_foreign_lock(self):
+        """Не дождавшийся значения запрос считает его сам и не снимает
+        чужую блокировку."""
+        cache.add("key:lock", "other")
+        with mock.patch("core.cache.LOCK_WAIT", 0):
+            self.assertEqual(cache_fill("key", lambda: "value", 60), "value")
+        self.assertEqual(cache.get("key:lock"), "other")
+
+    def test_refills_counted(self):
+        """Пересчеты попадают в метрики."""
+        metrics.reset()
+        cache_fill("key", lambda: "value", 60)
+        self.assertEqual(metrics.snapshot()["cache_fill.refill"], 1)
+
+    def test_bump_namespace(self):
+        """Сброс пространства имен меняет его версию."""
+        before = namespace_versions(["feed"])
+        bump_namespace("feed")
+        bump_namespace("feed")
+        self.assertEqual(namespace_versions(["feed"]), [before[0] + 2])
+
+
+class AnonymousResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_about_page_cached_for_anonymous(self):
+        """Страница «Об авторе» для анонима отдается из кеша."""
+        first = Client().get(reverse("about:author"))
+        self.assertIsNotNone(first.context)
+        second = Client().get(reverse("about:author"))
+        self.assertIsNone(second.context)
+        self.assertEqual(first.content, second.content)
+
+    def test_unknown_query_params_share_entry(self):
+        """Посторонние параметры не создают новых записей, а разрешенные
+        различают страницы."""
+        index = reverse("posts:index")
+        self.assertIsNotNone(Client().get(index + "?page=1").context)
+        self.assertIsNone(Client().get(index + "?utm=a&page=1").context)
+        about = reverse("about:author")
+        Client().get(about)
+        self.assertIsNone(Client().get(about + "?x=1").context)
+        self.assertIsNotNone(Client().get(index).context)
+
+
+class FailingBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise ConnectionError("SMTP недоступен")
+
+
+class UnreachableBackend(EmailBackend):
+    def open(self):
+        raise ConnectionRefusedError("SMTP не отвечает")
+
+
+@override_settings(
+    EMAIL_BACKEND="core.mail.OutboxEmailBackend",
+    OUTBOX_DELIVERY_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+)
+class OutboxTests(TestCase):
+    def test_send_mail_only_queues(self):
+        """send_mail кладет письмо в очередь, не отправляя его."""
+        mail.send_mail("Тема", "Текст", "from@test.ru", ["to@test.ru"])
+        self.assertEqual(len(mail.outbox), 0)
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.recipients, ["to@test.ru"])
+
+    def test_deliver_batch(self):
+        """Воркер отправляет письма пачкой и помечает отправленными."""
+        for number in range(3):
+            mail.send_mail("Тема", "Текст", None, [f"{number}@test.ru"])
+        self.assertEqual(deliver_outbox(batch_size=2), (2, 0))
+        self.assertEqual(deliver_outbox(batch_size=2), (1, 0))
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(OutboxMessage.objects.filter(sent=None).exists())
+
+    @override_settings(OUTBOX_DELIVERY_BACKEND="core.tests.FailingBackend")
+    def test_failed_delivery_backs_off(self):
+        """После ошибки письмо откладывается с растущей задержкой."""
+        mail.send_mail("Тема", "Текст", None, ["to@test.ru"])
+        self.assertEqual(deliver_outbox(), (0, 1))
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.attempts, 1)
+        self.assertGreater(message.next_attempt, timezone.now())
+        self.assertIn("SMTP", message.last_error)
+        self.assertEqual(deliver_outbox(), (0, 0))
+
+    @override_settings(
+        OUTBOX_DELIVERY_BACKEND="core.tests.UnreachableBackend"
+    )
+    def test_connection_failure_backs_off_batch(self):
+        """Недоступный сервер откладывает всю пачку, а не роняет воркер."""
+        for number in range(2):
+            mail.send_mail("Тема", "Текст", None, [f"{number}@test.ru"])
+        self.assertEqual(deliver_outbox(), (0, 2))
+        for message in OutboxMessage.objects.all():
+            self.assertEqual(message.attempts, 1)
+            self.assertIn("SMTP", message.last_error)
+        self.assertEqual(deliver_outbox(), (0, 0))
+
+    def test_message_fields_survive_queue(self):
+        """Скрытая копия, заголовки, ответ, HTML и вложения доходят до
+        отправки, а скрытая копия не попадает в заголовки."""
+        email = mail.EmailMultiAlternatives(
+            "Тема",
+            "Текст",
+            "from@test.ru",
+            ["to@test.ru"],
+            bcc=["secret@test.ru"],
+            cc=["cc@test.ru"],
+            reply_to=["reply@test.ru"],
+            headers={"List-Unsubscribe": "<mailto:off@test.ru>"},
+        )
+        email.attach_alternative("<p>Текст</p>", "text/html")
+        email.attach("data.bin", b"\x00\x01", "application/octet-stream")
+        email.send()
+        self.assertEqual(deliver_outbox(), (1, 0))
+        sent = mail.outbox[0]
+        self.assertEqual(sent.bcc, ["secret@test.ru"])
+        self.assertEqual(
+            sent.recipients(), ["to@test.ru", "cc@test.ru", "secret@test.ru"]
+        )
+        self.assertEqual(sent.reply_to, ["reply@test.ru"])
+        self.assertEqual(sent.alternatives, [("<p>Текст</p>", "text/html")])
+        self.assertEqual(
+            sent.attachments,
+            [("data.bin", b"\x00\x01", "application/octet-stream")],
+        )
+        raw = sent.message().as_string()
+        self.assertIn("List-Unsubscribe", raw)
+        self.assertNotIn("secret@test.ru", raw)
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.content = b"GIF89a image bytes"
+        self.digest = hashlib.sha256(self.content).hexdigest()
+        self.expected = (
+            f"posts/{self.digest[:2]}/{self.digest[2:4]}/{self.digest}.gif"
+        )
+
+    def check_storage(self, storage):
+        name = storage.save("posts/Photo.GIF", ContentFile(self.content))
+        self.assertEqual(name, self.expected)
+        self.assertTrue(storage.exists(name))
+        with storage.open(name) as stored:
+            self.assertEqual(stored.read(), self.content)
+        self.assertEqual(storage.size(name), len(self.content))
+        duplicate = storage.save("posts/copy.gif", ContentFile(self.content))
+        self.assertEqual(duplicate, name)
+        storage.delete(name)
+        self.assertFalse(storage.exists(name))
+
+    def test_filesystem_storage(self):
+        """Файл на диске кладется по хешу, дубликат не записывается."""
+        storage = HashedFileSystemStorage(location=self.root)
+        self.check_storage(storage)
+        self.assertEqual(storage.url(self.expected), "/media/" + self.expected)
+
+    def test_s3_storage_with_local_stand_in(self):
+        """S3-хранилище работает с локальным заменителем сервиса."""
+        storage = HashedS3Storage(
+            bucket="media", endpoint_url="file://" + self.root
+        )
+        self.check_storage(storage)
+        storage.save("posts/photo.gif", ContentFile(self.content))
+        self.assertTrue(
+            os.path.isfile(
+                os.path.join(self.root, "media", *self.expected.split("/"))
+            )
+        )
+
+
+class StaticPipelineTests(TestCase):
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        os.makedirs(os.path.join(self.source, "css"))
+        self.css = b"body { margin: 0; }\n" * 100
+        with open(os.path.join(self.source, "css", "site.css"), "wb") as f:
+            f.write(self.css)
+        settings = override_settings(
+            STATICFILES_DIRS=[self.source],
+            STATIC_ROOT=self.root,
+            STATICFILES_FINDERS=[
+                "django.contrib.staticfiles.finders.FileSystemFinder"
+            ],
+            STORAGES={
+                "default": {
+                    "BACKEND": "core.storage.HashedFileSystemStorage"
+                },
+                "staticfiles": {
+                    "BACKEND": "core.staticfiles."
+                    "PrecompressedManifestStaticFilesStorage"
+                },
+            },
+            STATIC_SERVE=True,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        call_command("collectstatic", interactive=False, verbosity=0)
+        with open(os.path.join(self.root, "staticfiles.json")) as manifest:
+            self.hashed = json.load(manifest)["paths"]["css/site.css"]
+
+    def test_collectstatic_writes_compressed_copies(self):
+        """collectstatic кладет рядом с файлом с хешем его gzip-копию."""
+        path = os.path.join(self.root, self.hashed + ".gz")
+        with open(path, "rb") as compressed:
+            self.assertEqual(gzip.decompress(compressed.read()), self.css)
+
+    def test_middleware_serves_compressed_hashed_file(self):
+        """Файл с хешем отдается сжатым и кешируется на год."""
+        response = self.client.get(
+            "/static/" + self.hashed, HTTP_ACCEPT_ENCODING="gzip"
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        body = b"".join(response.streaming_content)
+        self.assertEqual(gzip.decompress(body), self.css)
+        response = self.client.get(
+            "/static/" + self.hashed,
+            HTTP_ACCEPT_ENCODING="gzip",
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_middleware_serves_plain_file(self):
+        """Без Accept-Encoding отдается исходный файл."""
+        response = self.client.get("/static/css/site.css")
+        self.assertNotIn("Content-Encoding", response)
+        self.assertEqual(b"".join(response.streaming_content), self.css)
+        self.assertNotIn("immutable", response["Cache-Control"])
+
+
+class CompressionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+        self.factory = RequestFactory()
+
+    def process(self, response, **headers):
+        middleware = CompressionMiddleware(lambda request: response)
+        return middleware(self.factory.get("/", **headers))
+
+    def test_minify_keeps_preformatted_blocks(self):
+        """Пробелы схлопываются везде, кроме pre, textarea и script."""
+        html = (
+            "<div>\n    <p>a   b</p>\n\n</div>"
+            "<pre>  x\n\n  y</pre><script>if (a  &&  b) {}</script>"
+        )
+        self.assertEqual(
+            minify_html(html),
+            "<div>\n<p>a b</p>\n</div>"
+            "<pre>  x\n\n  y</pre><script>if (a  &&  b) {}</script>",
+        )
+
+    def test_page_compressed_and_cached(self):
+        """Главная сжимается, повторное сжатие берется из кеша."""
+        client = Client(HTTP_ACCEPT_ENCODING="gzip, deflate")
+        response = client.get(reverse("posts:index"))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        html = gzip.decompress(response.content).decode()
+        self.assertIn("</html>", html)
+        self.assertNotIn("    ", html)
+        client.get(reverse("posts:index"))
+        counters = metrics.snapshot()
+        self.assertEqual(counters["compression.cache_hits"], 1)
+        self.assertLess(
+            counters["compression.bytes_out"], counters["compression.bytes_in"]
+        )
+
+    def test_small_response_not_compressed(self):
+        """Ответ меньше порога отдается без сжатия."""
+        response = self.process(
+            HttpResponse("<p>мало</p>"), HTTP_ACCEPT_ENCODING="gzip"
+        )
+        self.assertNotIn("Content-Encoding", response)
+
+    def test_streaming_response_compressed(self):
+        """Потоковый ответ сжимается по частям."""
+        chunks = [b"line %d\n" % number * 50 for number in range(20)]
+        response = self.process(
+            StreamingHttpResponse(iter(chunks), content_type="text/plain"),
+            HTTP_ACCEPT_ENCODING="gzip",
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        body = b"".join(response.streaming_content)
+        self.assertEqual(gzip.decompress(body), b"".join(chunks))
+
+    def test_accept_encoding_weights(self):
+        """Кодировка с q=0 не выбирается, побеждает больший вес."""
+        cases = {
+            "gzip, deflate": "gzip",
+            "br;q=0, gzip": "gzip",
+            "gzip;q=0": None,
+            "*;q=0": None,
+            "identity, *": "br",
+            "gzip;q=0.5, br;q=0.9": "br",
+            "br, gzip;q=0.5, *;q=0": "br",
+        }
+        for header, expected in cases.items():
+            with self.subTest(header=header):
+                request = self.factory.get("/", HTTP_ACCEPT_ENCODING=header)
+                encoding = choose_encoding(request, brotli=True)
+                self.assertEqual(encoding, expected)
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING="br")
+        self.assertIsNone(choose_encoding(request, brotli=False))
+
+    def test_gzip_length_randomized(self):
+        """Длина gzip-ответа меняется от раза к разу, как у GZipMiddleware."""
+        body = b"<p>csrf</p>" * 200
+        outputs = [compress(body, "gzip") for _ in range(20)]
+        self.assertGreater(len({len(output) for output in outputs}), 1)
+        for output in outputs:
+            self.assertEqual(gzip.decompress(output), body)
+
+    def test_csrf_page_not_cached(self):
+        """Сжатая страница с CSRF-токеном не попадает в кеш."""
+
+        def view(request):
+            return HttpResponse(
+                "<p>{}</p>".format(get_token(request)) * 100
+            )
+
+        middleware = CompressionMiddleware(view)
+        for _ in range(2):
+            response = middleware(
+                self.factory.get("/", HTTP_ACCEPT_ENCODING="gzip")
+            )
+            self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertNotIn("compression.cache_hits", metrics.snapshot())
+
+    def test_metrics_report_ratio(self):
+        """Страница метрик показывает степень сжатия."""
+        self.process(
+            HttpResponse("<p>текст</p>" * 500), HTTP_ACCEPT_ENCODING="gzip"
+        )
+        staff = Client()
+        staff.force_login(
+            User.objects.create_user("staff", is_staff=True)
+        )
+        counters = staff.get(reverse("metrics")).json()
+        self.assertLess(counters["compression.ratio"], 1)
+        self.assertIn("compression.cpu_us", counters)
+
+
+class StartupTests(TestCase):
+    @mock.patch.dict(os.environ, {"DJANGO_SECRET_KEY": "startup-test"})
+    def test_production_profile_cold_start(self):
+        """Продакшен-профиль стартует без инструментов разработки и Pillow."""
+        report = startup_run("yatube.settings.prod", path="/metrics/")
+        self.assertEqual(report["status"], "302 Found")
+        loaded = {name.split(".")[0] for name in report["modules"]}
+        for name in HEAVY_MODULES:
+            with self.subTest(module=name):
+                self.assertNotIn(name, loaded)
+        self.assertGreater(report["import_ms"], 0)
+
+
+class PerformanceChecksTests(TestCase):
+    def run_checks(self):
+        return {
+            message.id
+            for message in checks.run_checks(
+                tags=[PERFORMANCE], include_deployment_checks=True
+            )
+        }
+
+    @override_settings(
+        DEBUG=True,
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache"
+            }
+        },
+        SESSION_ENGINE="django.contrib.sessions.backends.db",
+        DATA_UPLOAD_MAX_MEMORY_SIZE=None,
+    )
+    def test_hostile_settings_reported(self):
+        """Настройки, мешающие производительности, дают предупреждения."""
+        self.assertLessEqual(
+            {"core.W001", "core.W005", "core.W006", "core.W007"},
+            self.run_checks(),
+        )
+
+    @override_settings(
+        TEMPLATES=[
+            {
+                "BACKEND": "django.template.backends.django."
+                "DjangoTemplates",
+                "OPTIONS": {
+                    "loaders": ["django.template.loaders.filesystem.Loader"]
+                },
+            }
+        ],
+        DATABASES={
+            "default": {
+                "ENGINE": "django.db.backends.postgresql",
+                "CONN_MAX_AGE": 0,
+            }
+        },
+    )
+    def test_uncached_templates_and_connections_reported(self):
+        """Некешируемые шаблоны и соединения с БД дают предупреждения."""
+        self.assertLessEqual({"core.W003", "core.W004"}, self.run_checks())
+
+    def test_project_templates_cached(self):
+        """Шаблоны проекта загружаются через кеширующий загрузчик."""
+        self.assertNotIn("core.W003", self.run_checks())
+
+
+class PreforkServerTests(TestCase):
+    def test_warm_up_runs_configured_hooks(self):
+        """Прогрев выполняет функции из SERVER_WARMUP."""
+        self.assertGreater(populate_url_resolver(), 0)
+        messages = []
+        with override_settings(
+            SERVER_WARMUP=["core.warmup.populate_url_resolver"]
+        ):
+            warm_up(log=messages.append)
+        self.assertEqual(len(messages), 1)
+        self.assertGreater(default_workers(), 1)
+
+    def test_workers_recycled_after_max_requests(self):
+        """Воркер завершается после лимита запросов, мастер его заменяет."""
+        server = PreforkServer(
+            ("127.0.0.1", 0),
+            get_wsgi_application(),
+            workers=1,
+            max_requests=2,
+            max_requests_jitter=0,
+            log=lambda message: None,
+        )
+        pid = os.fork()
+        if pid == 0:
+            try:
+                server.run()
+            finally:
+                os._exit(0)
+        server.socket.close()
+        try:
+            for _ in range(5):
+                connection = HTTPConnection(*server.address, timeout=10)
+                connection.request("GET", reverse("about:author"))
+                self.assertEqual(connection.getresponse().status, 200)
+                connection.close()
+        finally:
+            os.kill(pid, signal.SIGTERM)
+            _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+
+    def test_file_sent_with_sendfile(self):
+        """Файл из wsgi.file_wrapper воркер отправляет через os.sendfile."""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        path = os.path.join(temp_dir, "file.bin")
+        marker = os.path.join(temp_dir, "sendfile")
+        data = os.urandom(300_000)
+        with open(path, "wb") as file:
+            file.write(data)
+
+        def application(environ, start_response):
+            start_response(
+                "200 OK", [("Content-Length", str(len(data)))]
+            )
+            return environ["wsgi.file_wrapper"](open(path, "rb"))
+
+        def sendfile(*args):
+            open(marker, "w").close()
+            return real_sendfile(*args)
+
+        real_sendfile = os.sendfile
+        server = PreforkServer(
+            ("127.0.0.1", 0), application, workers=1, log=lambda message: None
+        )
+        with mock.patch("os.sendfile", sendfile):
+            pid = os.fork()
+            if pid == 0:
+                try:
+                    server.run()
+                finally:
+                    os._exit(0)
+        server.socket.close()
+        try:
+            connection = HTTPConnection(*server.address, timeout=10)
+            connection.request("GET", "/")
+            self.assertEqual(connection.getresponse().read(), data)
+            connection.close()
+        finally:
+            os.kill(pid, signal.SIGTERM)
+            os.waitpid(pid, 0)
+        self.assertTrue(os.path.exists(marker))
+
+    def test_idle_connection_times_out(self):
+        """Молчащий клиент отключается по таймауту и не занимает воркер."""
+        server = PreforkServer(
+            ("127.0.0.1", 0),
+            get_wsgi_application(),
+            workers=1,
+            request_timeout=0.5,
+            log=lambda message: None,
+        )
+        pid = os.fork()
+        if pid == 0:
+            try:
+                server.run()
+            finally:
+                os._exit(0)
+        server.socket.close()
+        try:
+            idle = socket.create_connection(server.address, timeout=10)
+            connection = HTTPConnection(*server.address, timeout=10)
+            connection.request("GET", reverse("about:author"))
+            self.assertEqual(connection.getresponse().status, 200)
+            connection.close()
+            self.assertEqual(idle.recv(1), b"")
+            idle.close()
+        finally:
+            os.kill(pid, signal.SIGTERM)
+            os.waitpid(pid, 0)
+
+    def test_crashing_workers_respawned_with_backoff(self):
+        """Пауза перед перезапуском растет, пока воркеры падают сразу, и
+        сбрасывается после нормального завершения."""
+        server = PreforkServer(
+            ("127.0.0.1", 0), None, workers=1, log=lambda message: None
+        )
+        server.socket.close()
+        delays = [server.respawn_delay(1, 0.01) for _ in range(12)]
+        self.assertEqual(delays[:3], [0.1, 0.2, 0.4])
+        self.assertEqual(delays[-1], 30)
+        self.assertEqual(server.respawn_delay(1, 5), 0)
+        self.assertEqual(server.respawn_delay(1, 0.01), 0.1)
+        self.assertEqual(server.respawn_delay(0, 0.01), 0)
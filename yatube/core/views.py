@@ -1,7 +1,11 @@
 from typing import List
 
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
 from django.shortcuts import render
 
+from . import metrics as core_metrics
+
 
 def page_not_found(request, exception):
     return render(request, "core/404.html", {"path": request.path}, status=404)
@@ -13,3 +17,16 @@ def csrf_failure(request, reason=""):
 
 def server_error(request):
     return render(request, "core/500.html", status=500)
+
+
+@staff_member_required
+def metrics(request):
+    """Счетчики кешей и сжатия текущего процесса."""
+    counters = core_metrics.snapshot()
+    if counters.get("compression.bytes_in"):
+        counters["compression.ratio"] = round(
+            counters.get("compression.bytes_out", 0)
+            / counters["compression.bytes_in"],
+            3,
+        )
+    return JsonResponse(counters)
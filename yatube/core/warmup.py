@@ -0,0 +1,52 @@
+"""Подготовка процесса к обработке запросов сразу после старта."""
+import os
+
+from django.conf import settings
+from django.template import engines
+from django.template.utils import get_app_template_dirs
+from django.urls import get_resolver
+from django.utils.module_loading import import_string
+
+
+def template_names(engine):
+    """Перечисляет имена шаблонов проекта и приложений."""
+    directories = (*engine.dirs, *get_app_template_dirs("templates"))
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith((".html", ".txt")):
+                    path = os.path.join(root, filename)
+                    yield os.path.relpath(path, directory).replace(
+                        os.sep, "/"
+                    )
+
+
+def precompile_templates():
+    """Компилирует шаблоны заранее, заполняя кеширующий загрузчик.
+
+    Возвращает число скомпилированных шаблонов.
+    """
+    compiled = 0
+    for engine in engines.all():
+        for name in set(template_names(engine)):
+            engine.get_template(name)
+            compiled += 1
+    return compiled
+
+
+def populate_url_resolver():
+    """Импортирует все представления и строит таблицы URL-резолвера.
+
+    Возвращает число маршрутов верхнего уровня.
+    """
+    resolver = get_resolver()
+    resolver.reverse_dict
+    return len(resolver.url_patterns)
+
+
+def warm_up(log=None):
+    """Выполняет функции прогрева из SERVER_WARMUP по порядку."""
+    for path in settings.SERVER_WARMUP:
+        result = import_string(path)()
+        if log:
+            log(f"Прогрев {path}: {result}")
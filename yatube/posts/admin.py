@@ -1,6 +1,13 @@
+from core.cache import bump_namespace
+from core.paginator import EstimatedCountPaginator
 from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 
-from .models import Comment, Follow, Group, Post
+from .models import Comment, Follow, Group, Post, PostRevision, User
+from .purge import queue_user_deletion
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -11,13 +18,111 @@ class PostAdmin(admin.ModelAdmin):
         "author",
         "group",
     )
-    list_editable = ("group",)
+    list_select_related = ("author", "group")
+    raw_id_fields = ("author", "group")
+    readonly_fields = ("version", "updated_at")
     search_fields = ("text",)
-    list_filter = ("pub_date",)
+    list_filter = ("pub_date", ("deleted_at", admin.EmptyFieldListFilter))
+    date_hierarchy = "pub_date"
     empty_value_display = "-пусто-"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ("clear_group", "restore")
 
+    def get_queryset(self, request):
+        """Все посты, включая удаленные авторами."""
+        queryset = Post.all_objects.get_queryset()
+        ordering = self.get_ordering(request)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
 
+    @admin.action(description="Восстановить удаленные")
+    def restore(self, request, queryset):
+        for post in queryset.exclude(deleted_at=None):
+            post.deleted_at = None
+            post.save(update_fields=("deleted_at",))
+
+    @admin.action(description="Убрать из группы")
+    def clear_group(self, request, queryset):
+        """Убирает посты из групп одним запросом и записывает ревизии,
+        как при сохранении каждого поста."""
+        with transaction.atomic():
+            rows = list(
+                queryset.exclude(group=None)
+                .select_for_update(of=("self",))
+                .values_list("pk", "version", "group_id", "author__username")
+            )
+            PostRevision.objects.bulk_create(
+                PostRevision(
+                    post_id=pk,
+                    version=version,
+                    changes={"group_id": group_id},
+                    editor=request.user,
+                )
+                for pk, version, group_id, _ in rows
+            )
+            Post.all_objects.filter(pk__in=[row[0] for row in rows]).update(
+                group=None, version=F("version") + 1, updated_at=timezone.now()
+            )
+        slugs = Group.objects.filter(
+            pk__in={row[2] for row in rows}
+        ).values_list("slug", flat=True)
+        bump_namespace(
+            "index",
+            *(f"group:{slug}" for slug in slugs),
+            *(f"profile:{username}" for username in {row[3] for row in rows}),
+        )
+
+
+class GroupAdmin(admin.ModelAdmin):
+    list_display = ("title", "slug")
+    search_fields = ("title", "slug")
+    prepopulated_fields = {"slug": ("title",)}
+
+
+class CommentAdmin(admin.ModelAdmin):
+    list_display = ("pk", "text", "pub_date", "author", "post")
+    list_select_related = ("author", "post")
+    raw_id_fields = ("author", "post")
+    search_fields = ("text",)
+    date_hierarchy = "pub_date"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class FollowAdmin(admin.ModelAdmin):
+    list_display = ("pk", "user", "author", "created")
+    list_select_related = ("user", "author")
+    raw_id_fields = ("user", "author")
+    date_hierarchy = "created"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class DeferredDeletionUserAdmin(UserAdmin):
+    """Удаление пользователей только через очередь purge_deleted: каскад
+    по всем постам, комментариям и подпискам надолго блокирует БД."""
+
+    actions = ("queue_deletion",)
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        actions.pop("delete_selected", None)
+        return actions
+
+    def delete_model(self, request, obj):
+        queue_user_deletion(obj)
+
+    @admin.action(description="Удалить вместе с постами в фоне")
+    def queue_deletion(self, request, queryset):
+        for user in queryset:
+            queue_user_deletion(user)
+
+
+admin.site.unregister(User)
+admin.site.register(User, DeferredDeletionUserAdmin)
 admin.site.register(Post, PostAdmin)
-admin.site.register(Group)
-admin.site.register(Comment)
-admin.site.register(Follow)
+admin.site.register(Group, GroupAdmin)
+admin.site.register(Comment, CommentAdmin)
+admin.site.register(Follow, FollowAdmin)
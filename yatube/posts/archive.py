@@ -0,0 +1,78 @@
+"""Перенос старых постов с комментариями и ревизиями в архивные таблицы.
+
+Основная таблица posts_post остается небольшой, поэтому ленты и индексы
+по ней работают быстро, а страницы поста и профиля дочитывают архив.
+"""
+from datetime import timedelta
+
+from core.cache import bump_namespace
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (ArchivedComment, ArchivedPost, ArchivedPostRevision,
+                     Comment, Post, PostRevision)
+
+POST_FIELDS = (
+    "id", "text", "author_id", "group_id", "image", "image_width",
+    "image_height", "image_hash", "thumbnail_url", "pub_date", "updated_at",
+    "version",
+)
+COMMENT_FIELDS = ("id", "post_id", "author_id", "text", "pub_date")
+REVISION_FIELDS = (
+    "id", "post_id", "version", "changes", "editor_id", "pub_date",
+)
+
+
+def archive_cutoff(days=None):
+    if days is None:
+        days = settings.POSTS_ARCHIVE_AFTER_DAYS
+    return timezone.now() - timedelta(days=days)
+
+
+def archive_batch(post_ids):
+    """Переносит посты, их комментарии и ревизии в архив одной
+    транзакцией, затем сбрасывает кеш лент, где они были."""
+    with transaction.atomic():
+        posts = Post.objects.filter(pk__in=post_ids)
+        usernames = set(posts.values_list("author__username", flat=True))
+        slugs = set(
+            posts.exclude(group=None).values_list("group__slug", flat=True)
+        )
+        comments = Comment.objects.filter(post_id__in=post_ids)
+        revisions = PostRevision.objects.filter(post_id__in=post_ids)
+        ArchivedPost.objects.bulk_create(
+            ArchivedPost(**row) for row in posts.values(*POST_FIELDS)
+        )
+        ArchivedComment.objects.bulk_create(
+            ArchivedComment(**row) for row in comments.values(*COMMENT_FIELDS)
+        )
+        ArchivedPostRevision.objects.bulk_create(
+            ArchivedPostRevision(**row)
+            for row in revisions.values(*REVISION_FIELDS)
+        )
+        revisions.delete()
+        comments.delete()
+        posts.delete()
+    bump_namespace(
+        "index",
+        *(f"group:{slug}" for slug in slugs),
+        *(f"profile:{username}" for username in usernames),
+    )
+
+
+def archive_posts(days=None, batch_size=500):
+    """Архивирует посты старше days дней пачками по batch_size.
+
+    Возвращает число перенесенных постов.
+    """
+    old_posts = Post.objects.filter(
+        pub_date__lt=archive_cutoff(days)
+    ).order_by("pub_date")
+    archived = 0
+    while True:
+        post_ids = list(old_posts.values_list("pk", flat=True)[:batch_size])
+        if not post_ids:
+            return archived
+        archive_batch(post_ids)
+        archived += len(post_ids)
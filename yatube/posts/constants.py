@@ -1,3 +1,19 @@
 TEN_POSTS: int = 10
 THREE_POSTS: int = 3
 TEST_OF_POST: int = 13
+SUGGESTIONS_TOP_K: int = 5
+SUGGESTIONS_GROUP_WEIGHT: float = 0.5
+TRENDING_SIZE: int = 200
+TRENDING_WINDOW_DAYS: int = 7
+TRENDING_HALF_LIFE_HOURS: float = 24.0
+TRENDING_FOLLOW_WEIGHT: float = 0.5
+TRENDING_CACHE_TIMEOUT: int = 60 * 15
+INDEX_CACHE_TIMEOUT: int = 20
+GROUP_CACHE_TIMEOUT: int = 60
+PROFILE_CACHE_TIMEOUT: int = 60
+WARM_INDEX_PAGES: int = 3
+WARM_GROUPS: int = 5
+WARM_PROFILES: int = 5
+WARM_CONCURRENCY: int = 4
+THUMBNAIL_GEOMETRY: str = "960x339"
+THUMBNAIL_OPTIONS: dict = {"crop": "center", "upscale": True}
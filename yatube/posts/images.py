@@ -0,0 +1,58 @@
+"""Метаданные картинок постов, вычисляемые один раз при загрузке.
+
+Pillow и sorl-thumbnail импортируются внутри функций: они нужны только
+при загрузке картинки и не должны замедлять старт процесса.
+"""
+import hashlib
+
+from .constants import THUMBNAIL_GEOMETRY, THUMBNAIL_OPTIONS
+
+METADATA_FIELDS = ("image_width", "image_height", "image_hash",
+                   "thumbnail_url")
+
+
+def file_hash(field_file):
+    """SHA-256 файла, прочитанного по частям."""
+    digest = hashlib.sha256()
+    with field_file.storage.open(field_file.name, "rb") as stored:
+        for chunk in stored.chunks():
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def image_metadata(field_file):
+    """Размеры, хеш и адрес миниатюры для сохраненной картинки."""
+    from PIL import Image
+    from sorl.thumbnail import get_thumbnail
+
+    with field_file.storage.open(field_file.name, "rb") as stored:
+        with Image.open(stored) as image:
+            width, height = image.size
+    thumbnail = get_thumbnail(
+        field_file, THUMBNAIL_GEOMETRY, **THUMBNAIL_OPTIONS
+    )
+    return {
+        "image_width": width,
+        "image_height": height,
+        "image_hash": file_hash(field_file),
+        "thumbnail_url": thumbnail.url,
+    }
+
+
+def update_image_metadata(post):
+    """Пересчитывает и сохраняет метаданные картинки поста."""
+    if post.image:
+        metadata = image_metadata(post.image)
+    else:
+        metadata = dict.fromkeys(METADATA_FIELDS, "")
+        metadata.update(image_width=None, image_height=None)
+    for field, value in metadata.items():
+        setattr(post, field, value)
+    type(post)._base_manager.filter(pk=post.pk).update(**metadata)
+
+
+def delete_image(field_file):
+    """Удаляет картинку, ее миниатюры и их записи в sorl-thumbnail."""
+    from sorl.thumbnail import delete
+
+    delete(field_file)
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from posts.archive import archive_posts
+
+
+class Command(BaseCommand):
+    help = "Переносит старые посты с комментариями в архивные таблицы."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            help="Возраст постов в днях, по умолчанию "
+            "POSTS_ARCHIVE_AFTER_DAYS.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        count = archive_posts(options["days"], options["batch_size"])
+        self.stdout.write(f"Перенесено в архив: {count}")
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.transfer import export_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Выгружает пользователей, группы, посты, комментарии и подписки "
+        "в файл JSON Lines."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Файл выгрузки.")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument(
+            "--media-dir", help="Каталог, куда скопировать картинки постов."
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        with open(options["path"], "w", encoding="utf-8") as stream:
+            counts = export_rows(
+                stream, options["chunk_size"], options["media_dir"]
+            )
+        report(self.stdout, counts, time.monotonic() - started)
+
+
+def report(stdout, counts, elapsed):
+    """Выводит число строк по моделям и скорость в строках в секунду."""
+    for label, count in counts.items():
+        stdout.write(f"{label}: {count}")
+    total = sum(counts.values())
+    rate = total / elapsed if elapsed else total
+    stdout.write(f"Всего: {total} строк за {elapsed:.2f} с ({rate:.0f}/с)")
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.models import ArchivedPost, Comment, Follow, Post
+from posts.transfer import deferred_indexes, import_rows
+
+from .export_posts import report
+
+
+class Command(BaseCommand):
+    help = "Загружает данные, выгруженные командой export_posts."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Файл выгрузки.")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument(
+            "--media-dir", help="Каталог с картинками постов из выгрузки."
+        )
+        parser.add_argument(
+            "--defer-indexes",
+            action="store_true",
+            help="Создать индексы по датам после загрузки данных.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        with open(options["path"], encoding="utf-8") as stream:
+            if options["defer_indexes"]:
+                with deferred_indexes(Post, Comment, Follow, ArchivedPost):
+                    counts = self.load(stream, options)
+            else:
+                counts = self.load(stream, options)
+        report(self.stdout, counts, time.monotonic() - started)
+
+    def load(self, stream, options):
+        return import_rows(
+            stream, options["chunk_size"], options["media_dir"]
+        )
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from posts.purge import purge_deleted
+
+
+class Command(BaseCommand):
+    help = (
+        "Окончательно удаляет удаленные посты с комментариями и "
+        "картинками и пользователей из очереди на удаление."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            help="Сколько дней хранить удаленные посты, по умолчанию "
+            "POSTS_PURGE_AFTER_DAYS.",
+        )
+        parser.add_argument("--batch-size", type=int, default=100)
+
+    def handle(self, *args, **options):
+        posts, users = purge_deleted(options["days"], options["batch_size"])
+        self.stdout.write(f"Удалено постов: {posts}, пользователей: {users}")
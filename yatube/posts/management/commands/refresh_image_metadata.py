@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from posts.images import update_image_metadata
+from posts.models import ArchivedPost, Post
+
+
+class Command(BaseCommand):
+    help = (
+        "Заполняет размеры, хеш и миниатюры картинок постов, загруженных "
+        "до появления этих полей."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Пересчитать метаданные всех картинок.",
+        )
+
+    def handle(self, *args, **options):
+        count = 0
+        for model in (Post, ArchivedPost):
+            posts = model._base_manager.exclude(image="")
+            if not options["all"]:
+                posts = posts.filter(Q(image_hash="") | Q(thumbnail_url=""))
+            for post in posts.iterator():
+                update_image_metadata(post)
+                count += 1
+        self.stdout.write(f"Обновлены картинки: {count}")
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from posts.constants import SUGGESTIONS_TOP_K
+from posts.recommendations import (refresh_stale_suggestions,
+                                   refresh_suggestions)
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает рекомендации «на кого подписаться»."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Пересчитать всех пользователей, а не только измененных.",
+        )
+        parser.add_argument("--top", type=int, default=SUGGESTIONS_TOP_K)
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            count = refresh_suggestions(top_k=options["top"])
+        else:
+            count = refresh_stale_suggestions(top_k=options["top"])
+        self.stdout.write(f"Обновлены рекомендации: {count}")
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from posts.trending import update_rankings
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает рейтинги популярных постов."
+
+    def handle(self, *args, **options):
+        rankings = update_rankings()
+        self.stdout.write(f"Обновлены рейтинги: {len(rankings)}")
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.cache import is_process_local
+from posts.constants import (WARM_CONCURRENCY, WARM_GROUPS, WARM_INDEX_PAGES,
+                             WARM_PROFILES)
+from posts.warmup import hot_paths, warm_pages
+
+
+class Command(BaseCommand):
+    help = (
+        "Заполняет кеш ответов для анонимов: первые страницы ленты, "
+        "активные группы и популярные профили."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=int, default=WARM_INDEX_PAGES)
+        parser.add_argument("--groups", type=int, default=WARM_GROUPS)
+        parser.add_argument("--profiles", type=int, default=WARM_PROFILES)
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=WARM_CONCURRENCY,
+            help="Число страниц, которые рендерятся одновременно.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Прогреть даже кеш в памяти процесса, который серверу "
+            "не виден.",
+        )
+
+    def handle(self, *args, **options):
+        if is_process_local() and not options["force"]:
+            raise CommandError(
+                "Кеш по умолчанию хранится в памяти процесса: прогретые "
+                "записи пропадут вместе с командой. Настройте общий кеш "
+                "или прогревайте через SERVER_WARMUP."
+            )
+        paths = hot_paths(
+            options["pages"], options["groups"], options["profiles"]
+        )
+        filled, elapsed = warm_pages(paths, options["concurrency"])
+        self.stdout.write(
+            f"Заполнено записей: {filled} из {len(paths)} "
+            f"за {elapsed:.2f} с"
+        )
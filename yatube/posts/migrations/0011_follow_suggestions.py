@@ -0,0 +1,96 @@
+# Generated by Django 4.2 on 2026-10-19 18:32
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("posts", "0010_follow"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SuggestionRefresh",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AlterModelOptions(
+            name="comment",
+            options={
+                "ordering": ("-pub_date",),
+                "verbose_name": "Коментарий",
+                "verbose_name_plural": "Коментарии",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="follow",
+            options={"ordering": ("-author",)},
+        ),
+        migrations.AlterModelOptions(
+            name="post",
+            options={
+                "ordering": ("-pub_date",),
+                "verbose_name": "Пост",
+                "verbose_name_plural": "Посты",
+            },
+        ),
+        migrations.CreateModel(
+            name="FollowSuggestion",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField(verbose_name="Вес рекомендации")),
+                (
+                    "author",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Рекомендуемый автор",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="suggestions",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Пользователь",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Рекомендация",
+                "verbose_name_plural": "Рекомендации",
+                "ordering": ("-score",),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="followsuggestion",
+            constraint=models.UniqueConstraint(
+                fields=("user", "author"), name="unique_follow_suggestion"
+            ),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 4.2 on 2026-10-19 18:33
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def backfill_follow_created(apps, schema_editor):
+    """Старым подпискам дата неизвестна: ставим дату регистрации
+    подписчика, чтобы они не попали в окно популярного как новые."""
+    Follow = apps.get_model("posts", "Follow")
+    User = Follow._meta.get_field("user").related_model
+    Follow.objects.update(
+        created=models.Subquery(
+            User.objects.filter(pk=models.OuterRef("user_id")).values(
+                "date_joined"
+            )[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0011_follow_suggestions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Ranking",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "scope",
+                    models.CharField(
+                        max_length=64,
+                        unique=True,
+                        verbose_name="Область рейтинга",
+                    ),
+                ),
+                (
+                    "post_ids",
+                    models.JSONField(
+                        default=list, verbose_name="Посты по убыванию веса"
+                    ),
+                ),
+                (
+                    "updated",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Дата расчета"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Рейтинг",
+                "verbose_name_plural": "Рейтинги",
+            },
+        ),
+        migrations.AddField(
+            model_name="follow",
+            name="created",
+            field=models.DateTimeField(
+                auto_now_add=True,
+                db_index=True,
+                default=django.utils.timezone.now,
+                verbose_name="Дата подписки",
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(
+            backfill_follow_created, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 4.2 on 2026-10-19 18:35
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("posts", "0012_trending"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedPost",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("text", models.TextField(verbose_name="Текст поста")),
+                (
+                    "image",
+                    models.ImageField(
+                        blank=True, upload_to="posts/", verbose_name="Картинка"
+                    ),
+                ),
+                (
+                    "pub_date",
+                    models.DateTimeField(
+                        db_index=True, verbose_name="Дата публикации"
+                    ),
+                ),
+                (
+                    "author",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_posts",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Автор",
+                    ),
+                ),
+                (
+                    "group",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="archived_posts",
+                        to="posts.group",
+                        verbose_name="Группа",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Архивный пост",
+                "verbose_name_plural": "Архивные посты",
+                "ordering": ("-pub_date",),
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedComment",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("text", models.TextField(verbose_name="Текст комментария")),
+                (
+                    "pub_date",
+                    models.DateTimeField(verbose_name="Дата публикации"),
+                ),
+                (
+                    "author",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_comments",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Автор",
+                    ),
+                ),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="comments",
+                        to="posts.archivedpost",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Архивный комментарий",
+                "verbose_name_plural": "Архивные комментарии",
+                "ordering": ("-pub_date",),
+            },
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 4.2 on 2026-10-19 18:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0013_archive"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="archivedpost",
+            name="image_hash",
+            field=models.CharField(
+                blank=True, max_length=64, verbose_name="Хеш картинки"
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedpost",
+            name="image_height",
+            field=models.PositiveIntegerField(
+                blank=True, null=True, verbose_name="Высота картинки"
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedpost",
+            name="image_width",
+            field=models.PositiveIntegerField(
+                blank=True, null=True, verbose_name="Ширина картинки"
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedpost",
+            name="thumbnail_url",
+            field=models.CharField(
+                blank=True, max_length=255, verbose_name="Адрес миниатюры"
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="image_hash",
+            field=models.CharField(
+                blank=True, max_length=64, verbose_name="Хеш картинки"
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="image_height",
+            field=models.PositiveIntegerField(
+                blank=True, null=True, verbose_name="Высота картинки"
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="image_width",
+            field=models.PositiveIntegerField(
+                blank=True, null=True, verbose_name="Ширина картинки"
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="thumbnail_url",
+            field=models.CharField(
+                blank=True, max_length=255, verbose_name="Адрес миниатюры"
+            ),
+        ),
+    ]
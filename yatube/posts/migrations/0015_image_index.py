@@ -0,0 +1,33 @@
+# Generated by Django 4.2 on 2026-10-19 18:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0014_image_metadata"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="archivedpost",
+            name="image",
+            field=models.ImageField(
+                blank=True,
+                db_index=True,
+                upload_to="posts/",
+                verbose_name="Картинка",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="post",
+            name="image",
+            field=models.ImageField(
+                blank=True,
+                db_index=True,
+                upload_to="posts/",
+                verbose_name="Картинка",
+            ),
+        ),
+    ]
@@ -0,0 +1,112 @@
+# Generated by Django 4.2 on 2026-10-19 19:08
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def copy_pub_date(apps, schema_editor):
+    for name in ("Post", "ArchivedPost"):
+        model = apps.get_model("posts", name)
+        model.objects.update(updated_at=models.F("pub_date"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("posts", "0015_image_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="archivedpost",
+            name="updated_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                verbose_name="Дата изменения",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="archivedpost",
+            name="version",
+            field=models.PositiveIntegerField(
+                default=1, verbose_name="Версия"
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, verbose_name="Дата изменения"
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="version",
+            field=models.PositiveIntegerField(
+                default=1, verbose_name="Версия"
+            ),
+        ),
+        migrations.RunPython(copy_pub_date, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name="PostRevision",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "pub_date",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        db_index=True,
+                        verbose_name="Дата публикации",
+                    ),
+                ),
+                (
+                    "version",
+                    models.PositiveIntegerField(verbose_name="Версия"),
+                ),
+                ("changes", models.JSONField(verbose_name="Изменения")),
+                (
+                    "editor",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Автор правки",
+                    ),
+                ),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="revisions",
+                        to="posts.post",
+                        verbose_name="Пост",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Ревизия поста",
+                "verbose_name_plural": "Ревизии постов",
+                "ordering": ("-version",),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="postrevision",
+            constraint=models.UniqueConstraint(
+                fields=("post", "version"), name="unique_post_version"
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2 on 2026-10-19 19:12
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("posts", "0016_post_versions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserDeletion",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "requested",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Дата запроса"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Удаление пользователя",
+                "verbose_name_plural": "Удаления пользователей",
+                "ordering": ("requested",),
+            },
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="deleted_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Дата удаления"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["-pub_date"],
+                name="post_live_pub_date_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.2 on 2026-10-19 19:29
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("posts", "0017_soft_delete"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedPostRevision",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                (
+                    "version",
+                    models.PositiveIntegerField(verbose_name="Версия"),
+                ),
+                ("changes", models.JSONField(verbose_name="Изменения")),
+                (
+                    "pub_date",
+                    models.DateTimeField(verbose_name="Дата публикации"),
+                ),
+                (
+                    "editor",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Автор правки",
+                    ),
+                ),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="revisions",
+                        to="posts.archivedpost",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Ревизия архивного поста",
+                "verbose_name_plural": "Ревизии архивных постов",
+                "ordering": ("-version",),
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2 on 2026-10-19 19:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0018_archived_revisions"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="archivedpost",
+            name="thumbnail_url",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                max_length=255,
+                verbose_name="Адрес миниатюры",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="post",
+            name="thumbnail_url",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                max_length=255,
+                verbose_name="Адрес миниатюры",
+            ),
+        ),
+    ]
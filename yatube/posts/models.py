@@ -1,6 +1,10 @@
 from core.models import CreatedModel
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
+
+from .images import update_image_metadata
+from .revisions import VERSIONED_FIELDS, revision_changes
 
 User = get_user_model()
 
@@ -16,6 +20,13 @@ class Group(models.Model):
         return self.title
 
 
+class PostManager(models.Manager):
+    """Посты, кроме удаленных."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Post(CreatedModel):
     """Модель для хранения постов."""
 
@@ -42,7 +53,24 @@ class Post(CreatedModel):
         verbose_name="Картинка",
         upload_to="posts/",
         blank=True,
+        db_index=True,
     )
+    image_width = models.PositiveIntegerField(
+        "Ширина картинки", null=True, blank=True
+    )
+    image_height = models.PositiveIntegerField(
+        "Высота картинки", null=True, blank=True
+    )
+    image_hash = models.CharField("Хеш картинки", max_length=64, blank=True)
+    thumbnail_url = models.CharField(
+        "Адрес миниатюры", max_length=255, blank=True, db_index=True
+    )
+    updated_at = models.DateTimeField("Дата изменения", auto_now=True)
+    version = models.PositiveIntegerField("Версия", default=1)
+    deleted_at = models.DateTimeField("Дата удаления", null=True, blank=True)
+
+    objects = PostManager()
+    all_objects = models.Manager()
 
     class Meta:
         """Внутренний класс, для изменения поведения полей модели."""
@@ -50,11 +78,99 @@ class Post(CreatedModel):
         ordering = ("-pub_date",)
         verbose_name = "Пост"
         verbose_name_plural = "Посты"
+        indexes = [
+            models.Index(
+                fields=("-pub_date",),
+                condition=models.Q(deleted_at__isnull=True),
+                name="post_live_pub_date_idx",
+            ),
+        ]
 
     def __str__(self):
         """Выводит поле text, при печати объекта модели Post."""
         return self.text[:15]
 
+    def save(self, *args, editor=None, **kwargs):
+        """Сохраняет пост и при загрузке новой картинки запоминает ее
+        размеры, хеш и адрес миниатюры, чтобы ленты не обращались к
+        хранилищу.
+
+        Если изменились текст, группа или картинка, номер версии
+        увеличивается, а прежнее содержимое записывается в PostRevision
+        от имени editor.
+        """
+        uploaded = bool(self.image) and not self.image._committed
+        with transaction.atomic():
+            previous = None
+            if self.pk and not self._state.adding:
+                previous = (
+                    Post.all_objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values("version", *VERSIONED_FIELDS)
+                    .first()
+                )
+            update_fields = kwargs.get("update_fields")
+            changes = previous and revision_changes(
+                previous, self, update_fields
+            )
+            if changes:
+                self.version = previous["version"] + 1
+                if update_fields is not None:
+                    kwargs["update_fields"] = {
+                        *update_fields, "version", "updated_at"
+                    }
+            super().save(*args, **kwargs)
+            if changes:
+                PostRevision.objects.create(
+                    post=self,
+                    version=previous["version"],
+                    changes=changes,
+                    editor=editor,
+                )
+        if uploaded or (not self.image and self.image_hash):
+            update_image_metadata(self)
+
+    def soft_delete(self):
+        """Скрывает пост из всех лент. Записи и файлы удаляет команда
+        purge_deleted."""
+        self.deleted_at = timezone.now()
+        self.save(update_fields=("deleted_at",))
+
+
+class PostRevision(CreatedModel):
+    """Правка поста: то, что нужно для восстановления версии version
+    из следующей."""
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="revisions",
+        verbose_name="Пост",
+    )
+    version = models.PositiveIntegerField("Версия")
+    changes = models.JSONField("Изменения")
+    editor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name="Автор правки",
+    )
+
+    class Meta:
+        ordering = ("-version",)
+        verbose_name = "Ревизия поста"
+        verbose_name_plural = "Ревизии постов"
+        constraints = [
+            models.UniqueConstraint(
+                fields=("post", "version"), name="unique_post_version"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id} v{self.version}"
+
 
 class Comment(CreatedModel):
     """Модель для хранения комментариев."""
@@ -101,6 +217,11 @@ class Follow(models.Model):
         related_name="following",
         verbose_name="Автор",
     )
+    created = models.DateTimeField(
+        "Дата подписки",
+        auto_now_add=True,
+        db_index=True,
+    )
 
     class Meta:
         ordering = ('-author',)
@@ -108,3 +229,180 @@ class Follow(models.Model):
         #     fields=('user', 'author'),
         #     name='unique_nambers',
         # )
+
+
+class Ranking(models.Model):
+    """Предрассчитанный рейтинг популярных постов."""
+
+    scope = models.CharField("Область рейтинга", max_length=64, unique=True)
+    post_ids = models.JSONField("Посты по убыванию веса", default=list)
+    updated = models.DateTimeField("Дата расчета", auto_now=True)
+
+    class Meta:
+        verbose_name = "Рейтинг"
+        verbose_name_plural = "Рейтинги"
+
+    def __str__(self):
+        return self.scope
+
+
+class FollowSuggestion(models.Model):
+    """Предрассчитанная рекомендация автора для подписки."""
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="suggestions",
+        verbose_name="Пользователь",
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name="Рекомендуемый автор",
+    )
+    score = models.FloatField("Вес рекомендации")
+
+    class Meta:
+        ordering = ("-score",)
+        verbose_name = "Рекомендация"
+        verbose_name_plural = "Рекомендации"
+        constraints = [
+            models.UniqueConstraint(
+                fields=("user", "author"),
+                name="unique_follow_suggestion",
+            ),
+        ]
+
+
+class SuggestionRefresh(models.Model):
+    """Пользователь, рекомендации которого нужно пересчитать."""
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="+",
+    )
+
+
+class ArchivedPost(models.Model):
+    """Архивная копия поста, вынесенная из основной таблицы."""
+
+    id = models.IntegerField(primary_key=True)
+    text = models.TextField(verbose_name="Текст поста")
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="archived_posts",
+        verbose_name="Автор",
+    )
+    group = models.ForeignKey(
+        Group,
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="archived_posts",
+        verbose_name="Группа",
+    )
+    image = models.ImageField(
+        verbose_name="Картинка",
+        upload_to="posts/",
+        blank=True,
+        db_index=True,
+    )
+    image_width = models.PositiveIntegerField(
+        "Ширина картинки", null=True, blank=True
+    )
+    image_height = models.PositiveIntegerField(
+        "Высота картинки", null=True, blank=True
+    )
+    image_hash = models.CharField("Хеш картинки", max_length=64, blank=True)
+    thumbnail_url = models.CharField(
+        "Адрес миниатюры", max_length=255, blank=True, db_index=True
+    )
+    pub_date = models.DateTimeField("Дата публикации", db_index=True)
+    updated_at = models.DateTimeField("Дата изменения")
+    version = models.PositiveIntegerField("Версия", default=1)
+
+    class Meta:
+        ordering = ("-pub_date",)
+        verbose_name = "Архивный пост"
+        verbose_name_plural = "Архивные посты"
+
+    def __str__(self):
+        return self.text[:15]
+
+
+class ArchivedComment(models.Model):
+    """Комментарий к архивному посту."""
+
+    id = models.IntegerField(primary_key=True)
+    post = models.ForeignKey(
+        ArchivedPost,
+        related_name="comments",
+        on_delete=models.CASCADE,
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="archived_comments",
+        verbose_name="Автор",
+    )
+    text = models.TextField("Текст комментария")
+    pub_date = models.DateTimeField("Дата публикации")
+
+    class Meta:
+        ordering = ("-pub_date",)
+        verbose_name = "Архивный комментарий"
+        verbose_name_plural = "Архивные комментарии"
+
+    def __str__(self):
+        return self.text
+
+
+class ArchivedPostRevision(models.Model):
+    """Правка архивного поста."""
+
+    id = models.IntegerField(primary_key=True)
+    post = models.ForeignKey(
+        ArchivedPost,
+        related_name="revisions",
+        on_delete=models.CASCADE,
+    )
+    version = models.PositiveIntegerField("Версия")
+    changes = models.JSONField("Изменения")
+    editor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name="Автор правки",
+    )
+    pub_date = models.DateTimeField("Дата публикации")
+
+    class Meta:
+        ordering = ("-version",)
+        verbose_name = "Ревизия архивного поста"
+        verbose_name_plural = "Ревизии архивных постов"
+
+    def __str__(self):
+        return f"{self.post_id} v{self.version}"
+
+
+class UserDeletion(models.Model):
+    """Пользователь, данные которого удаляются по частям."""
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="+",
+    )
+    requested = models.DateTimeField("Дата запроса", auto_now_add=True)
+
+    class Meta:
+        ordering = ("requested",)
+        verbose_name = "Удаление пользователя"
+        verbose_name_plural = "Удаления пользователей"
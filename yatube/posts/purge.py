@@ -0,0 +1,139 @@
+"""Окончательное удаление постов и пользователей небольшими пачками.
+
+Автор удаляет пост мягко: deleted_at скрывает его из всех лент, а записи
+удаляет команда purge_deleted, когда пройдет POSTS_PURGE_AFTER_DAYS.
+Удаление пользователя ставится в очередь UserDeletion; его посты,
+комментарии и подписки удаляются пачками в отдельных транзакциях, и
+ни одна из них не держит блокировку БД долго. Картинки хранятся по
+хешу содержимого и бывают общими для нескольких постов, поэтому файл
+и миниатюры удаляются, только когда на них больше никто не ссылается.
+"""
+from datetime import timedelta
+
+from core.cache import bump_namespace
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+
+from .images import delete_image
+from .models import (ArchivedComment, ArchivedPost, Comment, Follow, Post,
+                     UserDeletion)
+from .trending import update_rankings
+
+
+def purge_cutoff(days=None):
+    if days is None:
+        days = settings.POSTS_PURGE_AFTER_DAYS
+    return timezone.now() - timedelta(days=days)
+
+
+def delete_in_batches(queryset, batch_size):
+    """Удаляет строки queryset пачками, каждую в своей транзакции.
+
+    Возвращает число удаленных строк.
+    """
+    manager = queryset.model._base_manager
+    deleted = 0
+    while True:
+        ids = list(queryset.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            manager.filter(pk__in=ids).delete()
+        deleted += len(ids)
+
+
+def image_in_use(name):
+    return (
+        Post.all_objects.filter(image=name).exists()
+        or ArchivedPost.objects.filter(image=name).exists()
+    )
+
+
+def dependent_rows(model, ids):
+    """Строки, которые удаляются каскадом вместе с объектами ids."""
+    for relation in model._meta.related_objects:
+        if relation.on_delete is models.CASCADE:
+            yield relation.related_model._base_manager.filter(
+                **{f"{relation.field.name}__in": ids}
+            )
+
+
+def purge_posts(queryset, batch_size):
+    """Удаляет посты queryset вместе с комментариями и ревизиями, затем
+    картинки, на которые больше не ссылаются.
+
+    Комментарии и ревизии удаляются своими пачками до постов, поэтому
+    пост с тысячами комментариев не удаляется одной большой транзакцией.
+    Подходит для Post и ArchivedPost. Возвращает число удаленных постов.
+    """
+    manager = queryset.model._base_manager
+    purged = 0
+    while True:
+        posts = list(queryset.only("pk", "image")[:batch_size])
+        if not posts:
+            return purged
+        ids = [post.pk for post in posts]
+        for rows in dependent_rows(queryset.model, ids):
+            delete_in_batches(rows, batch_size)
+        with transaction.atomic():
+            manager.filter(pk__in=ids).delete()
+        images = {post.image.name: post.image for post in posts if post.image}
+        for name, image in images.items():
+            if not image_in_use(name):
+                delete_image(image)
+        purged += len(posts)
+
+
+def queue_user_deletion(user):
+    """Блокирует пользователя, скрывает его посты и ставит удаление
+    остальных данных в очередь."""
+    with transaction.atomic():
+        user.is_active = False
+        user.save(update_fields=("is_active",))
+        UserDeletion.objects.get_or_create(user=user)
+        posts = Post.objects.filter(author=user)
+        slugs = set(
+            posts.exclude(group=None).values_list("group__slug", flat=True)
+        )
+        posts.update(deleted_at=timezone.now())
+    bump_namespace(
+        "index",
+        f"profile:{user.username}",
+        *(f"group:{slug}" for slug in slugs),
+    )
+
+
+def purge_user(user, batch_size):
+    """Удаляет данные пользователя пачками, затем его самого."""
+    purge_posts(Post.all_objects.filter(author=user), batch_size)
+    purge_posts(ArchivedPost.objects.filter(author=user), batch_size)
+    for queryset in (
+        Comment.objects.filter(author=user),
+        ArchivedComment.objects.filter(author=user),
+        Follow.objects.filter(user=user),
+        Follow.objects.filter(author=user),
+    ):
+        delete_in_batches(queryset, batch_size)
+    user.delete()
+
+
+def purge_deleted(days=None, batch_size=100):
+    """Удаляет мягко удаленные посты старше days дней и пользователей из
+    очереди, затем пересчитывает рейтинги популярного.
+
+    Возвращает число удаленных постов и пользователей.
+    """
+    posts = purge_posts(
+        Post.all_objects.filter(deleted_at__lt=purge_cutoff(days)).order_by(
+            "deleted_at"
+        ),
+        batch_size,
+    )
+    users = 0
+    for deletion in UserDeletion.objects.select_related("user"):
+        purge_user(deletion.user, batch_size)
+        users += 1
+    if posts or users:
+        update_rankings()
+    return posts, users
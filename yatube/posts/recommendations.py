@@ -0,0 +1,113 @@
+"""Расчет рекомендаций «на кого подписаться».
+
+Граф подписок хранится как разреженная матрица смежности в виде словарей
+множеств (строка матрицы — множество авторов пользователя). Вес кандидата
+считается как произведение строк матрицы: число общих подписок с соседом
+умножается на его подписки, к этому добавляется вес общих групп.
+"""
+import heapq
+from collections import Counter, defaultdict
+
+from django.db import transaction
+
+from .constants import SUGGESTIONS_GROUP_WEIGHT, SUGGESTIONS_TOP_K
+from .models import Follow, FollowSuggestion, Post, SuggestionRefresh, User
+
+
+def _rows(pairs):
+    """Собирает разреженные строки матрицы из пар (строка, столбец)."""
+    rows = defaultdict(set)
+    for row, column in pairs:
+        rows[row].add(column)
+    return rows
+
+
+def _load_graph(user_ids):
+    """Загружает окрестность пользователей в графе подписок.
+
+    Для полного пересчета (user_ids is None) читается весь граф, для
+    инкрементального — только подписки пользователей, подписчики их
+    авторов и подписки этих подписчиков.
+    """
+    follows = Follow.objects.values_list("user_id", "author_id")
+    if user_ids is None:
+        pairs = list(follows)
+        return _rows(pairs), _rows((a, u) for u, a in pairs)
+    own = _rows(follows.filter(user_id__in=user_ids))
+    authors = set().union(*own.values()) if own else set()
+    followers = _rows(
+        (a, u) for u, a in follows.filter(author_id__in=authors)
+    )
+    neighbours = set().union(*followers.values()) if followers else set()
+    following = _rows(follows.filter(user_id__in=neighbours | set(own)))
+    return following, followers
+
+
+def _load_groups():
+    """Возвращает группы авторов и авторов групп по опубликованным постам."""
+    pairs = list(
+        Post.objects.filter(group__isnull=False)
+        .values_list("author_id", "group_id")
+        .distinct()
+    )
+    return _rows(pairs), _rows((g, a) for a, g in pairs)
+
+
+def score_user(user_id, following, followers, author_groups, group_authors):
+    """Считает веса кандидатов для одного пользователя."""
+    own = following.get(user_id, set())
+    overlap = Counter()
+    for author_id in own:
+        for neighbour_id in followers.get(author_id, ()):
+            if neighbour_id != user_id:
+                overlap[neighbour_id] += 1
+    scores = Counter()
+    for neighbour_id, weight in overlap.items():
+        for candidate_id in following.get(neighbour_id, ()):
+            scores[candidate_id] += weight
+    groups = set(author_groups.get(user_id, ()))
+    for author_id in own:
+        groups |= author_groups.get(author_id, set())
+    for group_id in groups:
+        for candidate_id in group_authors.get(group_id, ()):
+            scores[candidate_id] += SUGGESTIONS_GROUP_WEIGHT
+    for excluded_id in own | {user_id}:
+        scores.pop(excluded_id, None)
+    return scores
+
+
+def refresh_suggestions(user_ids=None, top_k=SUGGESTIONS_TOP_K):
+    """Пересчитывает и сохраняет top_k рекомендаций.
+
+    Без user_ids пересчитываются все пользователи, иначе только
+    переданные. Возвращает число обработанных пользователей.
+    """
+    following, followers = _load_graph(user_ids)
+    author_groups, group_authors = _load_groups()
+    if user_ids is None:
+        user_ids = list(User.objects.values_list("pk", flat=True))
+    suggestions = []
+    for user_id in user_ids:
+        scores = score_user(
+            user_id, following, followers, author_groups, group_authors
+        )
+        best = heapq.nlargest(
+            top_k, scores.items(), key=lambda item: (item[1], -item[0])
+        )
+        suggestions += [
+            FollowSuggestion(user_id=user_id, author_id=author_id, score=score)
+            for author_id, score in best
+        ]
+    with transaction.atomic():
+        FollowSuggestion.objects.filter(user_id__in=user_ids).delete()
+        FollowSuggestion.objects.bulk_create(suggestions)
+        SuggestionRefresh.objects.filter(user_id__in=user_ids).delete()
+    return len(user_ids)
+
+
+def refresh_stale_suggestions(top_k=SUGGESTIONS_TOP_K):
+    """Пересчитывает рекомендации пользователей, сменивших подписки."""
+    user_ids = list(SuggestionRefresh.objects.values_list("pk", flat=True))
+    if not user_ids:
+        return 0
+    return refresh_suggestions(user_ids, top_k)
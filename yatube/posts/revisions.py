@@ -0,0 +1,93 @@
+"""История правок поста в виде обратных диффов.
+
+Текущая версия хранится в самом посте, а ревизия хранит только то, что
+нужно, чтобы получить из следующей версии предыдущую: замененные
+фрагменты текста и прежние группу и картинку, если они менялись. Текст
+сравнивается по словам, поэтому правка опечатки в длинном посте
+занимает несколько байт.
+"""
+import re
+from difflib import SequenceMatcher
+
+VERSIONED_FIELDS = ("text", "group_id", "image")
+TOKEN_RE = re.compile(r"\s+|\S+")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text)
+
+
+def text_diff(new, old):
+    """Операции [начало, конец, замена], превращающие new в old.
+
+    Позиции считаются в словах и пробелах текста new.
+    """
+    new_tokens, old_tokens = tokenize(new), tokenize(old)
+    matcher = SequenceMatcher(None, new_tokens, old_tokens, autojunk=False)
+    return [
+        [i1, i2, "".join(old_tokens[j1:j2])]
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def apply_diff(text, diff):
+    """Восстанавливает предыдущий текст по диффу из text_diff."""
+    tokens = tokenize(text)
+    for start, end, replacement in reversed(diff):
+        tokens[start:end] = [replacement]
+    return "".join(tokens)
+
+
+def revision_changes(previous, post, fields=None):
+    """Изменения поста относительно previous — словаря значений
+    VERSIONED_FIELDS из БД — в виде, пригодном для ревизии.
+
+    fields ограничивает сравнение сохраняемыми полями. Пустой словарь
+    означает, что содержимое поста не изменилось.
+    """
+    if fields is not None:
+        fields = {field.removesuffix("_id") for field in fields}
+    changes = {}
+    for name in VERSIONED_FIELDS:
+        if fields is not None and name.removesuffix("_id") not in fields:
+            continue
+        current = getattr(post, name)
+        if name == "image":
+            current = current.name or ""
+        if current == previous[name]:
+            continue
+        if name == "text":
+            changes[name] = text_diff(current, previous[name])
+        else:
+            changes[name] = previous[name]
+    return changes
+
+
+def history(post, revisions):
+    """Версии поста от текущей к первой.
+
+    revisions — ревизии поста в порядке убывания версии. Возвращает
+    список словарей с номером версии, текстом, группой, картинкой,
+    датой и автором правки.
+    """
+    state = {
+        "version": post.version,
+        "text": post.text,
+        "group_id": post.group_id,
+        "image": post.image.name or "",
+    }
+    versions = []
+    for revision in revisions:
+        versions.append(
+            {**state, "edited": revision.pub_date, "editor": revision.editor}
+        )
+        changes = revision.changes
+        state = {
+            "version": revision.version,
+            "text": apply_diff(state["text"], changes.get("text", [])),
+            "group_id": changes.get("group_id", state["group_id"]),
+            "image": changes.get("image", state["image"]),
+        }
+    versions.append({**state, "edited": post.pub_date, "editor": post.author})
+    return versions
@@ -0,0 +1,91 @@
+from core.cache import bump_namespace
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Follow, Group, Post, SuggestionRefresh, User
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def mark_suggestions_stale(sender, instance, **kwargs):
+    """Помечает рекомендации подписчика для пересчета.
+
+    Отметка ставится после фиксации транзакции и только если подписчик
+    еще существует: при удалении пользователя его подписки удаляются
+    каскадом, и отметка ссылалась бы на удаленную строку.
+    """
+    user_id = instance.user_id
+
+    def mark():
+        if User.objects.filter(pk=user_id).exists():
+            SuggestionRefresh.objects.get_or_create(user_id=user_id)
+
+    transaction.on_commit(mark)
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_group(sender, instance, **kwargs):
+    """Запоминает прежнюю группу поста, чтобы сбросить и ее страницу."""
+    instance._previous_group_id = (
+        Post.all_objects.filter(pk=instance.pk)
+        .values_list("group_id", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def purge_post_pages(sender, instance, **kwargs):
+    """Сбрасывает кеш главной страницы, страниц групп и автора поста.
+
+    Удаленный пост пропал со страниц еще при мягком удалении, поэтому
+    окончательное удаление кеш не сбрасывает.
+    """
+    if instance.deleted_at and kwargs["signal"] is post_delete:
+        return
+    group_ids = {
+        instance.group_id,
+        getattr(instance, "_previous_group_id", None),
+    } - {None}
+    slugs = Group.objects.filter(pk__in=group_ids).values_list(
+        "slug", flat=True
+    )
+    usernames = User.objects.filter(pk=instance.author_id).values_list(
+        "username", flat=True
+    )
+    bump_namespace(
+        "index",
+        *(f"group:{slug}" for slug in slugs),
+        *(f"profile:{username}" for username in usernames),
+    )
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def purge_group_page(sender, instance, **kwargs):
+    """Сбрасывает кеш страницы группы."""
+    bump_namespace(f"group:{instance.slug}")
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def purge_followed_profile(sender, instance, **kwargs):
+    """Сбрасывает кеш профиля автора: изменилось число подписчиков."""
+    usernames = User.objects.filter(pk=instance.author_id).values_list(
+        "username", flat=True
+    )
+    bump_namespace(*(f"profile:{username}" for username in usernames))
+
+
+@receiver(post_save, sender=User)
+def purge_user_profile(sender, instance, update_fields=None, **kwargs):
+    """Сбрасывает кеш профиля при изменении пользователя.
+
+    Вход обновляет только last_login, который на странице не виден.
+    """
+    if update_fields == {"last_login"}:
+        return
+    bump_namespace(f"profile:{instance.username}")
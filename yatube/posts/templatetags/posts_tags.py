@@ -0,0 +1,26 @@
+from django import template
+
+register = template.Library()
+
+
+@register.inclusion_tag("posts/includes/post_list.html")
+def post_card(post):
+    """Карточка поста в ленте.
+
+    В отличие от include, шаблон карточки получает только пост, а не весь
+    контекст страницы, и не ищется заново для каждой карточки.
+    """
+    return {"post": post}
+
+
+@register.simple_tag
+def thumbnail_url(post):
+    """Адрес миниатюры картинки поста.
+
+    Тег только читает сохраненный при загрузке адрес и ничего не пишет в
+    БД. У старых постов, для которых миниатюра еще не создана командой
+    refresh_image_metadata, показывается исходная картинка.
+    """
+    if post.thumbnail_url:
+        return post.thumbnail_url
+    return post.image.url if post.image else ""
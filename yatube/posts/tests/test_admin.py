@@ -0,0 +1,112 @@
+from core.cache import namespace_versions
+from django.contrib.admin import site
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from ..models import Comment, Follow, Group, Post, PostRevision, User
+
+
+class AdminChangelistTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            username="admin", email="admin@test.ru", password="password-1"
+        )
+        cls.group = mixer.blend(Group, slug="group")
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.admin)
+
+    def create_rows(self, number):
+        authors = User.objects.bulk_create(
+            User(username=f"user-{User.objects.count()}-{index}")
+            for index in range(number)
+        )
+        posts = Post.objects.bulk_create(
+            Post(author=author, text="Текст", group=self.group)
+            for author in authors
+        )
+        Comment.objects.bulk_create(
+            Comment(post=post, author=post.author, text="Комментарий")
+            for post in posts
+        )
+        Follow.objects.bulk_create(
+            Follow(user=self.admin, author=author) for author in authors
+        )
+
+    def count_queries(self, url):
+        cache.clear()
+        self.client.force_login(self.admin)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Число запросов страницы списка не зависит от числа строк."""
+        for model in ("post", "comment", "follow"):
+            with self.subTest(model=model):
+                url = reverse(f"admin:posts_{model}_changelist")
+                self.create_rows(2)
+                few = self.count_queries(url)
+                self.create_rows(20)
+                self.assertEqual(self.count_queries(url), few)
+
+    def test_changelist_query_budget(self):
+        """Страница списка постов укладывается в бюджет запросов."""
+        self.create_rows(20)
+        url = reverse("admin:posts_post_changelist")
+        self.assertLessEqual(self.count_queries(url), 5)
+
+    def test_cached_count_reused(self):
+        """Повторный показ списка не считает COUNT(*) заново."""
+        self.create_rows(3)
+        url = reverse("admin:posts_post_changelist")
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url)
+        self.assertFalse(
+            any("COUNT(" in query["sql"] for query in context.captured_queries)
+        )
+
+    def test_clear_group_action_single_update(self):
+        """Действие «Убрать из группы» обновляет посты одним запросом и
+        сбрасывает кеш профилей авторов."""
+        self.create_rows(5)
+        request = RequestFactory().post("/")
+        request.user = self.admin
+        usernames = Post.objects.values_list("author__username", flat=True)
+        namespaces = [f"profile:{username}" for username in usernames]
+        before = namespace_versions(namespaces)
+        # Точка сохранения, выборка, ревизии, UPDATE, освобождение точки
+        # и слаги групп — при любом числе постов.
+        with self.assertNumQueries(6):
+            site._registry[Post].clear_group(request, Post.objects.all())
+        self.assertFalse(Post.objects.exclude(group=None).exists())
+        for old, new in zip(before, namespace_versions(namespaces)):
+            self.assertGreater(new, old)
+
+    def test_clear_group_action_records_revisions(self):
+        """Действие «Убрать из группы» записывает ревизии с прежней
+        группой."""
+        self.create_rows(3)
+        self.client.post(
+            reverse("admin:posts_post_changelist"),
+            {
+                "action": "clear_group",
+                "_selected_action": Post.objects.values_list("pk", flat=True),
+            },
+        )
+        revisions = PostRevision.objects.all()
+        self.assertEqual(len(revisions), 3)
+        for revision in revisions:
+            self.assertEqual(revision.version, 1)
+            self.assertEqual(revision.changes, {"group_id": self.group.pk})
+            self.assertEqual(revision.editor, self.admin)
+            self.assertEqual(revision.post.version, 2)
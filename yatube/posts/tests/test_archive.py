@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..archive import archive_posts
+from ..constants import TEN_POSTS
+from ..models import ArchivedPost, Comment, Post, PostRevision, User
+
+
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="auth")
+        Post.objects.bulk_create(
+            Post(author=cls.user, text=f"Новый пост {i}") for i in range(8)
+        )
+        old_posts = Post.objects.bulk_create(
+            Post(author=cls.user, text=f"Старый пост {i}") for i in range(5)
+        )
+        cls.old_post = old_posts[0]
+        Comment.objects.create(
+            post=cls.old_post, author=cls.user, text="Старый комментарий"
+        )
+        Post.objects.filter(pk__in=[post.pk for post in old_posts]).update(
+            pub_date=timezone.now() - timedelta(days=400)
+        )
+
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+
+    def test_old_posts_moved_to_archive(self):
+        """Старые посты с комментариями переносятся в архив."""
+        self.assertEqual(archive_posts(batch_size=2), 5)
+        self.assertEqual(Post.objects.count(), 8)
+        self.assertEqual(ArchivedPost.objects.count(), 5)
+        self.assertFalse(Comment.objects.exists())
+        archived = ArchivedPost.objects.get(pk=self.old_post.pk)
+        self.assertEqual(archived.comments.get().text, "Старый комментарий")
+
+    def test_post_detail_reads_archive(self):
+        """Страница поста открывает архивный пост."""
+        archive_posts()
+        response = self.client.get(
+            reverse("posts:post_detail", args=(self.old_post.pk,))
+        )
+        self.assertEqual(response.context["post"].text, self.old_post.text)
+        self.assertTrue(response.context["archived"])
+        self.assertEqual(response.context["author_posts"], 13)
+        self.assertContains(response, "Старый комментарий")
+
+    def test_profile_pages_continue_into_archive(self):
+        """Профиль листает сначала новые посты, затем архивные."""
+        archive_posts()
+        url = reverse("posts:profile", args=(self.user.username,))
+        first_page = self.client.get(url).context["page_obj"]
+        self.assertEqual(first_page.paginator.count, 13)
+        self.assertEqual(len(first_page), TEN_POSTS)
+        self.assertIsInstance(first_page[9], ArchivedPost)
+        second_page = self.client.get(url + "?page=2").context["page_obj"]
+        self.assertEqual(len(second_page), 3)
+
+    def test_revisions_moved_with_post(self):
+        """Ревизии переносятся вместе с постом, история остается."""
+        post = Post.objects.get(pk=self.old_post.pk)
+        post.text = "Исправленный пост"
+        post.save()
+        archive_posts()
+        self.assertFalse(PostRevision.objects.exists())
+        archived = ArchivedPost.objects.get(pk=post.pk)
+        self.assertEqual(archived.revisions.get().version, 1)
+        moderator = User.objects.create_user(username="mod", is_staff=True)
+        self.client.force_login(moderator)
+        response = self.client.get(
+            reverse("posts:post_history", args=(post.pk,))
+        )
+        self.assertContains(response, "Исправленный пост")
+        self.assertContains(response, self.old_post.text)
+
+    def test_archiving_purges_cached_profile(self):
+        """Архивация сбрасывает кеш профиля автора."""
+        url = reverse("posts:profile", args=(self.user.username,))
+        self.client.get(url)
+        self.assertIsNone(self.client.get(url).context)
+        archive_posts()
+        response = self.client.get(url)
+        self.assertIsNotNone(response.context)
+        self.assertIsInstance(response.context["page_obj"][9], ArchivedPost)
+
+    def test_profile_counts_cached(self):
+        """Повторный просмотр профиля не считает посты заново."""
+        archive_posts()
+        self.client.force_login(self.user)
+        url = reverse("posts:profile", args=(self.user.username,))
+        self.client.get(url)
+        # Автор, по срезу из двух таблиц и счетчики подписок в шаблоне.
+        with self.assertNumQueries(5):
+            self.client.get(url)
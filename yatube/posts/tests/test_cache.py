@@ -0,0 +1,151 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.template import Context, Template
+from django.test import Client, TestCase
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from ..models import Follow, Group, Post, User
+from ..warmup import hot_paths
+
+
+class FeedResponseCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="auth")
+        cls.group = mixer.blend(Group, slug="group")
+        cls.other_group = mixer.blend(Group, slug="other")
+
+    def setUp(self):
+        cache.clear()
+        self.anon = Client()
+
+    def test_anonymous_index_served_from_cache(self):
+        """Аноним получает главную страницу из кеша."""
+        self.anon.get(reverse("posts:index"))
+        response = self.anon.get(reverse("posts:index"))
+        self.assertIsNone(response.context)
+
+    def test_authorized_index_not_cached(self):
+        """Авторизованным пользователям страница рендерится заново."""
+        auth = Client()
+        auth.force_login(self.user)
+        auth.get(reverse("posts:index"))
+        self.assertIsNotNone(auth.get(reverse("posts:index")).context)
+
+    def test_new_post_purges_index_and_group(self):
+        """Новый пост сбрасывает кеш ответов главной и своей группы.
+
+        Фрагмент ленты на главной живет по своему сроку, поэтому для нее
+        проверяется только повторный рендер страницы.
+        """
+        index = reverse("posts:index")
+        group = reverse("posts:group_list", args=(self.group.slug,))
+        other = reverse("posts:group_list", args=(self.other_group.slug,))
+        for url in (index, group, other):
+            self.anon.get(url)
+        Post.objects.create(author=self.user, text="Новый", group=self.group)
+        self.assertIsNotNone(self.anon.get(index).context)
+        self.assertContains(self.anon.get(group), "Новый")
+        self.assertIsNone(self.anon.get(other).context)
+
+    def test_moving_post_purges_previous_group(self):
+        """Перенос поста в другую группу сбрасывает прежнюю группу."""
+        post = Post.objects.create(
+            author=self.user, text="Переезд", group=self.group
+        )
+        url = reverse("posts:group_list", args=(self.group.slug,))
+        self.assertContains(self.anon.get(url), "Переезд")
+        post.group = self.other_group
+        post.save()
+        self.assertNotContains(self.anon.get(url), "Переезд")
+
+    def test_follow_feed_fragment_is_per_user(self):
+        """Фрагмент ленты подписок не отдается другому пользователю."""
+        first, second = Client(), Client()
+        first.force_login(self.user)
+        second.force_login(User.objects.create_user(username="second"))
+        author = User.objects.create_user(username="author")
+        Follow.objects.create(user=self.user, author=author)
+        Post.objects.create(author=author, text="Только для подписчика")
+        url = reverse("posts:follow_index")
+        self.assertContains(first.get(url), "Только для подписчика")
+        self.assertNotContains(second.get(url), "Только для подписчика")
+
+    def test_post_card_follows_author_name(self):
+        """Карточка поста показывает новое имя автора после его смены."""
+        post = Post.objects.create(author=self.user, text="Карточка")
+        card = Template("{% load posts_tags %}{% post_card post %}")
+        self.assertIn("auth", card.render(Context({"post": post})))
+        self.user.first_name = "Новое"
+        self.user.last_name = "Имя"
+        self.user.save()
+        post = Post.objects.select_related("author").get(pk=post.pk)
+        self.assertIn("Новое Имя", card.render(Context({"post": post})))
+
+    def test_anonymous_profile_purged_by_post_and_follow(self):
+        """Кеш профиля сбрасывают новый пост и подписка на автора."""
+        url = reverse("posts:profile", args=(self.user.username,))
+        self.anon.get(url)
+        self.assertIsNone(self.anon.get(url).context)
+        Post.objects.create(author=self.user, text="Профиль")
+        self.assertContains(self.anon.get(url), "Профиль")
+        self.assertIsNone(self.anon.get(url).context)
+        Follow.objects.create(
+            user=User.objects.create_user(username="reader"),
+            author=self.user,
+        )
+        self.assertIsNotNone(self.anon.get(url).context)
+
+
+class WarmCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username="author")
+        cls.reader = User.objects.create_user(username="reader")
+        cls.active = mixer.blend(Group, slug="active")
+        cls.quiet = mixer.blend(Group, slug="quiet")
+        Post.objects.create(author=cls.author, text="Пост", group=cls.active)
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_hot_paths(self):
+        """Прогреваются страницы ленты, активные группы и профили."""
+        self.assertEqual(
+            hot_paths(pages=2, groups=5, profiles=1),
+            [
+                reverse("posts:index"),
+                reverse("posts:index") + "?page=2",
+                reverse("posts:group_list", args=(self.active.slug,)),
+                reverse("posts:profile", args=(self.author.username,)),
+            ],
+        )
+
+    def test_warm_cache_command(self):
+        """Команда заполняет кеш, повторный запуск ничего не рендерит."""
+        out = StringIO()
+        call_command(
+            "warm_cache", "--concurrency", "1", "--force", stdout=out
+        )
+        self.assertIn("Заполнено записей: 6 из 6", out.getvalue())
+        for url in (
+            reverse("posts:index"),
+            reverse("posts:group_list", args=(self.active.slug,)),
+            reverse("posts:profile", args=(self.author.username,)),
+        ):
+            with self.subTest(url=url):
+                self.assertIsNone(Client().get(url).context)
+        out = StringIO()
+        call_command(
+            "warm_cache", "--concurrency", "1", "--force", stdout=out
+        )
+        self.assertIn("Заполнено записей: 0 из 6", out.getvalue())
+
+    def test_warm_cache_refuses_process_local_cache(self):
+        """Кеш в памяти процесса команда не прогревает без --force."""
+        with self.assertRaises(CommandError):
+            call_command("warm_cache", stdout=StringIO())
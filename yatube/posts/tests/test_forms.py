@@ -1,3 +1,4 @@
+import os
 import shutil
 import tempfile
 from http import HTTPStatus
@@ -14,7 +15,10 @@ from ..models import Comment, Group, Post, User
 TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
 
 
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+@override_settings(
+    MEDIA_ROOT=TEMP_MEDIA_ROOT,
+    THUMBNAIL_ROOT=os.path.join(TEMP_MEDIA_ROOT, "thumbnails"),
+)
 class PostFormTests(TestCase):
     @classmethod
     def setUpClass(cls):
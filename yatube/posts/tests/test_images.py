@@ -0,0 +1,202 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Post, User
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+SMALL_GIF = (
+    b"\x47\x49\x46\x38\x39\x61\x02\x00"
+    b"\x01\x00\x80\x00\x00\x00\x00\x00"
+    b"\xFF\xFF\xFF\x21\xF9\x04\x00\x00"
+    b"\x00\x00\x00\x2C\x00\x00\x00\x00"
+    b"\x02\x00\x01\x00\x00\x02\x02\x0C"
+    b"\x0A\x00\x3B"
+)
+
+
+@override_settings(
+    MEDIA_ROOT=TEMP_MEDIA_ROOT,
+    THUMBNAIL_ROOT=os.path.join(TEMP_MEDIA_ROOT, "thumbnails"),
+)
+class ImageMetadataTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="auth")
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text="Пост с картинкой",
+            image=SimpleUploadedFile(
+                name="small.gif", content=SMALL_GIF, content_type="image/gif"
+            ),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+
+    def test_upload_stores_metadata(self):
+        """При загрузке картинки сохраняются размеры, хеш и миниатюра."""
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual((post.image_width, post.image_height), (2, 1))
+        self.assertEqual(
+            post.image_hash, hashlib.sha256(SMALL_GIF).hexdigest()
+        )
+        self.assertTrue(post.thumbnail_url.startswith(settings.THUMBNAIL_URL))
+
+    def test_feeds_do_not_touch_storage(self):
+        """Ленты выводят картинки без обращений к хранилищу."""
+        urls = (
+            reverse("posts:index"),
+            reverse("posts:profile", args=(self.user.username,)),
+            reverse("posts:post_detail", args=(self.post.pk,)),
+        )
+        with mock.patch.object(
+            FileSystemStorage, "exists", side_effect=AssertionError
+        ), mock.patch.object(
+            FileSystemStorage, "open", side_effect=AssertionError
+        ):
+            for url in urls:
+                with self.subTest(url=url):
+                    response = self.client.get(url)
+                    self.assertContains(response, self.post.thumbnail_url)
+
+    def test_removing_image_clears_metadata(self):
+        """Удаление картинки очищает ее метаданные."""
+        post = Post.objects.get(pk=self.post.pk)
+        post.image = None
+        post.save()
+        post.refresh_from_db()
+        self.assertIsNone(post.image_width)
+        self.assertEqual(post.image_hash, "")
+        self.assertEqual(post.thumbnail_url, "")
+
+    def test_feed_without_thumbnail_does_not_write(self):
+        """Пост без миниатюры показывается с исходной картинкой, а
+        страница не пишет в БД."""
+        Post.objects.filter(pk=self.post.pk).update(thumbnail_url="")
+        with mock.patch(
+            "posts.images.update_image_metadata", side_effect=AssertionError
+        ):
+            response = self.client.get(
+                reverse("posts:profile", args=(self.user.username,))
+            )
+        self.assertContains(response, self.post.image.url)
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(post.thumbnail_url, "")
+
+    def test_refresh_command_backfills_metadata(self):
+        """Команда refresh_image_metadata заполняет старые посты."""
+        Post.objects.filter(pk=self.post.pk).update(
+            image_width=None, image_height=None, image_hash="",
+            thumbnail_url="",
+        )
+        call_command("refresh_image_metadata", stdout=mock.Mock())
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(post.image_width, 2)
+        self.assertNotEqual(post.thumbnail_url, "")
+
+
+@override_settings(
+    MEDIA_ROOT=TEMP_MEDIA_ROOT,
+    THUMBNAIL_ROOT=os.path.join(TEMP_MEDIA_ROOT, "thumbnails"),
+)
+class MediaServingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="auth")
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text="Пост с картинкой",
+            image=SimpleUploadedFile(
+                name="small.gif", content=SMALL_GIF, content_type="image/gif"
+            ),
+        )
+        cls.url = settings.MEDIA_URL + cls.post.image.name
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_image_served_with_etag(self):
+        """Картинка отдается целиком с сильным ETag из хеша."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), SMALL_GIF)
+        self.assertEqual(response["ETag"], f'"{self.post.image_hash}"')
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_range_request(self):
+        """Запрос диапазона отдает только запрошенные байты."""
+        response = self.client.get(self.url, HTTP_RANGE="bytes=6-9")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), SMALL_GIF[6:10])
+        self.assertEqual(
+            response["Content-Range"], f"bytes 6-9/{len(SMALL_GIF)}"
+        )
+        self.assertFalse(hasattr(response.file_to_stream, "fileno"))
+        response = self.client.get(self.url, HTTP_RANGE="bytes=1000-")
+        self.assertEqual(response.status_code, 416)
+
+    def test_not_modified(self):
+        """Совпавший If-None-Match дает 304 без тела."""
+        response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=f'"{self.post.image_hash}"'
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_unknown_file_not_served(self):
+        """Файлы, не принадлежащие постам, не отдаются."""
+        for name in ("posts/unknown.gif", "../settings.py"):
+            with self.subTest(name=name):
+                response = self.client.get(settings.MEDIA_URL + name)
+                self.assertEqual(response.status_code, 404)
+
+    @override_settings(MEDIA_SERVE_MODE="accel")
+    def test_accel_redirect(self):
+        """В режиме accel байты отдает nginx."""
+        response = self.client.get(self.url)
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            settings.MEDIA_ACCEL_PREFIX + self.post.image.name,
+        )
+        self.assertEqual(response.content, b"")
+
+    def test_thumbnail_served(self):
+        """Миниатюра отдается по сохраненному адресу."""
+        response = self.client.get(self.post.thumbnail_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("ETag", response)
+
+    def test_thumbnail_of_deleted_post_not_served(self):
+        """Миниатюра удаленного поста недоступна, как и сама картинка."""
+        post = Post.objects.get(pk=self.post.pk)
+        post.soft_delete()
+        for url in (self.url, post.thumbnail_url):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+        response = self.client.get(settings.THUMBNAIL_URL + "unknown.jpg")
+        self.assertEqual(response.status_code, 404)
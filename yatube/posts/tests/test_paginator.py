@@ -0,0 +1,68 @@
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..constants import TEN_POSTS
+from ..models import Post, User
+from ..utils import page_list
+
+
+class FeedPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="auth")
+        Post.objects.bulk_create(
+            Post(author=cls.user, text=f"Пост {number}")
+            for number in range(25)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def get_page(self, number=1):
+        request = self.factory.get("/", {"page": number})
+        return page_list(Post.objects.all(), request)
+
+    def test_count_cached_between_requests(self):
+        """Повторный запрос ленты не выполняет COUNT(*)."""
+        self.get_page().paginator.count
+        with CaptureQueriesContext(connection) as context:
+            page = self.get_page(2)
+            page.paginator.count
+        self.assertEqual(len(context), 1)
+        self.assertNotIn("COUNT(", context.captured_queries[0]["sql"])
+
+    def test_stale_count_degrades_gracefully(self):
+        """Новые посты доступны, даже если число постов устарело."""
+        self.assertEqual(self.get_page().paginator.num_pages, 3)
+        Post.objects.bulk_create(
+            Post(author=self.user, text="Новый") for _ in range(TEN_POSTS)
+        )
+        third = self.get_page(3)
+        self.assertTrue(third.has_next())
+        fourth = self.get_page(4)
+        self.assertEqual(fourth.number, 4)
+        self.assertEqual(len(fourth), 5)
+        self.assertFalse(fourth.has_next())
+        self.assertEqual(fourth.end_index(), 3 * TEN_POSTS + 5)
+        self.assertIs(type(fourth), Page)
+
+    def test_page_past_the_end_falls_back(self):
+        """Слишком большой номер страницы ведет на последнюю."""
+        self.assertEqual(self.get_page(100).number, 3)
+        self.assertEqual(self.get_page("abc").number, 1)
+
+    def test_window_render_size_does_not_grow(self):
+        """Размер пагинации не зависит от числа страниц."""
+        sizes = []
+        for total in (1_000, 1_000_000):
+            page_obj = Paginator(range(total), TEN_POSTS).page(50)
+            html = render_to_string(
+                "posts/includes/paginator.html", {"page_obj": page_obj}
+            )
+            sizes.append(len(html))
+        self.assertLess(sizes[1] - sizes[0], 100)
@@ -0,0 +1,194 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from ..models import Comment, Follow, Group, Post, PostRevision, User
+from ..purge import purge_deleted, queue_user_deletion
+from .test_images import SMALL_GIF
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+THUMBNAIL_ROOT = os.path.join(TEMP_MEDIA_ROOT, "thumbnails")
+
+
+def stored_files(root):
+    return [name for _, _, files in os.walk(root) for name in files]
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, THUMBNAIL_ROOT=THUMBNAIL_ROOT)
+class PurgeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="auth")
+        cls.reader = User.objects.create_user(username="reader")
+        cls.group = mixer.blend(Group, slug="group")
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.post = Post.objects.create(
+            author=self.user, text="Удаляемый", group=self.group
+        )
+
+    def create_image_post(self):
+        return Post.objects.create(
+            author=self.user,
+            text="С картинкой",
+            image=SimpleUploadedFile(
+                name="small.gif", content=SMALL_GIF, content_type="image/gif"
+            ),
+        )
+
+    def test_deleted_post_hidden_from_pages(self):
+        """Удаленный пост сразу пропадает из лент группы и автора и со
+        своей страницы.
+
+        Фрагмент ленты на главной живет по своему сроку, поэтому главная
+        проверяется отдельно.
+        """
+        anon = Client()
+        urls = (
+            reverse("posts:group_list", args=(self.group.slug,)),
+            reverse("posts:profile", args=(self.user.username,)),
+        )
+        for url in urls:
+            self.assertContains(anon.get(url), "Удаляемый")
+        response = self.client.post(
+            reverse("posts:post_delete", args=(self.post.pk,))
+        )
+        self.assertRedirects(
+            response, reverse("posts:profile", args=(self.user.username,))
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertNotContains(anon.get(url), "Удаляемый")
+        detail = reverse("posts:post_detail", args=(self.post.pk,))
+        self.assertEqual(anon.get(detail).status_code, 404)
+        self.assertTrue(Post.all_objects.filter(pk=self.post.pk).exists())
+        cache.clear()
+        self.assertNotContains(anon.get(reverse("posts:index")), "Удаляемый")
+
+    def test_only_author_deletes(self):
+        """Чужой пост удалить нельзя."""
+        other = Client()
+        other.force_login(self.reader)
+        other.post(reverse("posts:post_delete", args=(self.post.pk,)))
+        self.assertTrue(Post.objects.filter(pk=self.post.pk).exists())
+
+    def test_purge_respects_grace_period(self):
+        """Недавно удаленные посты хранятся до POSTS_PURGE_AFTER_DAYS."""
+        self.post.soft_delete()
+        self.assertEqual(purge_deleted(), (0, 0))
+        self.assertEqual(purge_deleted(days=0), (1, 0))
+        self.assertFalse(Post.all_objects.filter(pk=self.post.pk).exists())
+
+    def test_purge_removes_comments_revisions_and_files(self):
+        """Окончательное удаление убирает комментарии, ревизии, картинку
+        и миниатюру."""
+        post = self.create_image_post()
+        post.text = "Правка"
+        post.save()
+        Comment.objects.create(post=post, author=self.reader, text="К")
+        post.soft_delete()
+        out = StringIO()
+        call_command(
+            "purge_deleted", "--days", "0", "--batch-size", "1", stdout=out
+        )
+        self.assertIn("Удалено постов: 1, пользователей: 0", out.getvalue())
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(PostRevision.objects.exists())
+        self.assertFalse(default_storage.exists(post.image.name))
+        self.assertEqual(stored_files(THUMBNAIL_ROOT), [])
+
+    def test_comments_purged_in_batches(self):
+        """Комментарии удаляются своими пачками до поста."""
+        Comment.objects.bulk_create(
+            Comment(post=self.post, author=self.reader, text="К")
+            for _ in range(5)
+        )
+        self.post.soft_delete()
+        with CaptureQueriesContext(connection) as context:
+            purge_deleted(days=0, batch_size=2)
+        batches = [
+            query["sql"]
+            for query in context
+            if query["sql"].startswith('DELETE FROM "posts_comment"')
+            and '"id" IN' in query["sql"]
+        ]
+        self.assertEqual(len(batches), 3)
+        self.assertFalse(Comment.objects.exists())
+
+    def test_admin_lists_and_restores_deleted_posts(self):
+        """В админке видны удаленные посты, их можно восстановить."""
+        admin = Client()
+        admin.force_login(
+            User.objects.create_superuser(username="admin", password="pw")
+        )
+        self.post.soft_delete()
+        changelist = reverse("admin:posts_post_changelist")
+        self.assertContains(admin.get(changelist), "Удаляемый")
+        admin.post(
+            changelist,
+            {"action": "restore", "_selected_action": [self.post.pk]},
+        )
+        self.assertTrue(Post.objects.filter(pk=self.post.pk).exists())
+
+    def test_user_admin_has_no_cascade_delete(self):
+        """Пользователей удаляют только через очередь."""
+        admin = Client()
+        admin.force_login(
+            User.objects.create_superuser(username="admin", password="pw")
+        )
+        response = admin.get(reverse("admin:auth_user_changelist"))
+        form = response.context["action_form"]
+        actions = dict(form.fields["action"].choices)
+        self.assertNotIn("delete_selected", actions)
+        self.assertIn("queue_deletion", actions)
+        admin.post(
+            reverse("admin:auth_user_delete", args=(self.reader.pk,)),
+            {"post": "yes"},
+        )
+        self.assertFalse(User.objects.get(pk=self.reader.pk).is_active)
+
+    def test_shared_image_kept(self):
+        """Картинка, общая с другим постом, не удаляется."""
+        deleted, kept = self.create_image_post(), self.create_image_post()
+        self.assertEqual(deleted.image.name, kept.image.name)
+        deleted.soft_delete()
+        purge_deleted(days=0)
+        self.assertTrue(default_storage.exists(kept.image.name))
+
+    def test_user_deletion_in_batches(self):
+        """Удаление пользователя скрывает его посты сразу, а данные
+        удаляет команда."""
+        Post.objects.create(author=self.user, text="Второй")
+        Comment.objects.create(post=self.post, author=self.reader, text="К")
+        Follow.objects.create(user=self.reader, author=self.user)
+        Follow.objects.create(user=self.user, author=self.reader)
+        profile = reverse("posts:profile", args=(self.user.username,))
+        self.assertContains(Client().get(profile), "Второй")
+        queue_user_deletion(self.user)
+        self.assertFalse(Post.objects.filter(author=self.user).exists())
+        self.assertNotContains(Client().get(profile), "Второй")
+        self.assertEqual(purge_deleted(batch_size=1), (0, 1))
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(Post.all_objects.exists())
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(Follow.objects.exists())
@@ -0,0 +1,69 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from ..models import (Follow, FollowSuggestion, Group, Post,
+                      SuggestionRefresh, User)
+from ..recommendations import refresh_suggestions
+
+
+class FollowSuggestionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="user")
+        cls.neighbour = User.objects.create_user(username="neighbour")
+        cls.common = User.objects.create_user(username="common")
+        cls.candidate = User.objects.create_user(username="candidate")
+        cls.grouped = User.objects.create_user(username="grouped")
+        cls.group = mixer.blend(Group, slug="group")
+        Follow.objects.create(user=cls.user, author=cls.common)
+        Follow.objects.create(user=cls.neighbour, author=cls.common)
+        Follow.objects.create(user=cls.neighbour, author=cls.candidate)
+        Post.objects.create(author=cls.common, text="Текст", group=cls.group)
+        Post.objects.create(author=cls.grouped, text="Текст", group=cls.group)
+
+    def test_co_follow_and_group_scores(self):
+        """Кандидаты ранжируются по общим подпискам и группам."""
+        refresh_suggestions([self.user.pk])
+        authors = list(
+            FollowSuggestion.objects.filter(user=self.user)
+            .values_list("author__username", flat=True)
+        )
+        self.assertEqual(authors, ["candidate", "grouped"])
+
+    def test_follow_marks_user_stale(self):
+        """Смена подписок ставит пользователя в очередь пересчета."""
+        SuggestionRefresh.objects.all().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            Follow.objects.create(user=self.user, author=self.candidate)
+        self.assertTrue(
+            SuggestionRefresh.objects.filter(user=self.user).exists()
+        )
+        call_command("refresh_suggestions", stdout=StringIO())
+        self.assertFalse(SuggestionRefresh.objects.exists())
+        self.assertFalse(
+            FollowSuggestion.objects.filter(
+                user=self.user, author=self.candidate
+            ).exists()
+        )
+
+    def test_deleting_follower(self):
+        """Удаление подписчика не оставляет отметку о пересчете."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.neighbour.delete()
+        self.assertFalse(
+            SuggestionRefresh.objects.filter(user=self.neighbour).exists()
+        )
+        self.assertFalse(Follow.objects.filter(user=self.neighbour).exists())
+
+    def test_follow_index_shows_suggestions(self):
+        """Рекомендации выводятся на странице подписок."""
+        refresh_suggestions([self.user.pk])
+        client = Client()
+        client.force_login(self.user)
+        response = client.get(reverse("posts:follow_index"))
+        self.assertEqual(len(response.context["suggestions"]), 2)
+        self.assertContains(response, "На кого подписаться")
@@ -0,0 +1,93 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from ..models import Comment, Group, Post, PostRevision, User
+from ..revisions import apply_diff, history, text_diff
+
+LONG_TEXT = " ".join(f"слово{i}" for i in range(200))
+
+
+class RevisionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="auth")
+        cls.moderator = User.objects.create_user(
+            username="moderator", is_staff=True
+        )
+        cls.group = mixer.blend(Group, slug="group")
+
+    def setUp(self):
+        cache.clear()
+        self.post = Post.objects.create(author=self.user, text=LONG_TEXT)
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def edit(self, text, group=None):
+        return self.client.post(
+            reverse("posts:post_edit", args=(self.post.pk,)),
+            {"text": text, "group": group.pk if group else ""},
+        )
+
+    def test_diff_round_trip(self):
+        """Дифф восстанавливает прежний текст из нового."""
+        old, new = "один  два\nтри", "один три четыре"
+        self.assertEqual(apply_diff(new, text_diff(new, old)), old)
+
+    def test_edit_stores_small_diff(self):
+        """Правка увеличивает версию и хранит только замененный фрагмент."""
+        self.edit(LONG_TEXT.replace("слово5 ", "опечатка "))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.version, 2)
+        revision = self.post.revisions.get()
+        self.assertEqual(revision.version, 1)
+        self.assertEqual(revision.editor, self.user)
+        self.assertEqual(revision.changes, {"text": [[10, 11, "слово5"]]})
+
+    def test_save_without_changes_keeps_version(self):
+        """Сохранение без изменений не создает ревизию."""
+        self.edit(LONG_TEXT)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.version, 1)
+        self.assertFalse(PostRevision.objects.exists())
+
+    def test_history_restores_every_version(self):
+        """История восстанавливает текст и группу каждой версии."""
+        self.edit("Вторая версия", self.group)
+        self.edit("Третья версия", self.group)
+        self.post.refresh_from_db()
+        versions = history(self.post, self.post.revisions.all())
+        self.assertEqual(
+            [(v["version"], v["text"], v["group_id"]) for v in versions],
+            [
+                (3, "Третья версия", self.group.pk),
+                (2, "Вторая версия", self.group.pk),
+                (1, LONG_TEXT, None),
+            ],
+        )
+
+    def test_history_page_for_moderators(self):
+        """Историю видят только модераторы."""
+        self.edit("Вторая версия")
+        url = reverse("posts:post_history", args=(self.post.pk,))
+        self.assertEqual(self.client.get(url).status_code, 302)
+        moderator = Client()
+        moderator.force_login(self.moderator)
+        response = moderator.get(url)
+        self.assertContains(response, "Вторая версия")
+        self.assertContains(response, "слово199")
+
+    def test_post_detail_etag(self):
+        """Страница поста отвечает 304, пока не изменились пост и
+        комментарии."""
+        url = reverse("posts:post_detail", args=(self.post.pk,))
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        Comment.objects.create(post=self.post, author=self.user, text="К")
+        commented = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(commented.status_code, 200)
+        self.edit("Новый текст")
+        edited = self.client.get(url, HTTP_IF_NONE_MATCH=commented["ETag"])
+        self.assertContains(edited, "Новый текст")
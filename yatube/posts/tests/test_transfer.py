@@ -0,0 +1,143 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from mixer.backend.django import mixer
+
+from ..archive import archive_posts
+from ..models import (ArchivedComment, ArchivedPost, Comment, Follow, Group,
+                      Post, User)
+from .test_images import SMALL_GIF
+
+
+class TransferTestsMixin:
+    def create_data(self):
+        self.author = User.objects.create_user(username="author")
+        self.reader = User.objects.create_user(username="reader")
+        self.group = mixer.blend(Group, slug="group")
+        self.post = Post.objects.create(
+            author=self.author, text="Текст", group=self.group
+        )
+        self.old_date = timezone.now() - timedelta(days=100)
+        Post.objects.filter(pk=self.post.pk).update(pub_date=self.old_date)
+        Comment.objects.create(
+            post=self.post, author=self.reader, text="Комментарий"
+        )
+        Follow.objects.create(user=self.reader, author=self.author)
+
+    def round_trip(self, *import_args):
+        path = os.path.join(self.temp_dir, "dump.jsonl")
+        call_command("export_posts", path, stdout=StringIO())
+        for model in (Follow, Comment, Post, Group, User):
+            model._base_manager.all().delete()
+        out = StringIO()
+        call_command("import_posts", path, *import_args, stdout=out)
+        return out.getvalue()
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.create_data()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+
+class TransferTests(TransferTestsMixin, TestCase):
+    def test_round_trip_preserves_rows_and_dates(self):
+        """Выгрузка и загрузка сохраняют строки, связи и даты."""
+        output = self.round_trip("--chunk-size", "1")
+        self.assertIn("Всего: 6 строк", output)
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(post.pub_date, self.old_date)
+        self.assertEqual(post.group.slug, "group")
+        self.assertEqual(post.comments.get().author.username, "reader")
+        self.assertTrue(
+            Follow.objects.filter(user__username="reader").exists()
+        )
+
+    def test_round_trip_keeps_deleted_posts(self):
+        """Удаленный пост выгружается вместе с комментариями и правками."""
+        self.post.text = "Правка"
+        self.post.save()
+        self.post.soft_delete()
+        self.round_trip()
+        post = Post.all_objects.get(pk=self.post.pk)
+        self.assertIsNotNone(post.deleted_at)
+        self.assertEqual(post.revisions.count(), 1)
+        self.assertEqual(Comment.objects.filter(post=post).count(), 1)
+
+    def test_round_trip_keeps_archive(self):
+        """Архивные посты и комментарии переносятся вместе с остальными."""
+        archive_posts(days=30)
+        self.round_trip()
+        archived = ArchivedPost.objects.get(pk=self.post.pk)
+        self.assertEqual(archived.pub_date, self.old_date)
+        self.assertEqual(
+            ArchivedComment.objects.get().post_id, self.post.pk
+        )
+        self.assertFalse(Post.all_objects.exists())
+
+    def test_round_trip_keeps_image_files(self):
+        """Картинка из выгрузки ложится точно по имени из поля image."""
+        media_root = os.path.join(self.temp_dir, "media")
+        media_dir = os.path.join(self.temp_dir, "dump-media")
+        with override_settings(
+            MEDIA_ROOT=media_root,
+            THUMBNAIL_ROOT=os.path.join(media_root, "thumbnails"),
+        ):
+            post = Post.objects.create(
+                author=self.author,
+                text="С картинкой",
+                image=SimpleUploadedFile(
+                    "small.gif", SMALL_GIF, content_type="image/gif"
+                ),
+            )
+            name = post.image.name
+            path = os.path.join(self.temp_dir, "dump.jsonl")
+            call_command(
+                "export_posts", path, "--media-dir", media_dir,
+                stdout=StringIO(),
+            )
+            shutil.rmtree(media_root)
+            for model in (Follow, Comment, Post, Group, User):
+                model._base_manager.all().delete()
+            call_command(
+                "import_posts", path, "--media-dir", media_dir,
+                stdout=StringIO(),
+            )
+            self.assertEqual(Post.objects.get(pk=post.pk).image.name, name)
+            self.assertTrue(default_storage.exists(name))
+            response = self.client.get(settings.MEDIA_URL + name)
+            self.assertEqual(response.status_code, 200)
+
+    def test_imported_ids_do_not_clash_with_new_rows(self):
+        """После загрузки новые записи получают свободные id."""
+        self.round_trip()
+        post = Post.objects.create(author=self.author, text="Новый")
+        self.assertGreater(post.pk, self.post.pk)
+
+
+class DeferredIndexTransferTests(TransferTestsMixin, TransactionTestCase):
+    def test_import_with_deferred_indexes(self):
+        """Загрузка с отложенными индексами восстанавливает индексы."""
+        self.round_trip("--defer-indexes")
+        self.assertEqual(Post.objects.count(), 1)
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, "posts_post"
+            )
+        self.assertTrue(
+            any(
+                value["index"] and value["columns"] == ["pub_date"]
+                for value in constraints.values()
+            )
+        )
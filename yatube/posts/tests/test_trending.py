@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from mixer.backend.django import mixer
+
+from ..models import Comment, Follow, Group, Post, Ranking, User
+from ..trending import (POSTS_SCOPE, compute_rankings, group_scope,
+                        update_rankings)
+
+
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username="author")
+        cls.reader = User.objects.create_user(username="reader")
+        cls.group = mixer.blend(Group, slug="group")
+        cls.quiet = Post.objects.create(author=cls.author, text="Тихий")
+        cls.popular = Post.objects.create(
+            author=cls.author, text="Популярный", group=cls.group
+        )
+        for _ in range(3):
+            Comment.objects.create(
+                post=cls.popular, author=cls.reader, text="Комментарий"
+            )
+        Comment.objects.create(
+            post=cls.quiet, author=cls.reader, text="Комментарий"
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_rankings_order_by_engagement(self):
+        """Пост с большим числом свежих комментариев выше в рейтинге."""
+        rankings = compute_rankings()
+        self.assertEqual(
+            rankings[POSTS_SCOPE], [self.popular.pk, self.quiet.pk]
+        )
+        self.assertEqual(
+            rankings[group_scope(self.group.pk)], [self.popular.pk]
+        )
+
+    def test_old_engagement_decays(self):
+        """Вклад комментариев затухает со временем."""
+        Comment.objects.filter(post=self.popular).update(
+            pub_date=timezone.now() - timedelta(days=3)
+        )
+        rankings = compute_rankings()
+        self.assertEqual(rankings[POSTS_SCOPE][0], self.quiet.pk)
+
+    def test_new_follow_counts_for_author_posts(self):
+        """Новые подписки на автора поднимают его свежие посты."""
+        other = Post.objects.create(author=self.reader, text="Другой")
+        Follow.objects.create(user=self.author, author=self.reader)
+        self.assertIn(other.pk, compute_rankings()[POSTS_SCOPE])
+
+    def test_trending_page_reads_stored_ranking(self):
+        """Страница популярного читает сохраненный рейтинг."""
+        update_rankings()
+        self.assertTrue(Ranking.objects.filter(scope=POSTS_SCOPE).exists())
+        cache.clear()
+        response = Client().get(reverse("posts:trending"))
+        self.assertEqual(
+            list(response.context["page_obj"]), [self.popular, self.quiet]
+        )
+        response = Client().get(
+            reverse("posts:group_trending", args=(self.group.slug,))
+        )
+        self.assertEqual(list(response.context["page_obj"]), [self.popular])
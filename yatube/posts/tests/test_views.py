@@ -1,3 +1,4 @@
+import os
 import shutil
 import tempfile
 
@@ -15,7 +16,10 @@ from ..models import Follow, Group, Post, User
 TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
 
 
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+@override_settings(
+    MEDIA_ROOT=TEMP_MEDIA_ROOT,
+    THUMBNAIL_ROOT=os.path.join(TEMP_MEDIA_ROOT, "thumbnails"),
+)
 class PostViewsTests(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -0,0 +1,216 @@
+"""Потоковый перенос данных между окружениями в формате JSON Lines.
+
+Каждая строка файла — одна запись вида {"model": ..., "fields": {...}}.
+Модели выгружаются в порядке зависимостей, поэтому при загрузке
+внешние ключи всегда ссылаются на уже вставленные строки.
+"""
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from datetime import datetime
+
+from django.core.files.storage import default_storage
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils.dateparse import parse_datetime
+
+from .models import (ArchivedComment, ArchivedPost, ArchivedPostRevision,
+                     Comment, Follow, Group, Post, PostRevision, User)
+
+EXPORT_MODELS = {
+    "user": (
+        User,
+        (
+            "id", "username", "password", "first_name", "last_name",
+            "email", "is_staff", "is_active", "is_superuser",
+            "date_joined", "last_login",
+        ),
+    ),
+    "group": (Group, ("id", "title", "slug", "description")),
+    "post": (
+        Post,
+        (
+            "id", "text", "author_id", "group_id", "image", "image_width",
+            "image_height", "image_hash", "thumbnail_url", "pub_date",
+            "updated_at", "version", "deleted_at",
+        ),
+    ),
+    "revision": (
+        PostRevision,
+        ("id", "post_id", "version", "changes", "editor_id", "pub_date"),
+    ),
+    "comment": (
+        Comment, ("id", "post_id", "author_id", "text", "pub_date")
+    ),
+    "follow": (Follow, ("id", "user_id", "author_id", "created")),
+    "archived_post": (
+        ArchivedPost,
+        (
+            "id", "text", "author_id", "group_id", "image", "image_width",
+            "image_height", "image_hash", "thumbnail_url", "pub_date",
+            "updated_at", "version",
+        ),
+    ),
+    "archived_revision": (
+        ArchivedPostRevision,
+        ("id", "post_id", "version", "changes", "editor_id", "pub_date"),
+    ),
+    "archived_comment": (
+        ArchivedComment, ("id", "post_id", "author_id", "text", "pub_date")
+    ),
+}
+DATETIME_FIELDS = {
+    "date_joined", "last_login", "pub_date", "created", "updated_at",
+    "deleted_at",
+}
+
+
+class TransferEncoder(DjangoJSONEncoder):
+    """Сохраняет даты с микросекундами, чтобы не терять точность."""
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def export_rows(stream, chunk_size, media_dir=None):
+    """Пишет все записи в поток, не загружая таблицы в память.
+
+    Возвращает словарь с количеством выгруженных строк по моделям.
+    """
+    counts = {}
+    for label, (model, fields) in EXPORT_MODELS.items():
+        counts[label] = 0
+        # Удаленные посты тоже выгружаются: на них ссылаются комментарии
+        # и ревизии, а удалит их purge_deleted.
+        rows = model._base_manager.order_by("pk").values(*fields)
+        for row in rows.iterator(chunk_size=chunk_size):
+            stream.write(
+                json.dumps(
+                    {"model": label, "fields": row},
+                    cls=TransferEncoder,
+                    ensure_ascii=False,
+                )
+                + "\n"
+            )
+            if media_dir and row.get("image"):
+                copy_to_dir(row["image"], media_dir)
+            counts[label] += 1
+    return counts
+
+
+def copy_to_dir(name, media_dir):
+    """Копирует файл из хранилища медиа в каталог выгрузки."""
+    target = os.path.join(media_dir, name)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if not default_storage.exists(name):
+        return
+    with default_storage.open(name) as source, open(target, "wb") as dest:
+        shutil.copyfileobj(source, dest)
+
+
+def copy_from_dir(name, media_dir):
+    """Сохраняет файл из каталога выгрузки в хранилище медиа."""
+    source = os.path.join(media_dir, name)
+    if os.path.exists(source) and not default_storage.exists(name):
+        with open(source, "rb") as content:
+            default_storage.save(name, content)
+
+
+@contextmanager
+def preserve_auto_now(*models):
+    """Отключает auto_now и auto_now_add, чтобы сохранить даты из
+    выгрузки."""
+    flags = [
+        (field, flag)
+        for model in models
+        for field in model._meta.concrete_fields
+        for flag in ("auto_now", "auto_now_add")
+        if getattr(field, flag, False)
+    ]
+    for field, flag in flags:
+        setattr(field, flag, False)
+    try:
+        yield
+    finally:
+        for field, flag in flags:
+            setattr(field, flag, True)
+
+
+@contextmanager
+def deferred_indexes(*models):
+    """Удаляет индексы по обычным полям на время загрузки и
+    создает их заново в конце одним проходом."""
+    altered = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if field.db_index and not field.is_relation and not field.unique:
+                plain = field.clone()
+                plain.db_index = False
+                plain.set_attributes_from_name(field.name)
+                plain.model = model
+                altered.append((model, field, plain))
+    with connection.schema_editor() as editor:
+        for model, field, plain in altered:
+            editor.alter_field(model, field, plain)
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as editor:
+            for model, field, plain in altered:
+                editor.alter_field(model, plain, field)
+
+
+def _build(label, fields):
+    model, _ = EXPORT_MODELS[label]
+    for name in DATETIME_FIELDS & set(fields):
+        if fields[name]:
+            fields[name] = parse_datetime(fields[name])
+    return model(**fields)
+
+
+def _flush(label, batch):
+    model, _ = EXPORT_MODELS[label]
+    with transaction.atomic():
+        model.objects.bulk_create(batch)
+
+
+def import_rows(stream, chunk_size, media_dir=None):
+    """Загружает записи из потока пачками по chunk_size строк.
+
+    Каждая пачка вставляется одним bulk_create в своей транзакции.
+    Возвращает словарь с количеством загруженных строк по моделям.
+    """
+    counts = {label: 0 for label in EXPORT_MODELS}
+    label, batch = None, []
+    with preserve_auto_now(Post, PostRevision, Comment, Follow):
+        for line in stream:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if batch and (
+                record["model"] != label or len(batch) >= chunk_size
+            ):
+                _flush(label, batch)
+                batch = []
+            label = record["model"]
+            batch.append(_build(label, record["fields"]))
+            if media_dir and record["fields"].get("image"):
+                copy_from_dir(record["fields"]["image"], media_dir)
+            counts[label] += 1
+        if batch:
+            _flush(label, batch)
+    reset_sequences()
+    return counts
+
+
+def reset_sequences():
+    """Сдвигает счетчики первичных ключей после вставки с явными id."""
+    models = [model for model, _ in EXPORT_MODELS.values()]
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
@@ -0,0 +1,115 @@
+"""Рейтинг популярных постов с затуханием по времени.
+
+Вес поста — сумма вкладов свежих комментариев и новых подписок на автора,
+каждый вклад затухает вдвое за TRENDING_HALF_LIFE_HOURS. Рейтинг
+рассчитывается периодически командой update_trending и хранится в виде
+списка идентификаторов, поэтому страница популярного читается одним
+запросом к кешу или к таблице Ranking.
+"""
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .constants import (TRENDING_CACHE_TIMEOUT, TRENDING_FOLLOW_WEIGHT,
+                        TRENDING_HALF_LIFE_HOURS, TRENDING_SIZE,
+                        TRENDING_WINDOW_DAYS)
+from .models import Comment, Follow, Post, Ranking
+from .utils import page_list
+
+POSTS_SCOPE = "posts"
+
+
+def group_scope(group_id):
+    return f"group:{group_id}"
+
+
+def _cache_key(scope):
+    return f"trending:{scope}"
+
+
+def _decay(moment, now):
+    hours = (now - moment).total_seconds() / 3600
+    return 0.5 ** (hours / TRENDING_HALF_LIFE_HOURS)
+
+
+def compute_rankings(now=None):
+    """Считает рейтинги: общий и для каждой группы."""
+    now = now or timezone.now()
+    since = now - timedelta(days=TRENDING_WINDOW_DAYS)
+    post_scores = Counter()
+    comments = Comment.objects.filter(pub_date__gte=since)
+    for post_id, pub_date in comments.values_list("post_id", "pub_date"):
+        post_scores[post_id] += _decay(pub_date, now)
+    author_scores = Counter()
+    follows = Follow.objects.filter(created__gte=since)
+    for author_id, created in follows.values_list("author_id", "created"):
+        author_scores[author_id] += TRENDING_FOLLOW_WEIGHT * _decay(
+            created, now
+        )
+    candidates = Post.objects.filter(
+        Q(pk__in=list(post_scores))
+        | Q(author_id__in=list(author_scores), pub_date__gte=since)
+    ).values_list("pk", "author_id", "group_id")
+    scored = sorted(
+        (
+            (post_scores[pk] + author_scores[author_id], pk, group_id)
+            for pk, author_id, group_id in candidates
+        ),
+        reverse=True,
+    )
+    rankings = defaultdict(list)
+    for _, pk, group_id in scored:
+        rankings[POSTS_SCOPE].append(pk)
+        if group_id is not None:
+            rankings[group_scope(group_id)].append(pk)
+    return {
+        scope: post_ids[:TRENDING_SIZE]
+        for scope, post_ids in rankings.items()
+    }
+
+
+def update_rankings(now=None):
+    """Пересчитывает рейтинги и сохраняет их в базу и кеш."""
+    rankings = compute_rankings(now)
+    with transaction.atomic():
+        Ranking.objects.exclude(scope__in=list(rankings)).delete()
+        for scope, post_ids in rankings.items():
+            Ranking.objects.update_or_create(
+                scope=scope, defaults={"post_ids": post_ids}
+            )
+    cache.delete_many([_cache_key(scope) for scope in rankings])
+    cache.set_many(
+        {_cache_key(scope): ids for scope, ids in rankings.items()},
+        TRENDING_CACHE_TIMEOUT,
+    )
+    return rankings
+
+
+def get_ranking(scope):
+    """Возвращает список идентификаторов постов рейтинга."""
+    post_ids = cache.get(_cache_key(scope))
+    if post_ids is None:
+        post_ids = (
+            Ranking.objects.filter(scope=scope)
+            .values_list("post_ids", flat=True)
+            .first()
+        ) or []
+        cache.set(_cache_key(scope), post_ids, TRENDING_CACHE_TIMEOUT)
+    return post_ids
+
+
+def ranked_page(scope, request):
+    """Страница рейтинга: пагинация по списку id и выборка только постов
+    текущей страницы."""
+    page_obj = page_list(get_ranking(scope), request)
+    posts = Post.objects.select_related("author", "group").in_bulk(
+        page_obj.object_list
+    )
+    page_obj.object_list = [
+        posts[pk] for pk in page_obj.object_list if pk in posts
+    ]
+    return page_obj
@@ -6,11 +6,18 @@ app_name = "posts"
 
 urlpatterns = [
     path("", views.index, name="index"),
+    path("trending/", views.trending, name="trending"),
     path("group/<slug:slug>/", views.group_posts, name="group_list"),
+    path("group/<slug:slug>/trending/",
+         views.group_trending, name="group_trending"),
     path("profile/<str:username>/", views.profile, name="profile"),
     path("posts/<int:post_id>/", views.post_detail, name="post_detail"),
     path("create/", views.post_create, name="post_create"),
     path("posts/<int:post_id>/edit/", views.post_edit, name="post_edit"),
+    path("posts/<int:post_id>/delete/",
+         views.post_delete, name="post_delete"),
+    path("posts/<int:post_id>/history/",
+         views.post_history, name="post_history"),
     path("posts/<int:post_id>/comment/",
          views.add_comment, name="add_comment"),
     path("follow/", views.follow_index, name="follow_index"),
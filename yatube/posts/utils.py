@@ -1,9 +1,58 @@
-from django.core.paginator import Paginator
+from core.cache import cache_fill, namespace_versions
+from core.paginator import COUNT_CACHE_TIMEOUT, FeedPaginator
 from posts.constants import TEN_POSTS
 
 
 def page_list(queryset, request):
     """Функция создания нумерации страниц"""
-    paginator = Paginator(queryset, TEN_POSTS)
+    paginator = FeedPaginator(queryset, TEN_POSTS)
     page_number = request.GET.get("page")
     return paginator.get_page(page_number)
+
+
+class ChainedQuerySets:
+    """Последовательность из нескольких выборок, идущих друг за другом.
+
+    Позволяет листать основную и архивную таблицы одним пагинатором:
+    срез запрашивает у каждой выборки только попавшую в него часть.
+    С namespace размеры выборок кешируются в этом пространстве имен и
+    пересчитываются после его сброса.
+    """
+
+    def __init__(self, *querysets, namespace=None):
+        self.querysets = querysets
+        self.namespace = namespace
+        self._counts = None
+
+    def _count_all(self):
+        return [queryset.count() for queryset in self.querysets]
+
+    def counts(self):
+        if self._counts is None and self.namespace:
+            (version,) = namespace_versions([self.namespace])
+            self._counts = cache_fill(
+                f"count:{self.namespace}:{version}",
+                self._count_all,
+                COUNT_CACHE_TIMEOUT,
+            )
+        elif self._counts is None:
+            self._counts = self._count_all()
+        return self._counts
+
+    def count(self):
+        return sum(self.counts())
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop, _ = index.indices(self.count())
+        result = []
+        for queryset, size in zip(self.querysets, self.counts()):
+            if start < size and stop > 0:
+                result += list(queryset[max(start, 0):min(stop, size)])
+            start -= size
+            stop -= size
+        return result
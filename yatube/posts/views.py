@@ -1,11 +1,24 @@
+from core.cache import cache_anonymous
+from core.media import clean_name, serve_file
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
+from django.core.files.storage import default_storage
+from django.db.models import Count, Max
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import condition, require_POST
 
+from .constants import (GROUP_CACHE_TIMEOUT, INDEX_CACHE_TIMEOUT,
+                        PROFILE_CACHE_TIMEOUT, SUGGESTIONS_TOP_K)
 from .forms import CommentForm, PostForm
-from .models import Comment, Follow, Group, Post, User
-from .utils import page_list
+from .models import ArchivedPost, Comment, Follow, Group, Post, User
+from .revisions import history
+from .trending import POSTS_SCOPE, group_scope, ranked_page
+from .utils import ChainedQuerySets, page_list
 
 
+@cache_anonymous(INDEX_CACHE_TIMEOUT, lambda: ["index"], params=("page",))
 def index(request):
     """Выводит шаблон главной страницы."""
     page_obj = page_list(
@@ -14,6 +27,9 @@ def index(request):
     return render(request, "posts/index.html", context)
 
 
+@cache_anonymous(
+    GROUP_CACHE_TIMEOUT, lambda slug: [f"group:{slug}"], params=("page",)
+)
 def group_posts(request, slug):
     """Выводит шаблон с группами постов."""
     group = get_object_or_404(Group, slug=slug)
@@ -26,10 +42,36 @@ def group_posts(request, slug):
     return render(request, "posts/group_list.html", context)
 
 
+def trending(request):
+    """Выводит шаблон популярных постов."""
+    context = {"page_obj": ranked_page(POSTS_SCOPE, request)}
+    return render(request, "posts/trending.html", context)
+
+
+def group_trending(request, slug):
+    """Выводит шаблон популярных постов группы."""
+    group = get_object_or_404(Group, slug=slug)
+    context = {
+        "group": group,
+        "page_obj": ranked_page(group_scope(group.pk), request),
+    }
+    return render(request, "posts/trending.html", context)
+
+
+@cache_anonymous(
+    PROFILE_CACHE_TIMEOUT,
+    lambda username: [f"profile:{username}"],
+    params=("page",),
+)
 def profile(request, username):
     """Выводит шаблон профайла пользователя."""
     author = get_object_or_404(User, username=username)
-    page_obj = page_list(author.posts.all(), request)
+    posts = ChainedQuerySets(
+        author.posts.select_related("group"),
+        author.archived_posts.select_related("group"),
+        namespace=f"profile:{username}",
+    )
+    page_obj = page_list(posts, request)
     following = request.user.is_authenticated and (
         request.user.follower.filter(author=author))
     context = {
@@ -40,18 +82,45 @@ def profile(request, username):
     return render(request, "posts/profile.html", context)
 
 
+def post_etag(request, post_id):
+    """ETag страницы поста из его версии, комментариев и пользователя.
+
+    Считается одним запросом без рендера. Счетчик постов автора в ETag не
+    входит и может отставать, пока не изменится пост или комментарии.
+    """
+    row = (
+        Post.objects.filter(pk=post_id)
+        .annotate(comment_count=Count("comments"), last=Max("comments__pk"))
+        .values_list("version", "comment_count", "last")
+        .first()
+    )
+    if row is None:
+        return None
+    return "{}.{}.{}.{}.{}".format(post_id, *row, request.user.pk or 0)
+
+
+@condition(etag_func=post_etag)
 def post_detail(request, post_id):
     """Выводит шаблон информации поста."""
-    post = get_object_or_404(
-        Post.objects.select_related("author", "group"), pk=post_id)
-    author_posts = post.author.posts.all().count()
+    post = Post.objects.select_related("author", "group").filter(
+        pk=post_id).first()
+    archived = post is None
+    if archived:
+        post = get_object_or_404(
+            ArchivedPost.objects.select_related("author", "group"),
+            pk=post_id)
+        comments = post.comments.select_related("author")
+    else:
+        comments = Comment.objects.filter(post=post)
+    author_posts = (post.author.posts.count()
+                    + post.author.archived_posts.count())
     comments_form = CommentForm(request.POST)
-    comments = Comment.objects.filter(post=post)
     context = {
         "post": post,
         "comments_form": comments_form,
         "comments": comments,
         "author_posts": author_posts,
+        "archived": archived,
     }
     return render(request, "posts/post_detail.html", context)
 
@@ -83,7 +152,7 @@ def post_edit(request, post_id):
         instance=post,
     )
     if form.is_valid():
-        form.save()
+        form.save(commit=False).save(editor=request.user)
         return redirect("posts:post_detail", post_id)
     context = {"post": post,
                "form": form,
@@ -92,6 +161,37 @@ def post_edit(request, post_id):
     return render(request, "posts/create_post.html", context)
 
 
+@login_required
+@require_POST
+def post_delete(request, post_id):
+    """Удаляет пост автора: пост сразу пропадает из лент, а записи и
+    файлы удаляет команда purge_deleted."""
+    post = get_object_or_404(Post, pk=post_id)
+    if post.author != request.user:
+        return redirect("posts:post_detail", post_id)
+    post.soft_delete()
+    return redirect("posts:profile", request.user.username)
+
+
+@staff_member_required
+def post_history(request, post_id):
+    """Выводит шаблон истории правок поста для модераторов."""
+    post = Post.objects.select_related("author").filter(pk=post_id).first()
+    if post is None:
+        post = get_object_or_404(
+            ArchivedPost.objects.select_related("author"), pk=post_id
+        )
+    revisions = post.revisions.select_related("editor")
+    versions = history(post, revisions)
+    groups = Group.objects.in_bulk(
+        {version["group_id"] for version in versions} - {None}
+    )
+    for version in versions:
+        version["group"] = groups.get(version["group_id"])
+    context = {"post": post, "versions": versions}
+    return render(request, "posts/post_history.html", context)
+
+
 @login_required
 def add_comment(request, post_id):
     """Вывод шаблон добавления поста."""
@@ -110,7 +210,14 @@ def follow_index(request):
     page_obj = page_list(
         Post.objects.filter(author__following__user=request.user), request
     )
-    context = {"page_obj": page_obj}
+    suggestions = request.user.suggestions.select_related("author")
+    context = {
+        "page_obj": page_obj,
+        "suggestions": suggestions[:SUGGESTIONS_TOP_K],
+        # Лента подписок у каждого своя: владелец входит в ключ
+        # кешированного фрагмента, унаследованного от index.html.
+        "feed_owner": request.user.pk,
+    }
     return render(request, "posts/follow.html", context)
 
 
@@ -133,3 +240,35 @@ def profile_unfollow(request, username):
     if follower.exists():
         follower.delete()
     return redirect("posts:profile", author.username)
+
+
+def media(request, name):
+    """Отдает картинку, если она принадлежит посту."""
+    name = clean_name(name)
+    for model in (Post, ArchivedPost):
+        image_hash = model.objects.filter(image=name).values_list(
+            "image_hash", flat=True
+        )[:1]
+        if image_hash:
+            return serve_file(
+                request,
+                default_storage,
+                name,
+                settings.MEDIA_ACCEL_PREFIX,
+                image_hash[0],
+            )
+    raise Http404("Файл не найден")
+
+
+def thumbnail(request, name):
+    """Отдает миниатюру sorl-thumbnail, если она принадлежит посту."""
+    from sorl.thumbnail.default import storage
+
+    name = clean_name(name)
+    url = settings.THUMBNAIL_URL + name
+    for model in (Post, ArchivedPost):
+        if model.objects.filter(thumbnail_url=url).exists():
+            return serve_file(
+                request, storage, name, settings.THUMBNAIL_ACCEL_PREFIX
+            )
+    raise Http404("Файл не найден")
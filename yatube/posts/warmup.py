@@ -0,0 +1,101 @@
+"""Прогрев кеша ответов для анонимов.
+
+Самые посещаемые страницы — первые страницы ленты, активные группы и
+профили с большим числом подписчиков — рендерятся заранее через те же
+представления с cache_anonymous, поэтому первые посетители после
+запуска или сброса кеша не ждут рендера. Страницы обходятся пулом
+потоков ограниченного размера, чтобы прогрев не занял все соединения с
+БД.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from core import metrics
+from django.contrib.auth.models import AnonymousUser
+from django.db import connections
+from django.db.models import Count, Q
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from .constants import (TRENDING_WINDOW_DAYS, WARM_CONCURRENCY, WARM_GROUPS,
+                        WARM_INDEX_PAGES, WARM_PROFILES)
+from .models import Group, User
+
+
+def hot_paths(pages=WARM_INDEX_PAGES, groups=WARM_GROUPS,
+              profiles=WARM_PROFILES):
+    """Адреса страниц для прогрева, самые посещаемые первыми."""
+    index = reverse("posts:index")
+    paths = [
+        f"{index}?page={page}" if page > 1 else index
+        for page in range(1, pages + 1)
+    ]
+    since = timezone.now() - timedelta(days=TRENDING_WINDOW_DAYS)
+    slugs = (
+        Group.objects.annotate(
+            recent=Count(
+                "posts",
+                filter=Q(
+                    posts__pub_date__gte=since, posts__deleted_at__isnull=True
+                ),
+            )
+        )
+        .filter(recent__gt=0)
+        .order_by("-recent")
+        .values_list("slug", flat=True)[:groups]
+    )
+    paths += [reverse("posts:group_list", args=(slug,)) for slug in slugs]
+    usernames = (
+        User.objects.annotate(followers=Count("following"))
+        .order_by("-followers", "pk")
+        .values_list("username", flat=True)[:profiles]
+    )
+    paths += [
+        reverse("posts:profile", args=(username,)) for username in usernames
+    ]
+    return paths
+
+
+def render_anonymous(path):
+    """Рендерит страницу для анонима, минуя middleware."""
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    match = resolve(request.path_info)
+    return match.func(request, *match.args, **match.kwargs).status_code
+
+
+def _render_in_thread(path):
+    try:
+        return render_anonymous(path)
+    finally:
+        connections.close_all()
+
+
+def warm_pages(paths, concurrency=WARM_CONCURRENCY):
+    """Заполняет кеш ответов для paths.
+
+    Возвращает число заполненных записей и затраченное время в секундах.
+    Свежие записи не пересчитываются и в число заполненных не входят.
+    При concurrency = 1 страницы рендерятся по очереди в текущем потоке.
+    """
+    started = time.monotonic()
+    before = metrics.snapshot().get("response_cache.fill", 0)
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(_render_in_thread, paths))
+    else:
+        for path in paths:
+            render_anonymous(path)
+    filled = metrics.snapshot().get("response_cache.fill", 0) - before
+    return filled, time.monotonic() - started
+
+
+def warm_page_cache():
+    """Хук SERVER_WARMUP: прогревает страницы с настройками по умолчанию.
+
+    Возвращает число заполненных записей.
+    """
+    filled, _ = warm_pages(hot_paths())
+    return filled
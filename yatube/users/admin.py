@@ -0,0 +1,18 @@
+from django.contrib import admin
+
+from .models import Contact
+
+
+@admin.action(description="Отметить как отвеченные")
+def mark_answered(modeladmin, request, queryset):
+    queryset.update(is_answered=True)
+
+
+@admin.register(Contact)
+class ContactAdmin(admin.ModelAdmin):
+    list_display = ("subject", "name", "email", "created", "is_answered")
+    list_filter = ("is_answered",)
+    search_fields = ("subject", "body")
+    date_hierarchy = "created"
+    actions = (mark_answered,)
+    show_full_result_count = False
@@ -0,0 +1,49 @@
+"""Кеширование пользователя между запросами.
+
+Пользователь сессии хранится в общем кеше с коротким сроком жизни, поэтому
+страницы авторизованных пользователей не читают строку User на каждый
+запрос. Хеш сессии сверяется с кешированным пользователем так же, как это
+делает django.contrib.auth, а запись сбрасывается при сохранении
+пользователя (в том числе смене пароля) и при выходе.
+"""
+from django.contrib import auth
+from django.contrib.auth import HASH_SESSION_KEY, SESSION_KEY
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+
+USER_CACHE_TIMEOUT = 60
+
+
+def user_cache_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def forget_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+def _from_cache(request):
+    user_id = request.session.get(SESSION_KEY)
+    if user_id is None:
+        return None
+    user = cache.get(user_cache_key(user_id))
+    if user is None:
+        return None
+    session_hash = request.session.get(HASH_SESSION_KEY)
+    if not session_hash or not constant_time_compare(
+        session_hash, user.get_session_auth_hash()
+    ):
+        return None
+    return user
+
+
+def get_cached_user(request):
+    """Возвращает пользователя запроса, по возможности из кеша."""
+    if not hasattr(request, "_cached_user"):
+        user = _from_cache(request)
+        if user is None:
+            user = auth.get_user(request)
+            if user.is_authenticated:
+                cache.set(user_cache_key(user.pk), user, USER_CACHE_TIMEOUT)
+        request._cached_user = user
+    return request._cached_user
@@ -0,0 +1,56 @@
+"""Выборки для разбора обращений: курсорная пагинация и поиск.
+
+Курсор — дата и id последнего показанного обращения, поэтому каждая
+страница читается по индексу без OFFSET и без COUNT(*).
+"""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from .models import Contact
+
+INBOX_PAGE_SIZE = 50
+
+
+def encode_cursor(contact):
+    raw = f"{contact.created.isoformat()}|{contact.pk}"
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Возвращает (дата, id) из курсора или None для неверного курсора."""
+    try:
+        created, pk = urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return parse_datetime(created), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def inbox_page(query="", answered=None, cursor=None,
+               page_size=INBOX_PAGE_SIZE):
+    """Страница обращений и курсор следующей страницы."""
+    contacts = Contact.objects.all()
+    if answered is not None:
+        contacts = contacts.filter(is_answered=answered)
+    if query:
+        contacts = contacts.filter(
+            Q(subject__icontains=query) | Q(body__icontains=query)
+        )
+    position = decode_cursor(cursor) if cursor else None
+    if position and position[0]:
+        created, pk = position
+        contacts = contacts.filter(
+            Q(created__lt=created) | Q(created=created, pk__lt=pk)
+        )
+    page = list(contacts.order_by("-created", "-id")[:page_size + 1])
+    next_cursor = None
+    if len(page) > page_size:
+        page = page[:page_size]
+        next_cursor = encode_cursor(page[-1])
+    return page, next_cursor
+
+
+def mark_answered(ids):
+    """Отмечает обращения отвеченными одним UPDATE."""
+    return Contact.objects.filter(pk__in=ids).update(is_answered=True)
@@ -0,0 +1,45 @@
+# Generated by Django 4.2 on 2026-10-19 18:42
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="contact",
+            options={
+                "ordering": ("-created", "-id"),
+                "verbose_name": "Обращение",
+                "verbose_name_plural": "Обращения",
+            },
+        ),
+        migrations.AddField(
+            model_name="contact",
+            name="created",
+            field=models.DateTimeField(
+                auto_now_add=True,
+                default=django.utils.timezone.now,
+                verbose_name="Дата обращения",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name="contact",
+            index=models.Index(
+                fields=["is_answered", "-created", "-id"],
+                name="contact_inbox_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="contact",
+            index=models.Index(
+                fields=["-created", "-id"], name="contact_created_idx"
+            ),
+        ),
+    ]
@@ -7,3 +7,21 @@ class Contact(models.Model):
     subject = models.CharField(max_length=100)
     body = models.TextField()
     is_answered = models.BooleanField(default=False)
+    created = models.DateTimeField("Дата обращения", auto_now_add=True)
+
+    class Meta:
+        ordering = ("-created", "-id")
+        verbose_name = "Обращение"
+        verbose_name_plural = "Обращения"
+        indexes = [
+            models.Index(
+                fields=("is_answered", "-created", "-id"),
+                name="contact_inbox_idx",
+            ),
+            models.Index(
+                fields=("-created", "-id"), name="contact_created_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return self.subject
@@ -0,0 +1,111 @@
+"""Ограничение частоты запросов к формам входа.
+
+Лимит — AUTH_RATELIMIT_BURST попыток за время, за которое при скорости
+AUTH_RATELIMIT_PER_MINUTE набирается полная корзина. Попытки считаются
+скользящим окном из двух счетчиков в общем кеше, поэтому лимит действует
+для всех процессов. Счетчики увеличиваются атомарным incr, и
+параллельные запросы не могут потратить одну попытку дважды. Запрос
+отклоняется до обработки формы, то есть до хеширования пароля.
+
+За прокси из RATELIMIT_TRUSTED_PROXIES адрес клиента берется из
+заголовка RATELIMIT_IP_HEADER: самый правый адрес, который не
+принадлежит доверенному прокси. Левые адреса подделывает сам клиент.
+"""
+import ipaddress
+import time
+from functools import lru_cache, wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+RETRY_AFTER = 60
+
+
+def _increment(key, timeout):
+    cache.add(key, 0, timeout)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Счетчик истек между add и incr.
+        cache.add(key, 1, timeout)
+        return 1
+
+
+def take_token(key, burst, per_minute):
+    """Засчитывает попытку по ключу key; False, если лимит исчерпан.
+
+    Текущее окно длиной burst / per_minute минут считается целиком, а
+    предыдущее — пропорционально тому, какая его часть еще попадает в
+    скользящее окно.
+    """
+    now = time.time()
+    window = burst * 60 / per_minute
+    number, elapsed = divmod(now, window)
+    timeout = int(window * 2) + 1
+    current = _increment(f"{key}:{int(number)}", timeout)
+    previous = cache.get(f"{key}:{int(number) - 1}", 0)
+    return previous * (1 - elapsed / window) + current <= burst
+
+
+@lru_cache(maxsize=None)
+def _trusted_networks(proxies):
+    return [ipaddress.ip_network(proxy, strict=False) for proxy in proxies]
+
+
+def _is_trusted(address):
+    try:
+        address = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    networks = _trusted_networks(tuple(settings.RATELIMIT_TRUSTED_PROXIES))
+    return any(address in network for network in networks)
+
+
+def client_ip(request):
+    address = request.META.get("REMOTE_ADDR", "")
+    if not _is_trusted(address):
+        return address
+    hops = request.META.get(settings.RATELIMIT_IP_HEADER, "").split(",")
+    for hop in reversed(hops):
+        hop = hop.strip()
+        if not hop:
+            continue
+        address = hop
+        if not _is_trusted(hop):
+            break
+    return address
+
+
+def ratelimit(scope, field=None):
+    """Декоратор представления: ограничивает POST-запросы по IP-адресу
+    и, если передан field, по значению этого поля формы."""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != "POST":
+                return view(request, *args, **kwargs)
+            keys = [f"ratelimit:{scope}:ip:{client_ip(request)}"]
+            value = request.POST.get(field, "").strip().lower()
+            if field and value:
+                keys.append(f"ratelimit:{scope}:{field}:{value}")
+            allowed = [
+                take_token(
+                    key,
+                    settings.AUTH_RATELIMIT_BURST,
+                    settings.AUTH_RATELIMIT_PER_MINUTE,
+                )
+                for key in keys
+            ]
+            if not all(allowed):
+                response = HttpResponse(
+                    "Слишком много попыток, попробуйте позже.", status=429
+                )
+                response["Retry-After"] = str(RETRY_AFTER)
+                return response
+            return view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,256 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.models import OutboxMessage
+
+from .auth import user_cache_key
+from .inbox import inbox_page, mark_answered
+from .models import Contact
+from .ratelimit import take_token
+
+User = get_user_model()
+
+
+class CachedUserTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="auth", password="old-password-1"
+        )
+        self.client = Client()
+        self.client.login(username="auth", password="old-password-1")
+
+    def test_authenticated_page_view_without_queries(self):
+        """Сессия и пользователь берутся из кеша без запросов к БД."""
+        url = reverse("about:author")
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.context["user"], self.user)
+
+    def test_password_change_invalidates_cached_user(self):
+        """Смена пароля сбрасывает кешированного пользователя."""
+        self.client.get(reverse("about:author"))
+        self.assertIsNotNone(cache.get(user_cache_key(self.user.pk)))
+        self.client.post(
+            reverse("users:password_change"),
+            {
+                "old_password": "old-password-1",
+                "new_password1": "new-password-2",
+                "new_password2": "new-password-2",
+            },
+        )
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+        response = self.client.get(reverse("about:author"))
+        self.assertTrue(response.context["user"].is_authenticated)
+
+    def test_other_session_logged_out_after_password_change(self):
+        """Другие сессии не переживают смену пароля через кеш."""
+        other = Client()
+        other.login(username="auth", password="old-password-1")
+        other.get(reverse("about:author"))
+        self.user.set_password("new-password-2")
+        self.user.save()
+        response = other.get(reverse("about:author"))
+        self.assertFalse(response.context["user"].is_authenticated)
+
+    def test_logout_invalidates_cached_user(self):
+        """Выход сбрасывает кешированного пользователя."""
+        self.client.get(reverse("about:author"))
+        self.client.post(reverse("users:logout"))
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+
+
+@override_settings(AUTH_RATELIMIT_BURST=2, AUTH_RATELIMIT_PER_MINUTE=1)
+class RateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def login(self, username, address="10.0.0.1"):
+        return Client(REMOTE_ADDR=address).post(
+            reverse("users:login"),
+            {"username": username, "password": "wrong"},
+        )
+
+    def test_login_flood_rejected(self):
+        """Частые попытки входа с одного адреса отклоняются."""
+        self.assertEqual(self.login("first").status_code, 200)
+        self.assertEqual(self.login("second").status_code, 200)
+        response = self.login("third")
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+    def test_username_limited_across_addresses(self):
+        """Подбор пароля к одному имени ограничен и с разных адресов."""
+        self.login("victim", "10.0.0.1")
+        self.login("victim", "10.0.0.2")
+        self.assertEqual(self.login("victim", "10.0.0.3").status_code, 429)
+
+    def test_parallel_attempts_counted_once_each(self):
+        """Одновременные попытки не расходуют одну попытку дважды."""
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            allowed = list(
+                pool.map(
+                    lambda _: take_token("ratelimit:test", 2, 1), range(16)
+                )
+            )
+        self.assertEqual(allowed.count(True), 2)
+
+    @override_settings(RATELIMIT_TRUSTED_PROXIES=["127.0.0.1", "10.1.0.0/16"])
+    def test_clients_behind_proxy_limited_separately(self):
+        """За доверенным прокси лимит считается по адресу клиента."""
+
+        def login(forwarded, remote="127.0.0.1"):
+            return Client(
+                REMOTE_ADDR=remote, HTTP_X_FORWARDED_FOR=forwarded
+            ).post(reverse("users:login"), {"username": "", "password": ""})
+
+        self.assertEqual(login("203.0.113.1").status_code, 200)
+        self.assertEqual(login("203.0.113.1, 10.1.2.3").status_code, 200)
+        self.assertEqual(login("203.0.113.2").status_code, 200)
+        # Подделанный клиентом левый адрес не спасает от лимита.
+        self.assertEqual(login("1.1.1.1, 203.0.113.1").status_code, 429)
+        # Заголовку от недоверенного адреса не верим.
+        login("203.0.113.3", remote="198.51.100.7")
+        login("203.0.113.4", remote="198.51.100.7")
+        self.assertEqual(
+            login("203.0.113.5", remote="198.51.100.7").status_code, 429
+        )
+
+    def test_get_not_limited(self):
+        """Открытие формы не расходует попытки."""
+        for _ in range(3):
+            response = Client().get(reverse("users:login"))
+            self.assertEqual(response.status_code, 200)
+
+
+@override_settings(
+    PASSWORD_HASHERS=[
+        "django.contrib.auth.hashers.MD5PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    ]
+)
+class PasswordHasherPolicyTests(TestCase):
+    def test_password_rehashed_with_preferred_hasher_on_login(self):
+        """При входе пароль пересчитывается первым хешером политики."""
+        user = User.objects.create(username="auth")
+        with self.settings(
+            PASSWORD_HASHERS=[
+                "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+            ]
+        ):
+            user.set_password("password-1")
+            user.save()
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$"))
+        self.assertTrue(
+            Client().login(username="auth", password="password-1")
+        )
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("md5$"))
+
+
+@override_settings(EMAIL_BACKEND="core.mail.OutboxEmailBackend")
+class OutgoingMailTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_password_reset_mail_queued(self):
+        """Письмо сброса пароля ставится в очередь."""
+        User.objects.create_user(
+            username="auth", email="auth@test.ru", password="password-1"
+        )
+        response = Client().post(
+            reverse("users:password_reset_form"), {"email": "auth@test.ru"}
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            OutboxMessage.objects.get().recipients, ["auth@test.ru"]
+        )
+
+    def test_contact_form_saved_and_answer_queued(self):
+        """Обращение сохраняется, подтверждение ставится в очередь."""
+        Client().post(
+            reverse("users:contact"),
+            {
+                "name": "Гость",
+                "email": "guest@test.ru",
+                "subject": "Вопрос",
+                "body": "Текст вопроса",
+            },
+        )
+        self.assertTrue(Contact.objects.filter(subject="Вопрос").exists())
+        self.assertIn("Вопрос", OutboxMessage.objects.get().subject)
+
+
+class ContactInboxTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(username="staff", is_staff=True)
+        Contact.objects.bulk_create(
+            Contact(
+                name="Гость",
+                email="guest@test.ru",
+                subject=f"Вопрос {number}",
+                body="Про пароль" if number % 2 else "Про посты",
+            )
+            for number in range(5)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.staff)
+
+    def test_cursor_pages_cover_all_contacts(self):
+        """Курсорная пагинация проходит все обращения без повторов."""
+        seen, cursor = [], None
+        while True:
+            page, cursor = inbox_page(cursor=cursor, page_size=2)
+            seen += [contact.pk for contact in page]
+            if cursor is None:
+                break
+        self.assertEqual(
+            seen, list(Contact.objects.values_list("pk", flat=True))
+        )
+
+    def test_search_and_filter(self):
+        """Поиск идет по теме и тексту, фильтр — по статусу ответа."""
+        page, _ = inbox_page(query="пароль")
+        self.assertEqual(len(page), 2)
+        Contact.objects.filter(subject="Вопрос 0").update(is_answered=True)
+        page, _ = inbox_page(answered=False)
+        self.assertEqual(len(page), 4)
+
+    def test_bulk_mark_answered_single_update(self):
+        """Массовая отметка выполняется одним запросом UPDATE."""
+        ids = list(Contact.objects.values_list("pk", flat=True)[:3])
+        with self.assertNumQueries(1):
+            mark_answered(ids)
+        self.assertEqual(Contact.objects.filter(is_answered=True).count(), 3)
+
+    def test_inbox_only_for_staff(self):
+        """Разбор обращений доступен только сотрудникам."""
+        url = reverse("users:contact_inbox")
+        self.assertEqual(Client().get(url).status_code, 302)
+        response = self.client.get(url)
+        self.assertEqual(len(response.context["contacts"]), 5)
+        self.client.post(
+            url, {"ids": Contact.objects.values_list("pk", flat=True)}
+        )
+        self.assertFalse(Contact.objects.filter(is_answered=False).exists())
+
+    def test_inbox_ignores_invalid_ids(self):
+        """Неверные id пропускаются, а не роняют страницу."""
+        contact = Contact.objects.first()
+        response = self.client.post(
+            reverse("users:contact_inbox"),
+            {"ids": ["abc", "", "²", str(contact.pk)]},
+        )
+        self.assertEqual(response.status_code, 302)
+        contact.refresh_from_db()
+        self.assertTrue(contact.is_answered)
+        self.assertEqual(Contact.objects.filter(is_answered=True).count(), 1)
@@ -6,18 +6,27 @@ from django.contrib.auth.views import (LoginView, LogoutView,
 from django.urls import path
 
 from . import views
+from .ratelimit import ratelimit
 
 app_name = "users"
 
 urlpatterns = [
     path(
         "signup/",
-        views.SignUp.as_view(),
+        ratelimit("signup", "username")(views.SignUp.as_view()),
         name="signup",
     ),
+    path(
+        "contact/",
+        ratelimit("contact", "email")(views.ContactView.as_view()),
+        name="contact",
+    ),
+    path("contact/inbox/", views.contact_inbox, name="contact_inbox"),
     path(
         "not_logout/",
-        LoginView.as_view(template_name="users/not_logged_out.html"),
+        ratelimit("login", "username")(
+            LoginView.as_view(template_name="users/not_logged_out.html")
+        ),
         name="not_logout",
     ),
     path(
@@ -27,13 +36,17 @@ urlpatterns = [
     ),
     path(
         "login/",
-        LoginView.as_view(template_name="users/login.html"),
+        ratelimit("login", "username")(
+            LoginView.as_view(template_name="users/login.html")
+        ),
         name="login",
     ),
     path(
         "password_reset/",
-        PasswordResetView.as_view(
-            template_name="users/password_reset_form.html",
+        ratelimit("password_reset", "email")(
+            PasswordResetView.as_view(
+                template_name="users/password_reset_form.html",
+            )
         ),
         name="password_reset_form",
     ),
@@ -1,10 +1,62 @@
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.mail import send_mail
+from django.shortcuts import redirect, render
 from django.urls import reverse_lazy
 from django.views.generic import CreateView
 
-from .forms import CreationForm
+from .forms import ContactForm, CreationForm
+from .inbox import inbox_page, mark_answered
 
 
 class SignUp(CreateView):
     form_class = CreationForm
     success_url = reverse_lazy("posts:index")
     template_name = "users/signup.html"
+
+
+class ContactView(CreateView):
+    """Форма обратной связи с подтверждением на почту отправителя."""
+
+    form_class = ContactForm
+    success_url = reverse_lazy("posts:index")
+    template_name = "users/contact.html"
+
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        send_mail(
+            f"Ваше обращение получено: {self.object.subject}",
+            f"Здравствуйте, {self.object.name}! "
+            "Мы получили ваше сообщение и ответим на него в ближайшее время.",
+            settings.DEFAULT_FROM_EMAIL,
+            [self.object.email],
+        )
+        return response
+
+
+ANSWERED_FILTERS = {"1": True, "0": False}
+
+
+@staff_member_required
+def contact_inbox(request):
+    """Выводит шаблон разбора обращений для сотрудников."""
+    if request.method == "POST":
+        ids = [
+            int(value)
+            for value in request.POST.getlist("ids")
+            if value.isdecimal()
+        ]
+        mark_answered(ids)
+        return redirect(request.get_full_path())
+    query = request.GET.get("q", "").strip()
+    answered = request.GET.get("answered", "")
+    contacts, next_cursor = inbox_page(
+        query, ANSWERED_FILTERS.get(answered), request.GET.get("cursor")
+    )
+    context = {
+        "contacts": contacts,
+        "next_cursor": next_cursor,
+        "query": query,
+        "answered": answered,
+    }
+    return render(request, "users/contact_inbox.html", context)
@@ -0,0 +1,17 @@
+"""Настройки проекта по окружениям.
+
+base — общие настройки, dev — локальная разработка, test — прогон
+тестов, prod — продакшен. Профиль задается DJANGO_SETTINGS_MODULE
+(например, yatube.settings.prod) или, для yatube.settings, переменной
+DJANGO_ENV; по умолчанию используется dev.
+"""
+import os
+
+DJANGO_ENV = os.getenv("DJANGO_ENV", "dev")
+
+if DJANGO_ENV == "prod":
+    from .prod import *  # noqa: F401,F403
+elif DJANGO_ENV == "test":
+    from .test import *  # noqa: F401,F403
+else:
+    from .dev import *  # noqa: F401,F403
@@ -0,0 +1,256 @@
+"""Общие настройки всех окружений."""
+import os
+from importlib.util import find_spec
+
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+# Ключ общий для всех процессов: иначе сессии и подписи, выданные одним
+# воркером, не принимаются другими. Значение по умолчанию годится только
+# для разработки и тестов, prod требует DJANGO_SECRET_KEY.
+SECRET_KEY = os.getenv(
+    "DJANGO_SECRET_KEY", "django-insecure-yatube-development-key"
+)
+
+CSRF_FAILURE_VIEW = "core.views.csrf_failure"
+
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    "localhost",
+    "127.0.0.1",
+    "[::1]",
+    "testserver",
+    'www.Aberg1.pythonanywhere.com',
+    'Aberg1.pythonanywhere.com',
+]
+
+
+INSTALLED_APPS = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+    "posts.apps.PostsConfig",
+    "users.apps.UsersConfig",
+    "about.apps.AboutConfig",
+    "core.apps.CoreConfig",
+    "sorl.thumbnail",
+]
+
+MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "core.compression.CompressionMiddleware",
+    "core.staticfiles.StaticFilesMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "users.middleware.CachedAuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+ROOT_URLCONF = "yatube.urls"
+
+TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
+
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [TEMPLATES_DIR],
+        "OPTIONS": {
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
+            "context_processors": [
+                "django.template.context_processors.debug",
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+                "django.contrib.messages.context_processors.messages",
+                "core.context_processors.year.year",
+            ],
+        },
+    },
+]
+
+# Компилировать все шаблоны при старте WSGI-приложения.
+TEMPLATES_PRECOMPILE = False
+
+# Функции, которые команда serve выполняет в мастере до запуска воркеров.
+# Последней заполняется кеш популярных страниц для анонимов.
+SERVER_WARMUP = [
+    "core.warmup.populate_url_resolver",
+    "core.warmup.precompile_templates",
+    "posts.warmup.warm_page_cache",
+]
+
+WSGI_APPLICATION = "yatube.wsgi.application"
+
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+    }
+}
+
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.MinimumLengthValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.CommonPasswordValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.NumericPasswordValidator",
+    },
+]
+
+# strong — медленные хешеры для продакшена, fast — быстрый хешер для
+# тестов и локального запуска. Пароли, захешированные не первым хешером
+# списка, пересчитываются при следующем входе пользователя.
+PASSWORD_HASHER_POLICY = os.getenv("PASSWORD_HASHER_POLICY", "strong")
+
+STRONG_PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+if find_spec("argon2"):
+    STRONG_PASSWORD_HASHERS.insert(
+        0, "django.contrib.auth.hashers.Argon2PasswordHasher"
+    )
+
+PASSWORD_HASHER_POLICIES = {
+    "strong": STRONG_PASSWORD_HASHERS,
+    "fast": [
+        "django.contrib.auth.hashers.MD5PasswordHasher",
+        *STRONG_PASSWORD_HASHERS,
+    ],
+}
+PASSWORD_HASHERS = PASSWORD_HASHER_POLICIES[PASSWORD_HASHER_POLICY]
+
+# Лимит попыток входа, регистрации и сброса пароля: не больше
+# AUTH_RATELIMIT_BURST попыток подряд и в среднем AUTH_RATELIMIT_PER_MINUTE
+# попыток в минуту, отдельно для IP-адреса и для имени пользователя.
+AUTH_RATELIMIT_BURST = 10
+AUTH_RATELIMIT_PER_MINUTE = 5
+
+# Адреса и сети прокси (nginx, балансировщик), которым доверяется
+# заголовок RATELIMIT_IP_HEADER. Без них лимит считается по REMOTE_ADDR.
+RATELIMIT_TRUSTED_PROXIES = [
+    proxy.strip()
+    for proxy in os.getenv("RATELIMIT_TRUSTED_PROXIES", "").split(",")
+    if proxy.strip()
+]
+RATELIMIT_IP_HEADER = os.getenv("RATELIMIT_IP_HEADER", "HTTP_X_FORWARDED_FOR")
+
+
+LANGUAGE_CODE = "ru-RU"
+
+TIME_ZONE = "UTC"
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+# Письма складываются в очередь и отправляются командой send_outbox
+# через OUTBOX_DELIVERY_BACKEND. Для локального запуска подойдет
+# console или filebased.
+EMAIL_BACKEND = "core.mail.OutboxEmailBackend"
+
+OUTBOX_DELIVERY_BACKEND = "django.core.mail.backends." + os.getenv(
+    "OUTBOX_DELIVERY_BACKEND", "filebased"
+) + ".EmailBackend"
+
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, "sent_emails")
+
+
+# cached_db — сессии читаются из кеша и пишутся в БД, signed_cookies —
+# сессия целиком хранится в подписанной cookie без обращений к хранилищу.
+SESSION_ENGINE = "django.contrib.sessions.backends." + os.getenv(
+    "SESSION_BACKEND", "cached_db"
+)
+
+LOGIN_URL = "users:login"
+
+LOGIN_REDIRECT_URL = "posts:index"
+
+
+STATIC_URL = "/static/"
+STATICFILES_DIRS = (os.path.join(BASE_DIR, "static"),)
+STATIC_ROOT = os.path.join(BASE_DIR, "collected_static")
+
+# Включает отдачу собранной статики самим Django (StaticFilesMiddleware)
+# для запуска без nginx.
+STATIC_SERVE = os.getenv("STATIC_SERVE", "0") == "1"
+
+POSTS_ARCHIVE_AFTER_DAYS = 365
+
+# Сколько дней удаленный пост хранится до окончательного удаления.
+POSTS_PURGE_AFTER_DAYS = 1
+
+MEDIA_URL = os.getenv("MEDIA_URL", "/media/")
+MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+
+THUMBNAIL_URL = os.getenv("THUMBNAIL_URL", "/thumbnails/")
+THUMBNAIL_ROOT = os.path.join(BASE_DIR, "thumbnails")
+
+# filesystem — файлы на локальном диске, s3 — в S3-совместимом хранилище.
+# MEDIA_S3_ENDPOINT_URL вида file:///path хранит объекты в каталоге и
+# подходит для разработки без S3.
+MEDIA_STORAGE = os.getenv("MEDIA_STORAGE", "filesystem")
+MEDIA_S3_BUCKET = os.getenv("MEDIA_S3_BUCKET", "yatube-media")
+MEDIA_S3_ENDPOINT_URL = os.getenv("MEDIA_S3_ENDPOINT_URL", "")
+
+STORAGES = {
+    "default": {
+        "BACKEND": {
+            "filesystem": "core.storage.HashedFileSystemStorage",
+            "s3": "core.storage.HashedS3Storage",
+        }[MEDIA_STORAGE],
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+
+# direct — FileResponse (WSGI-сервер отправляет файл через sendfile),
+# accel — X-Accel-Redirect для nginx, sendfile — X-Sendfile для Apache.
+# Префиксы accel должны совпадать с internal-локациями nginx.
+MEDIA_SERVE_MODE = os.getenv("MEDIA_SERVE_MODE", "direct")
+MEDIA_ACCEL_PREFIX = "/protected/media/"
+THUMBNAIL_ACCEL_PREFIX = "/protected/thumbnails/"
+
+THUMBNAIL_STORAGE = {
+    "filesystem": "core.storage.ThumbnailFileSystemStorage",
+    "s3": "core.storage.ThumbnailS3Storage",
+}[MEDIA_STORAGE]
+
+
+# Ответы меньше порога не сжимаются: выигрыш меньше накладных расходов.
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_CACHE_TIMEOUT = 300
+HTML_MINIFY = True
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
@@ -0,0 +1,16 @@
+"""Настройки для локальной разработки."""
+from .base import *  # noqa: F401,F403
+from .base import INSTALLED_APPS, MIDDLEWARE
+
+DEBUG = True
+
+INTERNAL_IPS = [
+    "127.0.0.1",
+]
+
+INSTALLED_APPS = [*INSTALLED_APPS, "debug_toolbar"]
+
+MIDDLEWARE = [*MIDDLEWARE, "debug_toolbar.middleware.DebugToolbarMiddleware"]
+
+# Шаблоны загружаются через явный кеширующий загрузчик, APP_DIRS не нужен.
+SILENCED_SYSTEM_CHECKS = ["debug_toolbar.W006"]
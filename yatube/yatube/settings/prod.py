@@ -0,0 +1,55 @@
+"""Настройки для продакшена.
+
+Подключаются через DJANGO_SETTINGS_MODULE=yatube.settings.prod. Без
+инструментов разработки: debug_toolbar не загружается, а Pillow
+импортируется только при создании миниатюры. Проверить настройки:
+manage.py check --deploy --tag performance.
+"""
+import os
+from importlib.util import find_spec
+
+from .base import *  # noqa: F401,F403
+from .base import DATABASES, STORAGES
+
+DEBUG = False
+
+SECRET_KEY = os.environ["DJANGO_SECRET_KEY"]
+
+ALLOWED_HOSTS = os.getenv(
+    "DJANGO_ALLOWED_HOSTS", "localhost,127.0.0.1"
+).split(",")
+
+# Соединение с БД переиспользуется между запросами, перед повторным
+# использованием проверяется.
+DATABASES = {
+    "default": {
+        **DATABASES["default"],
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
+    }
+}
+
+# Кеш общий для всех воркеров: сброс версий страниц, лимиты попыток входа
+# и кеш пользователей видны каждому процессу. Без пакета redis остается
+# кеш процесса из base, о чем предупреждает check --deploy (core.W005).
+if find_spec("redis") is not None:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("CACHE_URL", "redis://127.0.0.1:6379/1"),
+        }
+    }
+
+# Формы постов — короткий текст, картинки больше 512 КБ пишутся во
+# временный файл, а не держатся в памяти воркера.
+DATA_UPLOAD_MAX_MEMORY_SIZE = 1024 * 1024
+FILE_UPLOAD_MAX_MEMORY_SIZE = 512 * 1024
+
+STORAGES = {
+    **STORAGES,
+    "staticfiles": {
+        "BACKEND": "core.staticfiles.PrecompressedManifestStaticFilesStorage"
+    },
+}
+
+TEMPLATES_PRECOMPILE = True
@@ -0,0 +1,7 @@
+"""Настройки для прогона тестов."""
+from .base import *  # noqa: F401,F403
+from .base import PASSWORD_HASHER_POLICIES
+
+# Быстрый хешер: создание пользователей в тестах не тратит время на
+# дорогое хеширование паролей.
+PASSWORD_HASHERS = PASSWORD_HASHER_POLICIES["fast"]
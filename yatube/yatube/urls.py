@@ -1,7 +1,8 @@
+from core.views import metrics
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
+from posts.views import media, thumbnail
 
 urlpatterns = [
     path("", include("posts.urls", namespace="posts")),
@@ -9,18 +10,31 @@ urlpatterns = [
     path("auth/", include("users.urls")),
     path("auth/", include("django.contrib.auth.urls")),
     path("about/", include("about.urls", namespace="about")),
+    path("metrics/", metrics, name="metrics"),
 ]
 
+# Медиафайлы проходят через представления, которые проверяют доступ, а
+# байты передают фронт-серверу (см. MEDIA_SERVE_MODE). Если MEDIA_URL
+# указывает на внешний адрес (CDN, S3), Django их не отдает.
+if settings.MEDIA_URL.startswith("/"):
+    urlpatterns += [
+        path(settings.MEDIA_URL[1:] + "<path:name>", media, name="media"),
+    ]
+if settings.THUMBNAIL_URL.startswith("/"):
+    urlpatterns += [
+        path(
+            settings.THUMBNAIL_URL[1:] + "<path:name>",
+            thumbnail,
+            name="thumbnail",
+        ),
+    ]
+
 handler403 = "core.views.csrf_failure"
 handler404 = "core.views.page_not_found"
 handler500 = "core.views.server_error"
 
 
-if settings.DEBUG:
+if settings.DEBUG and "debug_toolbar" in settings.INSTALLED_APPS:
     import debug_toolbar
 
-    urlpatterns += static(
-        settings.MEDIA_URL,
-        document_root=settings.MEDIA_ROOT,
-    )
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)